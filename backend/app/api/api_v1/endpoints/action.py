@@ -1,16 +1,18 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
 from pydantic.error_wrappers import ValidationError
 from typing import Optional, List
 
+from app.api.shortcuts import paginated
 from app.core.users import current_active_user
 from app.models.action import Action, ActionCreateOrUpdate
 from app.models.destinations.destination import destination_details_map, DestinationAction
 from app.models.users import UserDB
 from app.repositories.action import ActionRepository, get_action_repository
 from app.repositories.destination import DestinationRepository, get_destination_repository
+from app.settings import settings
 from app.utils import json_schema_to_single_doc
 
 
@@ -34,18 +36,23 @@ def get_json_schema():
 
 @router.get("", response_model=List[Action])
 def list_actions(
+    response: Response,
     resource_key: Optional[str] = None,
     action_type: Optional[str] = None,
     destination_name: Optional[str] = None,
     asc: Optional[bool] = True,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = None,
     repository: ActionRepository = Depends(get_action_repository),
 ):
-    return repository.list(
+    return paginated(response, repository.list(
         resource_key=resource_key,
         action_type=action_type,
         destination_name=destination_name,
         asc=asc,
-    )
+        limit=limit,
+        cursor=cursor,
+    ))
 
 
 @router.post("", response_model=Action, status_code=status.HTTP_201_CREATED)
@@ -1,22 +1,41 @@
+from datetime import datetime
 from typing import Optional, List
 
-from fastapi import APIRouter, HTTPException, status, Request
+from fastapi import APIRouter, Body, HTTPException, Query, status, Request, Response
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from app.api.shortcuts import delete_by_key_or_404, get_by_key_or_404
+from app.api.shortcuts import delete_by_key_or_404_async, get_by_key_or_404, get_by_key_or_404_async, paginated
+from app.core.introspection import get_dataset_columns
 from app.core.sample import GetSampleException, get_dataset_sample
 from app.core.users import current_active_user
-from app.models.dataset import BaseDataset, Dataset, DatasetCreate, DatasetUpdate, Sample
+from app.models.dataset import (
+    BaseDataset, Dataset, DatasetColumn, DatasetCreate, DatasetUpdate, Sample, SuggestionOptions,
+)
 from app.models.task import TaskStatus, TaskIdResponse, TaskResultResponse
-from app.repositories.dataset import DatasetRepository, get_dataset_repository
-from app.repositories.datasource import DatasourceRepository, get_datasource_repository
-from app.repositories.expectation import ExpectationRepository, get_expectation_repository
+from app.repositories.base import ConsistencySession, get_consistency_session
+from app.repositories.dataset import (
+    AsyncDatasetRepository,
+    AsyncDatasetSampleRepository,
+    DatasetRepository,
+    get_async_dataset_repository,
+    get_async_dataset_sample_repository,
+    get_dataset_repository,
+)
+from app.repositories.datasource import AsyncDatasourceRepository, get_async_datasource_repository
+from app.repositories.expectation import AsyncExpectationRepository, get_async_expectation_repository
+from app.repositories.expectation_result import (
+    AsyncExpectationResultRepository,
+    get_async_expectation_result_repository,
+)
+from app.repositories.rollup import AsyncDatasetRollupRepository, get_async_dataset_rollup_repository
 from app.repositories.task import get_task_repository, TaskRepository
-from app.repositories.validation import get_validation_repository, ValidationRepository
+from app.repositories.validation import AsyncValidationRepository, get_async_validation_repository
 from app.settings import settings
 from app.models.users import UserDB
 from opensearchpy import RequestError
+from sqlalchemy.exc import DBAPIError
 import requests
 from app.worker.tasks.validation import run_validation
 from app.worker.tasks.suggestions import run_suggestions
@@ -33,13 +52,15 @@ def get_json_schema():
 
 
 @router.get("", response_model=List[Dataset])
-def list_datasets(
+async def list_datasets(
+    response: Response,
     datasource_id: Optional[str] = None,
     sort_by_key: Optional[str] = "dataset_name",
     asc: Optional[bool] = True,
-    repository: DatasetRepository = Depends(get_dataset_repository),
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = None,
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
 ):
-    # TODO implement scrolling
     direction = "asc" if asc else "desc"
 
     if datasource_id is None:
@@ -48,7 +69,7 @@ def list_datasets(
         query = {"query": {"match": {"datasource_id": datasource_id}}, "sort": [{sort_by_key: direction}]}
 
     try:
-        return repository.query(query, size=1000)
+        return paginated(response, await repository.paginate(query, limit=limit, cursor=cursor))
     except RequestError:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
@@ -57,20 +78,23 @@ def list_datasets(
 
 
 @router.get("/{key}", response_model=Dataset)
-def get_dataset(key: str, repository: DatasetRepository = Depends(get_dataset_repository)):
-    return get_by_key_or_404(key, repository)
+async def get_dataset(key: str, repository: AsyncDatasetRepository = Depends(get_async_dataset_repository)):
+    return await get_by_key_or_404_async(key, repository)
 
 
 @router.post("", response_model=Dataset)
-def create_dataset(
+async def create_dataset(
     dataset_create: DatasetCreate,
+    response: Response,
     test_query: bool = True,
+    use_cache: bool = True,
     user: UserDB = Depends(current_active_user),
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
-    repository: DatasetRepository = Depends(get_dataset_repository),
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    sample_repository: AsyncDatasetSampleRepository = Depends(get_async_dataset_sample_repository),
 ):
-    datasource = get_by_key_or_404(dataset_create.datasource_id, datasource_repository)
-    _check_dataset_does_not_exists(dataset_create, repository)
+    datasource = await get_by_key_or_404_async(dataset_create.datasource_id, datasource_repository)
+    await _check_dataset_does_not_exists(dataset_create, repository)
 
     dataset = Dataset(
         **dataset_create.dict(by_alias=True),
@@ -78,27 +102,35 @@ def create_dataset(
         created_by=user.email,
     )
 
+    data_sample = None
     if test_query:
         try:
-            data_sample = get_dataset_sample(dataset, datasource)
+            data_sample = await run_in_threadpool(get_dataset_sample, dataset, datasource, use_cache=use_cache)
         except GetSampleException as e:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=e.error,
             ) from e
-        dataset.sample = data_sample
+        _set_sample_cache_headers(response, data_sample)
 
-    return repository.create(dataset.key, dataset)
+    created = await repository.create(dataset.key, dataset)
+    if data_sample is not None:
+        await sample_repository.save(dataset, data_sample)
+    created.sample = data_sample
+    return created
 
 
 @router.put("/{key}", response_model=Dataset)
-def update_dataset(
+async def update_dataset(
     dataset_update: DatasetUpdate,
     key: str,
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
-    repository: DatasetRepository = Depends(get_dataset_repository),
+    response: Response,
+    use_cache: bool = True,
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    sample_repository: AsyncDatasetSampleRepository = Depends(get_async_dataset_sample_repository),
 ):
-    dataset = get_by_key_or_404(key, repository)
+    dataset = await get_by_key_or_404_async(key, repository)
 
     if dataset.datasource_id != dataset_update.datasource_id:
         raise HTTPException(
@@ -106,48 +138,60 @@ def update_dataset(
             detail="updates to dataset datasource_id are not supported",
         )
 
-    datasource = get_by_key_or_404(dataset.datasource_id, datasource_repository)
+    datasource = await get_by_key_or_404_async(dataset.datasource_id, datasource_repository)
 
     update_dict = dataset_update.dict(exclude_unset=False, exclude_none=False, by_alias=True)
 
     if dataset.dataset_name != dataset_update.dataset_name:
-        _check_dataset_does_not_exists(dataset_update, repository)
+        await _check_dataset_does_not_exists(dataset_update, repository)
 
+    data_sample = None
     if should_update_sample(dataset, dataset_update):
         try:
-            data_sample = get_dataset_sample(dataset_update, datasource)
+            data_sample = await run_in_threadpool(get_dataset_sample, dataset_update, datasource, use_cache=use_cache)
         except GetSampleException as e:
             raise HTTPException(
                 status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                 detail=e.error,
             ) from e
-        update_dict["sample"] = data_sample
+        _set_sample_cache_headers(response, data_sample)
 
-    return repository.update(key, dataset, update_dict)
+    updated = await repository.update(key, dataset, update_dict)
+    if data_sample is not None:
+        await sample_repository.save(dataset, data_sample)
+    updated.sample = data_sample
+    return updated
 
 
 @router.delete("/{key}")
-def delete_dataset(
+async def delete_dataset(
     key: str,
     request: Request,
-    repository: DatasetRepository = Depends(get_dataset_repository),
-    expectation_repository: ExpectationRepository = Depends(get_expectation_repository),
-    validation_repository: ValidationRepository = Depends(get_validation_repository)
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    expectation_repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+    validation_repository: AsyncValidationRepository = Depends(get_async_validation_repository),
+    rollup_repository: AsyncDatasetRollupRepository = Depends(get_async_dataset_rollup_repository),
+    result_repository: AsyncExpectationResultRepository = Depends(get_async_expectation_result_repository),
+    sample_repository: AsyncDatasetSampleRepository = Depends(get_async_dataset_sample_repository),
 ):
-    get_by_key_or_404(key, repository)
+    await get_by_key_or_404_async(key, repository)
 
-    validation_repository.delete_by_dataset(dataset_id=key)
+    await validation_repository.delete_by_dataset(dataset_id=key)
+    await rollup_repository.delete_by_filter(dataset_id=key)
+    await result_repository.delete_by_filter(dataset_id=key)
 
     # TODO: use an internal function for this rather than making an HTTP request
-    requests.delete(
+    await run_in_threadpool(
+        requests.delete,
         url=f"{settings.SCHEDULER_API_URL}/api/v1/schedules",
         params={"dataset_id": key},
         headers=request.headers,
         cookies=request.cookies,
     )
 
-    expectation_repository.delete_by_filter(dataset_id=key)
-    delete_by_key_or_404(key, repository)
+    await expectation_repository.delete_by_filter(dataset_id=key)
+    await sample_repository.delete_by_dataset(key)
+    await delete_by_key_or_404_async(key, repository)
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
@@ -156,71 +200,127 @@ def delete_dataset(
 
 
 @router.post("/sample", response_model=Sample)
-def sample(
+async def sample(
     dataset: DatasetCreate,
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
+    response: Response,
+    use_cache: bool = True,
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
 ):
-    datasource = get_by_key_or_404(dataset.datasource_id, datasource_repository)
+    datasource = await get_by_key_or_404_async(dataset.datasource_id, datasource_repository)
     try:
-        return get_dataset_sample(dataset, datasource)
+        data_sample = await run_in_threadpool(get_dataset_sample, dataset, datasource, use_cache=use_cache)
     except GetSampleException as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=e.error,
         ) from e
+    _set_sample_cache_headers(response, data_sample)
+    return data_sample
+
+
+@router.get("/{key}/sample", response_model=Sample)
+async def get_sample(
+    key: str,
+    repository: AsyncDatasetSampleRepository = Depends(get_async_dataset_sample_repository),
+):
+    sample = await get_by_key_or_404_async(key, repository)
+    return Sample(columns=sample.columns, rows=sample.rows)
 
 
 @router.put("/{key}/sample")
-def update_sample(
+async def update_sample(
     key: str,
-    repository: DatasetRepository = Depends(get_dataset_repository),
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
+    response: Response,
+    use_cache: bool = True,
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+    sample_repository: AsyncDatasetSampleRepository = Depends(get_async_dataset_sample_repository),
 ):
-    dataset = get_by_key_or_404(key, repository)
-    datasource = get_by_key_or_404(dataset.datasource_id, datasource_repository)
+    dataset = await get_by_key_or_404_async(key, repository)
+    datasource = await get_by_key_or_404_async(dataset.datasource_id, datasource_repository)
     try:
-        data_sample = get_dataset_sample(dataset, datasource)
+        data_sample = await run_in_threadpool(get_dataset_sample, dataset, datasource, use_cache=use_cache)
     except GetSampleException as e:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=e.error,
         ) from e
+    _set_sample_cache_headers(response, data_sample)
 
-    dataset = repository.update(dataset.key, dataset, {"sample": data_sample})
+    await sample_repository.save(dataset, data_sample)
+    dataset = await repository.update(dataset.key, dataset, {})
+    dataset.sample = data_sample
     return dataset
 
 
+@router.get("/{key}/columns", response_model=list[DatasetColumn])
+async def list_dataset_columns(
+    key: str,
+    refresh: bool = False,
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+):
+    dataset = await get_by_key_or_404_async(key, repository)
+    datasource = await get_by_key_or_404_async(dataset.datasource_id, datasource_repository)
+    try:
+        return await run_in_threadpool(get_dataset_columns, dataset, datasource, refresh=refresh)
+    except DBAPIError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e.orig),
+        ) from e
+
+
 @router.post("/{key}/validate", response_model=TaskIdResponse)
-def validate_dataset(
+async def validate_dataset(
     key: str,
-    repository: DatasetRepository = Depends(get_dataset_repository),
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    session: ConsistencySession = Depends(get_consistency_session),
 ):
-    get_by_key_or_404(key, repository)
-    task = run_validation.delay(dataset_id=key)
+    await get_by_key_or_404_async(key, repository)
+    # The worker reads the expectations and actions the client just wrote.
+    task = await run_in_threadpool(
+        run_validation.apply_async,
+        kwargs={"dataset_id": key, "consistency_token": session.token()},
+        queue=settings.TASK_QUEUE_INTERACTIVE,
+    )
     return {"task_id": task.id}
 
 
 @router.get("/{key}/tasks", response_model=list[TaskResultResponse])
 def get_tasks_by_dataset_id(
     key: str,
+    response: Response,
     status: Optional[TaskStatus] = None,
+    since: Optional[datetime] = None,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = None,
     dataset_repository: DatasetRepository = Depends(get_dataset_repository),
     repository: TaskRepository = Depends(get_task_repository),
 ):
     get_by_key_or_404(key, dataset_repository)
-    return repository.query_by_dataset_id(
+    return paginated(response, repository.query_by_dataset_id(
         key,
         status=status,
-    )
+        since=since,
+        limit=limit,
+        cursor=cursor,
+    ))
 
 
 @router.post("/{key}/suggest", response_model=TaskIdResponse)
-def create_suggestions(
+async def create_suggestions(
     key: str,
-    repository: DatasetRepository = Depends(get_dataset_repository),
+    options: SuggestionOptions = Body(default=SuggestionOptions()),
+    repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
 ):
-    get_by_key_or_404(key, repository)
-    task = run_suggestions.delay(dataset_id=key)
+    await get_by_key_or_404_async(key, repository)
+    task = await run_in_threadpool(
+        run_suggestions.delay,
+        dataset_id=key,
+        include_columns=options.include_columns,
+        exclude_columns=options.exclude_columns,
+    )
     return {"task_id": task.id}
 
 
@@ -236,9 +336,18 @@ def should_update_sample(dataset: Dataset, dataset_update: DatasetUpdate):
     )
 
 
-def _check_dataset_does_not_exists(dataset: BaseDataset, repository: DatasetRepository):
+def _set_sample_cache_headers(response: Response, sample: Sample):
+    # X-Sample-Cache tells whether the sample was served from the sample cache, Age how old it is in seconds.
+    if sample.cache_age is None:
+        response.headers["X-Sample-Cache"] = "miss"
+    else:
+        response.headers["X-Sample-Cache"] = "hit"
+        response.headers["Age"] = str(int(sample.cache_age))
+
+
+async def _check_dataset_does_not_exists(dataset: BaseDataset, repository: AsyncDatasetRepository):
     dataset_schema, dataset_name, _ = dataset.get_resource_names()
-    existing_datasources = repository.query_by_resource_name(
+    existing_datasources = await repository.query_by_resource_name(
         datasource_name=dataset.datasource_name,
         schema=dataset_schema,
         name=dataset_name,
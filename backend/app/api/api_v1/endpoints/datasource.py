@@ -2,20 +2,23 @@ from typing import Optional, get_args
 
 import requests
 import sqlalchemy.exc
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from fastapi.responses import JSONResponse
 from opensearchpy import RequestError
-from sqlalchemy import create_engine
 
-from app.api.shortcuts import get_by_key_or_404
+from app.api.shortcuts import get_by_key_or_404, paginated
+from app.core.data_context import data_context_cache
+from app.core.engines import engine_registry
+from app.core.introspection import metadata_cache
+from app.core.sample import sample_cache
 from app.core.users import current_active_user
 from app.models.datasource import DatasourceInput, Datasource
 from app.models.users import UserDB
+from app.models.task import TaskIdResponse
 from app.repositories.dataset import DatasetRepository, get_dataset_repository
 from app.repositories.datasource import DatasourceRepository, get_datasource_repository
-from app.repositories.expectation import ExpectationRepository, get_expectation_repository
-from app.repositories.validation import ValidationRepository, get_validation_repository
 from app.settings import settings
+from app.worker.tasks.datasource import delete_datasource_documents
 from app import constants as c
 
 router = APIRouter(
@@ -39,28 +42,32 @@ def get_json_schema():
 
 @router.get("", response_model=list[Datasource])
 def list_datasources(
+        response: Response,
         sort_by_key: Optional[str] = "datasource_name",
         asc: Optional[bool] = True,
+        limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+        cursor: Optional[str] = None,
         repository: DatasourceRepository = Depends(get_datasource_repository),
 ):
-    # TODO implement scrolling
     direction = "asc" if asc else "desc"
 
     try:
-        return repository.query(
+        page = repository.paginate(
             {
                 "query": {"match_all": {}},
                 "sort": [
                     {sort_by_key: direction}
                 ]
             },
-            size=1000
+            limit=limit,
+            cursor=cursor,
         )
     except RequestError:
         raise HTTPException(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail=f"invalid sort_by_key"
         )
+    return paginated(response, page)
 
 
 @router.get("/{key}", response_model=Datasource)
@@ -119,6 +126,7 @@ def update_datasource(
         _test_datasource(datasource_for_test)
 
     updated_datasource = repository.update(key, original_datasource, update_dict)
+    _invalidate_connections(key)
 
     updated_database = datasource_update.database if datasource_update.database != original_datasource.database else None
     updated_datasource_name = datasource_update.datasource_name if datasource_update.datasource_name != original_datasource.datasource_name else None
@@ -127,19 +135,18 @@ def update_datasource(
     return updated_datasource
 
 
-@router.delete("/{key}")
+@router.delete("/{key}", status_code=status.HTTP_202_ACCEPTED, response_model=TaskIdResponse)
 def delete_datasource(
         key: str,
         request: Request,
         repository: DatasourceRepository = Depends(get_datasource_repository),
         dataset_repository: DatasetRepository = Depends(get_dataset_repository),
-        expectation_repository: ExpectationRepository = Depends(get_expectation_repository),
-        validation_repository: ValidationRepository = Depends(get_validation_repository),
 ):
+    """
+    Delete a datasource and its datasets. Their validations, expectations and other documents are
+    deleted in the background, by the returned task.
+    """
     get_by_key_or_404(key, repository)
-    validation_repository.delete_by_datasource(datasource_id=key)
-    expectation_repository.delete_by_datasource(key)
-    dataset_repository.delete_by_datasource(key)
 
     # TODO: use an internal function for this rather than making an HTTP request
     requests.delete(
@@ -149,17 +156,24 @@ def delete_datasource(
         cookies=request.cookies,
     )
 
+    dataset_repository.delete_by_datasource(key)
     repository.delete(key)
-    return JSONResponse(
-        status_code=status.HTTP_200_OK,
-        content="datasource deleted"
-    )
+    _invalidate_connections(key)
+    task = delete_datasource_documents.delay(datasource_id=key)
+    return TaskIdResponse(task_id=task.id)
+
+
+def _invalidate_connections(datasource_key: str):
+    engine_registry.invalidate(datasource_key)
+    data_context_cache.invalidate(datasource_key)
+    sample_cache.invalidate(datasource_key)
+    metadata_cache.invalidate(datasource_key)
 
 
 def _test_datasource(datasource: Datasource):
-    engine = create_engine(datasource.connection_string())
     try:
-        with engine.connect():
+        # The settings may not be saved, their connection is not pooled.
+        with engine_registry.connect(datasource, register=False):
             pass
     except sqlalchemy.exc.DBAPIError as ex:
         raise HTTPException(
@@ -182,8 +196,6 @@ def _test_datasource(datasource: Datasource):
             detail=str(f"{ex}. This module needs to be installed before it can be used."),
         )
 
-    engine.dispose()
-
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content="Successfully connected"
@@ -1,10 +1,10 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
 from opensearchpy import NotFoundError
 from typing import Optional, List
 
-from app.api.shortcuts import get_by_key_or_404
+from app.api.shortcuts import get_by_key_or_404, paginated
 from app.core.users import current_active_user
 from app.models.destinations.destination import destinations_map, DestinationUpdate
 from app.models.destinations.destination import (
@@ -13,6 +13,7 @@ from app.models.destinations.destination import (
 from app.models.users import UserDB
 from app.repositories.action import ActionRepository, get_action_repository
 from app.repositories.destination import DestinationRepository, get_destination_repository
+from app.settings import settings
 from app.utils import json_schema_to_single_doc
 
 
@@ -36,10 +37,13 @@ def get_json_schema():
 
 @router.get("", response_model=List[Destination])
 def list_destinations(
+    response: Response,
     asc: Optional[bool] = True,
+    limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+    cursor: Optional[str] = None,
     repository: DestinationRepository = Depends(get_destination_repository),
 ):
-    return repository.list(asc=asc)
+    return paginated(response, repository.list(asc=asc, limit=limit, cursor=cursor))
 
 
 @router.post("", status_code=status.HTTP_201_CREATED)
@@ -1,15 +1,18 @@
 from typing import Optional, get_args
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
 from fastapi.responses import JSONResponse
-from app.api.shortcuts import delete_by_key_or_404, get_by_key_or_404
+from app.api.shortcuts import delete_by_key_or_404_async, get_by_key_or_404_async, paginated
 from app.models.expectation import ExpectationInput, Expectation
 from app.core.expectations import supported_unsupported_expectations
-from app import utils
-from app.models.validation import Validation
-from app.repositories.dataset import DatasetRepository, get_dataset_repository
-from app.repositories.datasource import DatasourceRepository, get_datasource_repository
-from app.repositories.expectation import ExpectationRepository, get_expectation_repository
-from app.repositories.validation import ValidationRepository, get_validation_repository
+from app.repositories.dataset import AsyncDatasetRepository, get_async_dataset_repository
+from app.repositories.datasource import AsyncDatasourceRepository, get_async_datasource_repository
+from app.repositories.expectation import AsyncExpectationRepository, get_async_expectation_repository
+from app.repositories.expectation_result import (
+    AsyncExpectationResultRepository,
+    get_async_expectation_result_repository,
+)
+from app.repositories.validation import AsyncValidationRepository, get_async_validation_repository
+from app.settings import settings
 from app.utils import json_schema_to_single_doc
 from fastapi.param_functions import Depends
 from app.core.users import current_active_user
@@ -42,71 +45,79 @@ def list_supported_expectations():
 
 
 @router.put("/{expectation_id}/enable", response_model=Expectation)
-def enable_expectation(
+async def enable_expectation(
         expectation_id: str,
-        repository: ExpectationRepository = Depends(get_expectation_repository),
+        repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
 ):
-    expectation = get_by_key_or_404(expectation_id, repository)
-    _table_level_expectation_already_exists(expectation, repository)
-    return repository.update(expectation_id, expectation, {"enabled": True})
+    expectation = await get_by_key_or_404_async(expectation_id, repository)
+    await _table_level_expectation_already_exists(expectation, repository)
+    return await repository.update(expectation_id, expectation, {"enabled": True})
 
 
 @router.put("/{expectation_id}/disable", response_model=Expectation)
-def disable_expectation(
+async def disable_expectation(
         expectation_id: str,
-        repository: ExpectationRepository = Depends(get_expectation_repository),
+        repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
 ):
-    expectation = get_by_key_or_404(expectation_id, repository)
-    return repository.update(expectation_id, expectation, {"enabled": False})
+    expectation = await get_by_key_or_404_async(expectation_id, repository)
+    return await repository.update(expectation_id, expectation, {"enabled": False})
 
 
 @router.get("", response_model=list[Expectation])
-def list_expectations(
+async def list_expectations(
+        response: Response,
         datasource_id: Optional[str] = None,
         dataset_id: Optional[str] = None,
         include_history: Optional[bool] = False,
+        history_limit: int = Query(default=100, ge=1, le=100),
         suggested: Optional[bool] = None,
         enabled: Optional[bool] = True,
         asc: Optional[bool] = False,
-        repository: ExpectationRepository = Depends(get_expectation_repository),
-        validation_repository: ValidationRepository = Depends(get_validation_repository),
+        limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+        cursor: Optional[str] = None,
+        repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+        result_repository: AsyncExpectationResultRepository = Depends(get_async_expectation_result_repository),
 ):
-    expectations = repository.query_by_filter(
+    expectations = await repository.query_by_filter(
         datasource_id=datasource_id,
         dataset_id=dataset_id,
         suggested=suggested,
         enabled=enabled,
         asc=asc,
+        limit=limit,
+        cursor=cursor,
     )
 
+    expectations = paginated(response, expectations)
+
     if include_history:
-        validations = validation_repository.query_by_filter(
-            datasource_id=datasource_id,
-            dataset_id=dataset_id,
+        # The last `history_limit` results of each expectation on the page, oldest first.
+        history = await result_repository.history(
+            [expectation.key for expectation in expectations], size=history_limit
         )
-
-        return zip_expectations_and_validations(expectations, validations)
+        for expectation in expectations:
+            expectation.validations = [result.history() for result in history.get(expectation.key, [])]
 
     return expectations
 
 
 @router.get("/{expectation_id}", response_model=Expectation)
-def get_expectation(
+async def get_expectation(
     expectation_id: str,
-    repository: ExpectationRepository = Depends(get_expectation_repository),
+    repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
 ):
-    return get_by_key_or_404(expectation_id, repository)
+    return await get_by_key_or_404_async(expectation_id, repository)
 
 
 @router.post("", response_model=Expectation)
-def create_expectation(
+async def create_expectation(
     expectation: Expectation = Depends(get_expectation_payload),
-    repository: ExpectationRepository = Depends(get_expectation_repository),
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
-    dataset_repository: DatasetRepository = Depends(get_dataset_repository),
+    repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+    dataset_repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
 ):
-    get_by_key_or_404(expectation.datasource_id, datasource_repository)
-    dataset = get_by_key_or_404(expectation.dataset_id, dataset_repository)
+    await get_by_key_or_404_async(expectation.datasource_id, datasource_repository)
+    dataset = await get_by_key_or_404_async(expectation.dataset_id, dataset_repository)
 
     if dataset.datasource_id != expectation.datasource_id:
         raise HTTPException(
@@ -114,18 +125,19 @@ def create_expectation(
             detail="expectation datasource_id does not match dataset datasource_id"
         )
 
-    _table_level_expectation_already_exists(expectation, repository)
-    return repository.create(expectation.key, expectation)
+    await _table_level_expectation_already_exists(expectation, repository)
+    return await repository.create(expectation.key, expectation)
 
 
 @router.put("/{expectation_id}", response_model=Expectation)
-def update_expectation(
+async def update_expectation(
     expectation_id: str,
     expectation_update: Expectation = Depends(get_expectation_payload),
-    repository: ExpectationRepository = Depends(get_expectation_repository),
-    validation_repository: ValidationRepository = Depends(get_validation_repository),
+    repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+    validation_repository: AsyncValidationRepository = Depends(get_async_validation_repository),
+    result_repository: AsyncExpectationResultRepository = Depends(get_async_expectation_result_repository),
 ):
-    expectation = get_by_key_or_404(expectation_id, repository)
+    expectation = await get_by_key_or_404_async(expectation_id, repository)
     update_dict = expectation_update.dict(exclude={"key"})
 
     if expectation.datasource_id != expectation_update.datasource_id:
@@ -148,56 +160,37 @@ def update_expectation(
     # run. We can't have an expectation with the same id but
     # with different expectation types
     if expectation.expectation_type != expectation_update.expectation_type:
-        new_expectation = repository.create(expectation_update.key, expectation_update)
+        new_expectation = await repository.create(expectation_update.key, expectation_update)
 
-        repository.delete(expectation_id)
-        validation_repository.delete_by_expectation(expectation_id)
+        await repository.delete(expectation_id)
+        await validation_repository.delete_by_expectation(expectation_id)
+        await result_repository.delete_by_filter(expectation_id=expectation_id)
         return new_expectation
 
-    return repository.update(expectation_id, expectation, update_dict)
+    return await repository.update(expectation_id, expectation, update_dict)
 
 
 @router.delete("/{expectation_id}")
-def delete_expectation(
+async def delete_expectation(
     expectation_id: str,
-    repository: ExpectationRepository = Depends(get_expectation_repository),
-    validation_repository: ValidationRepository = Depends(get_validation_repository),
+    repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+    validation_repository: AsyncValidationRepository = Depends(get_async_validation_repository),
+    result_repository: AsyncExpectationResultRepository = Depends(get_async_expectation_result_repository),
 ):
-    validation_repository.delete_by_expectation(expectation_id)
-    delete_by_key_or_404(expectation_id, repository)
+    await validation_repository.delete_by_expectation(expectation_id)
+    await result_repository.delete_by_filter(expectation_id=expectation_id)
+    await delete_by_key_or_404_async(expectation_id, repository)
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content="expectation deleted"
     )
 
 
-def zip_expectations_and_validations(expectations: list[Expectation], validations: list[Validation]):
-    expectations_as_dict: dict[str, Expectation] = {}
-
-    for expectation in expectations:
-        expectations_as_dict[expectation.key] = expectation
-
-    for validation in validations:
-        run_time = utils.string_to_utc_time(validation.meta.run_id.run_time)
-
-        for result in validation.results:
-            result_as_dict = result.dict()
-            result_as_dict["run_time"] = run_time
-
-            # when an expectation is deleted, the corresponding validation results are not deleted. Instead, validations
-            # should be expired/ deleted after some portion of time. For this reason, we only want to zip/join
-            # a validation result to an expectation that hasn't been deleted.
-            if expectations_as_dict.get(result.expectation_id):
-                expectations_as_dict[result.expectation_id].validations.append(result_as_dict)
-
-    return list(expectations_as_dict.values())
-
-
-def _table_level_expectation_already_exists(expectation: Expectation, repository: ExpectationRepository):
+async def _table_level_expectation_already_exists(expectation: Expectation, repository: AsyncExpectationRepository):
     # Duplicate Table level/ result_type="expectation", expectations are removed by GE when validations are run.
     # Because of this, we want to prevent duplicate table level expectations from being added.
     if expectation.result_type == c.EXPECTATION:
-        if repository.count_by_filter(
+        if await repository.count_by_filter(
                 dataset_id=expectation.dataset_id,
                 enabled=True,
                 expectation_type=expectation.expectation_type
@@ -1,12 +1,19 @@
+import asyncio
+from typing import Optional
+
 from fastapi import APIRouter, status
 from fastapi.params import Depends
 from fastapi.responses import JSONResponse
+from opensearchpy import AsyncOpenSearch
+from app.core.engines import engine_registry
 from app.core.users import current_active_user
-from app.db.client import client
-from app.repositories.dataset import DatasetRepository, get_dataset_repository
-from app.repositories.datasource import DatasourceRepository, get_datasource_repository
-from app.repositories.expectation import ExpectationRepository, get_expectation_repository
-from app.repositories.validation import ValidationRepository, get_validation_repository
+from app.db.client import get_async_client
+from app.repositories.cache import document_cache
+from app.repositories.dataset import AsyncDatasetRepository, get_async_dataset_repository
+from app.repositories.datasource import AsyncDatasourceRepository, get_async_datasource_repository
+from app.repositories.expectation import AsyncExpectationRepository, get_async_expectation_repository
+from app.repositories.rollup import AsyncDatasetRollupRepository, get_async_dataset_rollup_repository
+from app.repositories.validation import AsyncValidationRepository, get_async_validation_repository
 from app.settings import settings
 
 router = APIRouter(
@@ -15,23 +22,25 @@ router = APIRouter(
 
 
 @router.get("/resource-counts")
-def resource_counts(
-    datasource_repository: DatasourceRepository = Depends(get_datasource_repository),
-    dataset_repository: DatasetRepository = Depends(get_dataset_repository),
-    expectation_repository: ExpectationRepository = Depends(get_expectation_repository),
-    validation_repository: ValidationRepository = Depends(get_validation_repository),
+async def resource_counts(
+    client: AsyncOpenSearch = Depends(get_async_client),
+    datasource_repository: AsyncDatasourceRepository = Depends(get_async_datasource_repository),
+    dataset_repository: AsyncDatasetRepository = Depends(get_async_dataset_repository),
+    expectation_repository: AsyncExpectationRepository = Depends(get_async_expectation_repository),
+    validation_repository: AsyncValidationRepository = Depends(get_async_validation_repository),
 ):
     # schema_count = client.search(
     #     index=settings.DATASET_INDEX,
     #     body={"size": 0, "aggs": {"item": {"cardinality": {"field": "runtime_parameters.schema"}}}}
     # )["aggregations"]["item"]["value"]
 
-    datasource_count = datasource_repository.count({"query": {"match_all": {}}})
-    dataset_count = dataset_repository.count({"query": {"match_all": {}}})
-    expectation_count = expectation_repository.count({"query": {"match": {"enabled": True}}})
-    validation_count = validation_repository.count({"query": {"match_all": {}}})
-
-    points = get_histogram_points()
+    datasource_count, dataset_count, expectation_count, validation_count, points = await asyncio.gather(
+        datasource_repository.count({"query": {"match_all": {}}}),
+        dataset_repository.count({"query": {"match_all": {}}}),
+        expectation_repository.count({"query": {"match": {"enabled": True}}}),
+        validation_repository.count({"query": {"match_all": {}}}),
+        get_histogram_points(client),
+    )
     response = {
         "datasource": {
             "count": datasource_count,
@@ -54,92 +63,15 @@ def resource_counts(
 
 
 @router.get("/top-issues")
-def top_issues():
-    issues_response = client.search(
-        index=settings.VALIDATION_INDEX,
-        body={
-            "size": 0,
-            "query": {
-                "bool": {
-                    "must": [
-                        {
-                            "range": {
-                                "meta.run_id.run_time": {
-                                    "gte": "now-1d",
-                                    "lte": "now"
-                                }
-                            }
-                        },
-                        {
-                            "range": {
-                                "statistics.unsuccessful_expectations": {"gte": 1}
-                            }
-                        }
-                    ]
-                }
-            },
-            "aggs": {
-                "dataset_agg": {
-                    "terms": {
-                        "field": "meta.dataset_id.keyword"
-                    },
-                    "aggs": {
-                        "passed_agg": {
-                            "sum": {
-                                "field": "statistics.successful_expectations"
-                            }
-                        },
-                        "failed_agg": {
-                            "sum": {
-                                "field": "statistics.unsuccessful_expectations"
-                            }
-                        },
-                        "total_agg": {
-                            "sum": {
-                                "field": "statistics.evaluated_expectations"
-                            }
-                        },
-                        "success_rate": {
-                            "avg": {
-                                "field": "statistics.success_percent"
-                            }
-                        },
-                        "success_rate_bucket_sort": {
-                            "bucket_sort": {
-                                "sort": {
-                                    "success_rate": {
-                                        "order": "asc"
-                                    }
-                                },
-                                "size": 10
-                            }
-                        }
-                    }
-                }
-            }
-        }
-    )
-    buckets = issues_response["aggregations"]["dataset_agg"]["buckets"]
-
-    dataset_id_terms = []
-    dataset_ids = {}
+async def top_issues(
+    client: AsyncOpenSearch = Depends(get_async_client),
+    rollup_repository: AsyncDatasetRollupRepository = Depends(get_async_dataset_rollup_repository),
+):
+    dataset_ids = {issue["dataset_id"]: issue for issue in await rollup_repository.top_issues()}
+    dataset_id_terms = list(dataset_ids)
     dataset_issues = []
 
-    for bucket in buckets:
-        dataset_id_terms.append(bucket["key"])
-
-        pass_count = int(bucket["passed_agg"]["value"])
-        fail_count = int(bucket["failed_agg"]["value"])
-        total_count = int(bucket["total_agg"]["value"])
-        dataset_ids[bucket["key"]] = {
-            "rate": f'{bucket["success_rate"]["value"]} %',
-            "#_failures": f'{fail_count} of {total_count}',
-            "pass_count": pass_count,
-            "fail_count": fail_count,
-            "dataset_id": bucket["key"],
-        }
-
-    datasets_response = client.search(
+    datasets_response = await client.search(
         index=settings.DATASET_INDEX,
         body={
             "_source": [
@@ -169,8 +101,26 @@ def top_issues():
     )
 
 
-def get_histogram_points():
-    points_response = client.msearch(
+@router.get("/connection-pools")
+def connection_pools(datasource_id: Optional[str] = None):
+    """Connection pool statistics for the datasource engines held by this API process."""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=engine_registry.stats(datasource_key=datasource_id),
+    )
+
+
+@router.get("/repository-cache")
+def repository_cache():
+    """Statistics of the datasource and dataset cache of this API process."""
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content=document_cache.stats(),
+    )
+
+
+async def get_histogram_points(client: AsyncOpenSearch):
+    points_response = await client.msearch(
         body=[
             {"index": settings.DATASOURCE_INDEX},
             histogram_query("create_date"),
@@ -193,8 +143,8 @@ def get_histogram_points():
                     }
                 }
             },
-            {"index": settings.VALIDATION_INDEX},
-            histogram_query("meta.run_id.run_time"),
+            {"index": settings.DATASET_ROLLUP_INDEX},
+            histogram_query("day", sum_field="validations"),
         ]
     )
     # order of list should be the same as order of indices in "body" above
@@ -204,13 +154,15 @@ def get_histogram_points():
     for i in range(len(indices)):
         temp = []
         for point in points_response["responses"][i]["aggregations"]["histogram"]["buckets"]:
-            temp.append([point["key_as_string"], point["doc_count"]])
+            # Rollups count the documents they sum up.
+            count = int(point["sum"]["value"]) if "sum" in point else point["doc_count"]
+            temp.append([point["key_as_string"], count])
         points[indices[i]] = temp
     return points
 
 
-def histogram_query(field: str):
-    return {
+def histogram_query(field: str, sum_field: Optional[str] = None):
+    query = {
         "size": 0,
         "aggs": {
             "histogram": {
@@ -223,3 +175,6 @@ def histogram_query(field: str):
             }
         }
     }
+    if sum_field is not None:
+        query["aggs"]["histogram"]["aggs"] = {"sum": {"sum": {"field": sum_field}}}
+    return query
@@ -1,8 +1,9 @@
 from fastapi import APIRouter
 from fastapi.params import Depends
 from app.core.users import current_active_user
-from app.models.task import TaskResultResponse
+from app.models.task import TaskQueue, TaskResultResponse
 from app.repositories.task import TaskRepository, get_task_repository
+from app.worker.queues import queue_depths
 
 
 router = APIRouter(
@@ -10,6 +11,11 @@ router = APIRouter(
 )
 
 
+@router.get("/queues", response_model=list[TaskQueue])
+def get_queues():
+    return [{"name": name, "messages": messages} for name, messages in queue_depths().items()]
+
+
 @router.get("/{task_id}", response_model=TaskResultResponse)
 def get_task(
     task_id: str,
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from fastapi_users.manager import (
     InvalidPasswordException,
@@ -6,9 +8,11 @@ from fastapi_users.manager import (
 )
 from fastapi_users.router.common import ErrorCode, ErrorModel
 
+from app.api.shortcuts import paginated
 from app.core import users
 from app.models.users import User, UserCreate
 from app.repositories.user import UserRepository, get_user_repository
+from app.settings import settings
 
 router = APIRouter(
     dependencies=[Depends(users.current_active_user)]
@@ -17,9 +21,13 @@ router = APIRouter(
 
 @router.get("", response_model=list[User])
 def list_users(
+        response: Response,
+        limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+        cursor: Optional[str] = None,
         repository: UserRepository = Depends(get_user_repository),
 ):
-    return repository.query({"query": {"match_all": {}}}, size=1000)
+    page = repository.paginate({"query": {"match_all": {}}}, limit=limit, cursor=cursor)
+    return paginated(response, page)
 
 
 @router.post(
@@ -1,10 +1,13 @@
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from app.api.shortcuts import paginated
 from app.models.validation import Validation, Stats
-from app.repositories.validation import ValidationRepository, get_validation_repository
+from app.repositories.rollup import AsyncDatasetRollupRepository, get_async_dataset_rollup_repository
+from app.repositories.validation import AsyncValidationRepository, get_async_validation_repository
 from fastapi.param_functions import Depends
 from app.core.users import current_active_user
+from app.settings import settings
 
 router = APIRouter(
     dependencies=[Depends(current_active_user)]
@@ -12,10 +15,13 @@ router = APIRouter(
 
 
 @router.get("", response_model=list[Validation])
-def list_validations(
+async def list_validations(
+        response: Response,
         datasource_id: Optional[str] = None,
         dataset_id: Optional[str] = None,
-        repository: ValidationRepository = Depends(get_validation_repository),
+        limit: Optional[int] = Query(default=None, ge=1, le=settings.PAGINATION_MAX_LIMIT),
+        cursor: Optional[str] = None,
+        repository: AsyncValidationRepository = Depends(get_async_validation_repository),
 ):
     if not dataset_id and not datasource_id:
         raise HTTPException(
@@ -23,34 +29,18 @@ def list_validations(
             detail=f"Expected either datasource_id or dataset_id"
         )
 
-    return repository.query_by_filter(
+    return paginated(response, await repository.query_by_filter(
         datasource_id=datasource_id,
         dataset_id=dataset_id,
-    )
+        limit=limit,
+        cursor=cursor,
+    ))
 
 
 @router.get("/statistics", response_model=Stats)
-def validations(
+async def validations(
         dataset_id: str,
-        repository: ValidationRepository = Depends(get_validation_repository),
+        repository: AsyncDatasetRollupRepository = Depends(get_async_dataset_rollup_repository),
 
 ):
-    statistics = repository.statistics(
-        dataset_id=dataset_id,
-    )
-
-    aggs = statistics["aggregations"]
-
-    validations_dataset = []
-    for daily_bucket in aggs["validation_counts"]["buckets"]:
-        objective_pass_rate = daily_bucket["1_day"]["value"]
-        validations_dataset.append([daily_bucket["key_as_string"], objective_pass_rate])
-
-    return Stats(
-        **{
-            "1_day_avg": aggs["1_day"]["success_counts"]["value"],
-            "7_day_avg": aggs["7_day"]["success_counts"]["value"],
-            "31_day_avg": aggs["31_day"]["success_counts"]["value"],
-            "validations": validations_dataset,
-        }
-    )
+    return await repository.statistics(dataset_id=dataset_id)
@@ -4,6 +4,7 @@ from app.core.exceptions import (
     SecretClientError,
     NoCredentialsError
 )
+from app.repositories.base import InvalidCursorError
 from fastapi.responses import JSONResponse
 from fastapi import FastAPI, Request, status
 
@@ -44,8 +45,18 @@ async def no_credentials_exception_handler(request: Request, exc: NoCredentialsE
     )
 
 
+async def invalid_cursor_exception_handler(request: Request, exc: InvalidCursorError):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={
+            "detail": exc.__str__()
+        },
+    )
+
+
 def add(app: FastAPI):
     app.add_exception_handler(SecretsModuleNotFoundError, secrets_import_exception_handler)
     app.add_exception_handler(SecretsKeyError, secrets_key_exception_handler)
     app.add_exception_handler(SecretClientError, secret_client_exception_handler)
     app.add_exception_handler(NoCredentialsError, no_credentials_exception_handler)
+    app.add_exception_handler(InvalidCursorError, invalid_cursor_exception_handler)
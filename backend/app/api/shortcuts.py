@@ -1,6 +1,6 @@
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Response, status
 
-from app.repositories.base import BaseRepository, M, NotFoundError
+from app.repositories.base import AsyncBaseRepository, BaseRepository, M, NotFoundError, Page
 
 
 def get_by_key_or_404(key: str, repository: BaseRepository[M]) -> M:
@@ -21,3 +21,30 @@ def delete_by_key_or_404(key: str, repository: BaseRepository[M]) -> None:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"{repository.model_class} with id '{key}' does not exist"
         )
+
+
+async def get_by_key_or_404_async(key: str, repository: AsyncBaseRepository[M]) -> M:
+    try:
+        return await repository.get(key)
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{repository.model_class} with id '{key}' does not exist"
+        )
+
+
+async def delete_by_key_or_404_async(key: str, repository: AsyncBaseRepository[M]) -> None:
+    try:
+        await repository.delete(key)
+    except NotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"{repository.model_class} with id '{key}' does not exist"
+        )
+
+
+def paginated(response: Response, page: Page[M]) -> Page[M]:
+    """Return a page, with the cursor to the next one in the X-Next-Cursor header."""
+    if page.next_cursor is not None:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page
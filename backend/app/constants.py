@@ -60,6 +60,7 @@ DATE = "date"
 # Scheduler Descriptions
 MAX_INSTANCES = "The maximum number of concurrently executing instances allowed for this schedule"
 MISFIRE_GRACE_TIME = "The amount of time (in seconds) that this schedule’s execution is allowed to be late"
+SAMPLE_FRACTION = "Fraction of rows (between 0 and 1) to validate. Overrides the dataset's sample fraction"
 
 START_DATE = "Earliest possible date/time to trigger on (inclusive)"
 END_DATE = "Latest possible date/time to trigger on (inclusive)"
@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Literal, Optional
 from app.core.actions.email_action import EmailAction
 from app.core.actions.slack_action import SlackAction
 from app.core.actions.microsoft_teams_action import MicrosoftTeamsAction
@@ -9,6 +9,7 @@ import apprise
 
 from app import constants as c
 from app.db.client import client
+from app.models.action import Action
 from app.repositories.action import ActionRepository
 
 action_map = {
@@ -28,12 +29,14 @@ def dispatch(
     resource_key: str,
     action_type: Literal["validation"],
     action_status: Literal["success", "failure"],
+    actions: Optional[list[Action]] = None,
     **kwargs,
 ):
-    actions = ActionRepository(client).list(
-        resource_key=resource_key,
-        action_type=action_type,
-    )
+    if actions is None:
+        actions = ActionRepository(client).list(
+            resource_key=resource_key,
+            action_type=action_type,
+        )
 
     if len(actions) == 0:
         return None
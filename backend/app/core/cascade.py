@@ -0,0 +1,93 @@
+"""
+Cascading deletes of the documents of a deleted datasource.
+
+Every index is deleted from by a delete_by_query task of OpenSearch, started together so that they run
+in parallel, then polled until all of them completed.
+"""
+import time
+from typing import Any, Callable, Optional
+
+from opensearchpy import OpenSearch
+
+from app.repositories.base import BaseRepository
+from app.repositories.dataset import DatasetSampleRepository
+from app.repositories.expectation import ExpectationRepository
+from app.repositories.expectation_result import ExpectationResultRepository
+from app.repositories.rollup import DatasetRollupRepository
+from app.repositories.validation import ValidationRepository
+from app.settings import settings
+
+Progress = dict[str, Any]
+
+
+class CascadeDeleteError(Exception):
+    def __init__(self, failures: dict[str, Any]):
+        super().__init__(f"Failed to delete from {', '.join(failures)}: {failures}")
+        self.failures = failures
+
+
+Delete = tuple[BaseRepository, Callable[[BaseRepository], dict[str, Any]]]
+
+
+def datasource_deletes(client: OpenSearch, datasource_id: str) -> list[Delete]:
+    """Deletes of the documents of a datasource: repositories, and how to delete from each of them."""
+    return [
+        (ValidationRepository(client), lambda r: r.delete_by_datasource(datasource_id)),
+        (ExpectationResultRepository(client), lambda r: r.delete_by_filter(datasource_id=datasource_id)),
+        (DatasetRollupRepository(client), lambda r: r.delete_by_filter(datasource_id=datasource_id)),
+        (ExpectationRepository(client), lambda r: r.delete_by_datasource(datasource_id)),
+        (DatasetSampleRepository(client), lambda r: r.delete_by_datasource(datasource_id)),
+    ]
+
+
+def cascade_delete(
+    client: OpenSearch,
+    deletes: list[Delete],
+    *,
+    requests_per_second: float = settings.CASCADE_DELETE_REQUESTS_PER_SECOND,
+    poll_interval: float = settings.CASCADE_DELETE_POLL_INTERVAL,
+    on_progress: Optional[Callable[[Progress], None]] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Progress:
+    """
+    Run `deletes` in the background of OpenSearch and wait for them, calling `on_progress` with the
+    progress of every index after each poll. Returns the final progress, or raises CascadeDeleteError
+    when some of the deletes failed.
+    """
+    tasks = {}
+    for repository, delete in deletes:
+        response = delete(repository.in_background(requests_per_second=requests_per_second))
+        tasks[repository.index] = (repository, response["task"])
+
+    progress = {index: {"total": 0, "deleted": 0, "completed": False} for index in tasks}
+    failures = {}
+    while True:
+        for index, (repository, task_id) in tasks.items():
+            if progress[index]["completed"]:
+                continue
+            task = client.tasks.get(task_id=task_id)
+            status = task["task"]["status"]
+            progress[index].update(total=status["total"], deleted=status["deleted"], completed=task["completed"])
+            if task["completed"]:
+                # Documents may have been cached while they were deleted.
+                repository._invalidate()
+                error = task.get("error") or task.get("response", {}).get("failures")
+                if error:
+                    failures[index] = error
+        if on_progress is not None:
+            on_progress(_summary(progress))
+        if all(index_progress["completed"] for index_progress in progress.values()):
+            break
+        sleep(poll_interval)
+
+    if failures:
+        raise CascadeDeleteError(failures)
+    return _summary(progress)
+
+
+def _summary(progress: dict[str, Progress]) -> Progress:
+    return {
+        "total": sum(index_progress["total"] for index_progress in progress.values()),
+        "deleted": sum(index_progress["deleted"] for index_progress in progress.values()),
+        "indices": {index: dict(index_progress) for index, index_progress in progress.items()},
+    }
@@ -0,0 +1,163 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from great_expectations.data_context import BaseDataContext
+from great_expectations.data_context.types.base import DataContextConfig
+
+from app.settings import settings
+
+
+class CachedDataContext:
+    """A data context along with the state needed to safely share it between runs."""
+
+    def __init__(self, context: BaseDataContext, fingerprint: str):
+        self.context = context
+        self.fingerprint = fingerprint
+        self.lock = threading.RLock()
+        self._runtime_batch_identifiers: dict[tuple[str, str], list[str]] = {}
+
+    def add_runtime_batch_identifier(self, datasource_name: str, data_connector_name: str, batch_identifier: str):
+        """
+        RuntimeDataConnectors only accept batch_identifiers they were configured with. Because a cached
+        context is shared by every dataset of a datasource, the connector is rebuilt (without touching the
+        execution engine) whenever a dataset it has not seen yet is run.
+        """
+        key = (datasource_name, data_connector_name)
+        datasource = self.context.get_datasource(datasource_name)
+
+        if key not in self._runtime_batch_identifiers:
+            config = datasource.config["data_connectors"][data_connector_name]
+            self._runtime_batch_identifiers[key] = list(config.get("batch_identifiers") or [])
+
+        batch_identifiers = self._runtime_batch_identifiers[key]
+        if batch_identifier in batch_identifiers:
+            return
+
+        batch_identifiers.append(batch_identifier)
+        datasource._build_data_connector_from_config(
+            name=data_connector_name,
+            config={
+                "class_name": "RuntimeDataConnector",
+                "batch_identifiers": list(batch_identifiers),
+            },
+        )
+
+    def dispose(self):
+        for datasource in self.context.datasources.values():
+            engine = getattr(datasource.execution_engine, "engine", None)
+            if engine is not None and hasattr(engine, "dispose"):
+                engine.dispose()
+
+
+class DataContextCache:
+    """
+    Per-process LRU cache of Great Expectations data contexts.
+
+    Building a BaseDataContext creates a new SQLAlchemy execution engine, so reusing
+    contexts lets back-to-back runs against the same datasource share its connection pool.
+    Entries are keyed by datasource key and an optional scope (e.g. a schema). A fingerprint
+    of the datasource name and connection string is stored with each entry so that a context
+    built from stale credentials is replaced, even in processes that never saw the update.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, Optional[str]], CachedDataContext] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(datasource_name: str, connection_string: str) -> str:
+        return hashlib.sha256(f"{datasource_name}|{connection_string}".encode()).hexdigest()
+
+    @contextmanager
+    def checkout(
+        self,
+        datasource_key: str,
+        fingerprint: str,
+        build_config: Callable[[], DataContextConfig],
+        *,
+        scope: Optional[str] = None,
+    ) -> Iterator[CachedDataContext]:
+        """
+        Yield a cached data context, building one when missing or stale.
+
+        The entry is locked for the duration of the run because an execution engine
+        tracks a single active batch and cannot be used by two runs at the same time.
+        """
+        if self.maxsize <= 0:
+            entry = CachedDataContext(BaseDataContext(project_config=build_config()), fingerprint)
+            try:
+                yield entry
+            finally:
+                entry.dispose()
+            return
+
+        entry = self._get_or_create((datasource_key, scope), fingerprint, build_config)
+        with entry.lock:
+            yield entry
+
+    def invalidate(self, datasource_key: str):
+        """Drop and dispose every context built for a datasource."""
+        with self._lock:
+            keys = [key for key in self._entries if key[0] == datasource_key]
+            entries = [self._entries.pop(key) for key in keys]
+        for entry in entries:
+            entry.dispose()
+
+    def clear(self):
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            entry.dispose()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _get_or_create(
+        self,
+        key: tuple[str, Optional[str]],
+        fingerprint: str,
+        build_config: Callable[[], DataContextConfig],
+    ) -> CachedDataContext:
+        stale: Optional[CachedDataContext] = None
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                self._entries.move_to_end(key)
+                return entry
+            if entry is not None:
+                stale = self._entries.pop(key)
+
+        if stale is not None:
+            stale.dispose()
+
+        # Build outside the lock, creating a context can take a while.
+        new_entry = CachedDataContext(BaseDataContext(project_config=build_config()), fingerprint)
+
+        evicted = []
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.fingerprint == fingerprint:
+                # Another thread won the race, keep its context.
+                self._entries.move_to_end(key)
+                evicted.append(new_entry)
+            else:
+                if entry is not None:
+                    evicted.append(self._entries.pop(key))
+                self._entries[key] = new_entry
+                entry = new_entry
+                while len(self._entries) > self.maxsize:
+                    _, lru_entry = self._entries.popitem(last=False)
+                    evicted.append(lru_entry)
+
+        for evicted_entry in evicted:
+            evicted_entry.dispose()
+        return entry
+
+
+data_context_cache = DataContextCache(maxsize=settings.DATA_CONTEXT_CACHE_SIZE)
@@ -0,0 +1,173 @@
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool, QueuePool
+
+from app.models.datasource import Datasource
+from app.settings import settings
+
+
+class PoolStats:
+    """Counters collected from SQLAlchemy pool events and from EngineRegistry.connect."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.invalidations = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def record_wait(self, seconds: float):
+        with self._lock:
+            self.wait_time_total += seconds
+            self.wait_time_max = max(self.wait_time_max, seconds)
+
+    def increment(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class RegisteredEngine:
+    def __init__(self, datasource_key: str, fingerprint: str, engine: Engine):
+        self.datasource_key = datasource_key
+        self.fingerprint = fingerprint
+        self.engine = engine
+        self.stats = PoolStats()
+
+        event.listen(engine, "connect", lambda *_: self.stats.increment("connects"))
+        event.listen(engine, "checkout", lambda *_: self.stats.increment("checkouts"))
+        event.listen(engine, "invalidate", lambda *_: self.stats.increment("invalidations"))
+
+    def to_dict(self) -> dict[str, Any]:
+        pool = self.engine.pool
+        return {
+            "datasource_id": self.datasource_key,
+            "pool_size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "connects": self.stats.connects,
+            "checkouts": self.stats.checkouts,
+            "invalidations": self.stats.invalidations,
+            "wait_time_total_ms": round(self.stats.wait_time_total * 1000, 3),
+            "wait_time_max_ms": round(self.stats.wait_time_max * 1000, 3),
+        }
+
+
+class EngineRegistry:
+    """
+    Process-wide registry of pooled SQLAlchemy engines, one per datasource.
+
+    Creating an engine per request means a new TCP/TLS/auth handshake on every call and,
+    unless the engine is disposed, leaked connections. Engines are instead created once
+    per datasource and replaced when the datasource's connection string changes.
+    """
+
+    def __init__(
+        self,
+        *,
+        pool_size: int,
+        max_overflow: int,
+        pool_timeout: int,
+        pool_recycle: int,
+        pool_pre_ping: bool,
+    ):
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+        self._engines: dict[str, RegisteredEngine] = {}
+        self._lock = threading.Lock()
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        """Keyword arguments passed to sqlalchemy.create_engine for pooled engines."""
+        return {
+            "pool_size": self.pool_size,
+            "max_overflow": self.max_overflow,
+            "pool_timeout": self.pool_timeout,
+            "pool_recycle": self.pool_recycle,
+            "pool_pre_ping": self.pool_pre_ping,
+        }
+
+    def get_engine(self, datasource: Datasource) -> Engine:
+        connection_string = datasource.connection_string()
+        fingerprint = hashlib.sha256(connection_string.encode()).hexdigest()
+
+        stale: Optional[RegisteredEngine] = None
+        with self._lock:
+            registered = self._engines.get(datasource.key)
+            if registered is not None and registered.fingerprint == fingerprint:
+                return registered.engine
+
+            engine = sa.create_engine(connection_string, poolclass=QueuePool, **self.engine_kwargs())
+            stale = self._engines.get(datasource.key)
+            self._engines[datasource.key] = RegisteredEngine(datasource.key, fingerprint, engine)
+
+        if stale is not None:
+            stale.engine.dispose()
+        return engine
+
+    @contextmanager
+    def connect(self, datasource: Datasource, *, register: bool = True) -> Iterator[Connection]:
+        """
+        Check out a connection from the datasource's pool, recording how long it took.
+
+        Without `register`, e.g. to test settings that may not be saved, the connection is opened by a
+        throwaway unpooled engine, leaving the datasource's pool untouched.
+        """
+        if not register:
+            engine = sa.create_engine(datasource.connection_string(), poolclass=NullPool)
+            try:
+                with engine.connect() as connection:
+                    yield connection
+            finally:
+                engine.dispose()
+            return
+
+        engine = self.get_engine(datasource)
+        start = time.perf_counter()
+        connection = engine.connect()
+        registered = self._engines.get(datasource.key)
+        if registered is not None:
+            registered.stats.record_wait(time.perf_counter() - start)
+
+        with connection:
+            yield connection
+
+    def invalidate(self, datasource_key: str):
+        with self._lock:
+            registered = self._engines.pop(datasource_key, None)
+        if registered is not None:
+            registered.engine.dispose()
+
+    def dispose_all(self):
+        with self._lock:
+            engines = list(self._engines.values())
+            self._engines.clear()
+        for registered in engines:
+            registered.engine.dispose()
+
+    def stats(self, datasource_key: Optional[str] = None) -> list[dict[str, Any]]:
+        with self._lock:
+            engines = list(self._engines.values())
+        return [
+            registered.to_dict() for registered in engines
+            if datasource_key is None or registered.datasource_key == datasource_key
+        ]
+
+
+engine_registry = EngineRegistry(
+    pool_size=settings.WAREHOUSE_POOL_SIZE,
+    max_overflow=settings.WAREHOUSE_POOL_MAX_OVERFLOW,
+    pool_timeout=settings.WAREHOUSE_POOL_TIMEOUT,
+    pool_recycle=settings.WAREHOUSE_POOL_RECYCLE,
+    pool_pre_ping=settings.WAREHOUSE_POOL_PRE_PING,
+)
@@ -0,0 +1,293 @@
+import hashlib
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, Hashable, Iterator, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Connection, Dialect
+from sqlalchemy.sql.elements import TextClause
+
+from app.core.engines import engine_registry
+from app.models.dataset import BaseDataset
+from app.models.datasource import Datasource, Engine
+from app.settings import settings
+
+# Dialects whose information_schema.columns view lists the columns of a schema's tables.
+INFORMATION_SCHEMA_DIALECTS = ("postgresql", "mysql", "snowflake", "trino", "awsathena")
+
+
+def list_schemas(connection: Connection) -> list[str]:
+    return sa.inspect(connection).get_schema_names()
+
+
+def list_tables(connection: Connection, engine: Optional[Engine], schema: str) -> list[tuple[str, str]]:
+    """
+    Tables and views of a schema, as (name, type) tuples.
+
+    Lists the same tables as Great Expectations' InferredAssetSqlDataConnector (including Redshift
+    Spectrum external tables) without building an execution engine and data connector, and without
+    introspecting every schema of the datasource.
+    """
+    inspector = sa.inspect(connection)
+    tables = [(table, "table") for table in inspector.get_table_names(schema=schema)]
+    try:
+        tables += [(view, "view") for view in inspector.get_view_names(schema=schema)]
+    except NotImplementedError:
+        # Not implemented by the Athena dialect
+        pass
+
+    if connection.dialect.name.lower() == "redshift":
+        result = connection.execute(
+            sa.text("select tablename from svv_external_tables where schemaname = :schema"),
+            schema=schema,
+        )
+        tables += [(row[0], "table") for row in result]
+
+    if engine == Engine.BIGQUERY:
+        tables = [(table.split(".")[1], table_type) for table, table_type in tables]
+    return tables
+
+
+def list_columns(connection: Connection, schema: str, table: str) -> list[dict[str, str]]:
+    columns = sa.inspect(connection).get_columns(schema=schema, table_name=table)
+    return [{"name": column["name"], "type": str(column["type"])} for column in columns]
+
+
+def schema_columns_query(dialect: Dialect, schema: str) -> Optional[TextClause]:
+    """
+    Single statement listing the columns of every table of a schema, as (table, column, type)
+    rows ordered by table and position. None when the dialect has no such catalog view.
+    """
+    name = dialect.name.lower()
+    if name == "bigquery":
+        if "`" in schema:
+            raise ValueError(f"invalid schema name {schema}")
+        return sa.text(
+            "select table_name, column_name, data_type "
+            f"from `{schema}.INFORMATION_SCHEMA.COLUMNS` "
+            "order by table_name, ordinal_position"
+        )
+    if name == "redshift":
+        # svv_columns also lists late-binding views and Redshift Spectrum external tables.
+        table = "svv_columns"
+    elif name in INFORMATION_SCHEMA_DIALECTS:
+        table = "information_schema.columns"
+    else:
+        return None
+
+    if name == "snowflake":
+        # Unquoted identifiers are stored upper case but listed lower case by SQLAlchemy.
+        condition = "upper(table_schema) = upper(:schema)"
+    else:
+        condition = "table_schema = :schema"
+    return sa.text(
+        "select table_name, column_name, data_type "
+        f"from {table} where {condition} "
+        "order by table_name, ordinal_position"
+    ).bindparams(schema=schema)
+
+
+def iter_schema_columns(connection: Connection, schema: str) -> Iterator[tuple[str, list[dict[str, str]]]]:
+    """Yield (table, columns) for every table and view of a schema."""
+    dialect = connection.dialect
+    query = schema_columns_query(dialect, schema)
+    if query is None:
+        for table, _ in list_tables(connection, None, schema):
+            yield table, list_columns(connection, schema, table)
+        return
+
+    def normalize(name: str) -> str:
+        if getattr(dialect, "requires_name_normalize", False):
+            return dialect.normalize_name(name)
+        return name
+
+    result = connection.execution_options(stream_results=True).execute(query)
+    for table, rows in itertools.groupby(result, key=lambda row: row[0]):
+        yield normalize(table), [{"name": normalize(row[1]), "type": str(row[2])} for row in rows]
+
+
+class CatalogEntry:
+    def __init__(self, value: Any, fingerprint: str, fetched_at: float):
+        self.value = value
+        self.fingerprint = fingerprint
+        self.fetched_at = fetched_at
+
+
+class MetadataCache:
+    """
+    Per-process cache of datasource metadata (schemas, tables, columns and their types).
+
+    Entries older than `ttl` are still served while they are refreshed in the background, so
+    browsing a warehouse only waits on introspection queries for metadata never seen before or
+    not refreshed for `max_stale` seconds. A fingerprint of the connection string is stored with
+    each entry so metadata read with other credentials is never served.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_stale: float,
+        refresh_workers: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_stale = max(max_stale, ttl)
+        self.clock = clock
+        self._entries: dict[tuple, CatalogEntry] = {}
+        self._refreshing: set[tuple] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max(refresh_workers, 1), thread_name_prefix="introspection")
+
+    @staticmethod
+    def fingerprint(datasource: Datasource) -> str:
+        return hashlib.sha256(datasource.connection_string().encode()).hexdigest()
+
+    def get(
+        self,
+        datasource: Datasource,
+        key: tuple[Hashable, ...],
+        load: Callable[[], Any],
+        *,
+        refresh: bool = False,
+    ) -> Any:
+        """
+        Return the cached metadata for `key`, calling `load` when it is missing, too old or `refresh` is set.
+        """
+        cache_key = (datasource.key, *key)
+        fingerprint = self.fingerprint(datasource)
+
+        with self._lock:
+            entry = self._entries.get(cache_key)
+        if entry is not None and entry.fingerprint != fingerprint:
+            entry = None
+
+        if refresh or entry is None or self.clock() - entry.fetched_at > self.max_stale:
+            return self._load(cache_key, fingerprint, load)
+
+        if self.clock() - entry.fetched_at > self.ttl:
+            self._refresh_in_background(cache_key, fingerprint, load)
+        return entry.value
+
+    def set(self, datasource: Datasource, key: tuple[Hashable, ...], value: Any):
+        with self._lock:
+            self._entries[(datasource.key, *key)] = CatalogEntry(value, self.fingerprint(datasource), self.clock())
+
+    def invalidate(self, datasource_key: str):
+        """Drop all metadata of a datasource."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == datasource_key]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _load(self, cache_key: tuple, fingerprint: str, load: Callable[[], Any]) -> Any:
+        value = load()
+        with self._lock:
+            self._entries[cache_key] = CatalogEntry(value, fingerprint, self.clock())
+        return value
+
+    def _refresh_in_background(self, cache_key: tuple, fingerprint: str, load: Callable[[], Any]):
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                self._load(cache_key, fingerprint, load)
+            except Exception as ex:
+                # Keep serving the stale entry, the next request past the TTL retries.
+                print(f"Failed to refresh metadata {cache_key}: {ex}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        self._executor.submit(refresh)
+
+
+def get_schemas(datasource: Datasource, *, refresh: bool = False) -> list[str]:
+    def load():
+        with engine_registry.connect(datasource) as connection:
+            return list_schemas(connection)
+
+    return metadata_cache.get(datasource, ("schemas",), load, refresh=refresh)
+
+
+def get_tables(datasource: Datasource, schema: str, *, refresh: bool = False) -> list[tuple[str, str]]:
+    def load():
+        with engine_registry.connect(datasource) as connection:
+            return list_tables(connection, datasource.engine, schema)
+
+    return metadata_cache.get(datasource, ("tables", schema), load, refresh=refresh)
+
+
+def get_columns(datasource: Datasource, schema: Optional[str], table: str, *, refresh: bool = False) -> list[dict[str, str]]:
+    def load():
+        with engine_registry.connect(datasource) as connection:
+            return list_columns(connection, schema, table)
+
+    return metadata_cache.get(datasource, ("columns", schema, table), load, refresh=refresh)
+
+
+def get_dataset_columns(dataset: BaseDataset, datasource: Datasource, *, refresh: bool = False) -> list[dict[str, Optional[str]]]:
+    """
+    Columns of a dataset, e.g. for the column pickers of the expectation form.
+
+    Physical tables share the cached catalog of the introspection endpoints. The columns of
+    virtual datasets are read from an empty result of their query, and have no type.
+    """
+    schema, table, is_virtual = dataset.get_resource_names()
+    if not is_virtual:
+        return get_columns(datasource, schema, table, refresh=refresh)
+
+    query = dataset.runtime_parameters.query
+
+    def load():
+        selectable = sa.text(query).columns().subquery("swiple_dataset")
+        with engine_registry.connect(datasource) as connection:
+            keys = connection.execute(sa.select([sa.text("*")]).select_from(selectable).limit(0)).keys()
+        return [{"name": name, "type": None} for name in keys]
+
+    return metadata_cache.get(datasource, ("query_columns", query), load, refresh=refresh)
+
+
+def stream_schema_columns(datasource: Datasource, schema: str) -> Iterator[tuple[str, list[dict[str, str]]]]:
+    """
+    Stream the columns of every table of a schema, adding them to the metadata cache.
+
+    The catalog query runs before returning so that errors are raised to the caller. The
+    connection is released once the returned iterator is exhausted or closed.
+    """
+    stack = ExitStack()
+    try:
+        connection = stack.enter_context(engine_registry.connect(datasource))
+        tables = iter_schema_columns(connection, schema)
+        first = next(tables, None)
+    except BaseException:
+        stack.close()
+        raise
+
+    def stream():
+        with stack:
+            if first is None:
+                return
+            for table, columns in itertools.chain([first], tables):
+                metadata_cache.set(datasource, ("columns", schema, table), columns)
+                yield table, columns
+
+    return stream()
+
+
+metadata_cache = MetadataCache(
+    ttl=settings.INTROSPECTION_CACHE_TTL,
+    max_stale=settings.INTROSPECTION_CACHE_MAX_STALE,
+    refresh_workers=settings.INTROSPECTION_REFRESH_WORKERS,
+)
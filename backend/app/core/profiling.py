@@ -0,0 +1,96 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from app.settings import settings
+
+TABLE_EXPECTATIONS = [
+    "expect_table_columns_to_match_ordered_list",
+    "expect_table_row_count_to_be_between",
+]
+
+
+class DatasourceSlots:
+    """
+    Bounds how many profiling chunks run at the same time against a datasource.
+
+    A slot is a small integer that is also used as the data context scope of a chunk, so concurrent
+    chunks get their own cached data context (and execution engine) while sequential runs reuse them.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(size, 1)
+        self._queues: dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, datasource_key: str) -> Iterator[int]:
+        with self._lock:
+            slots = self._queues.get(datasource_key)
+            if slots is None:
+                slots = queue.Queue()
+                for slot in range(self.size):
+                    slots.put(slot)
+                self._queues[datasource_key] = slots
+
+        slot = slots.get()
+        try:
+            yield slot
+        finally:
+            slots.put(slot)
+
+
+def chunk_columns(columns: list[str], chunk_size: int) -> list[list[str]]:
+    chunk_size = max(chunk_size, 1)
+    return [columns[i:i + chunk_size] for i in range(0, len(columns), chunk_size)] or [[]]
+
+
+def select_columns(
+    columns: list[str],
+    include_columns: Optional[list[str]] = None,
+    exclude_columns: Optional[list[str]] = None,
+) -> list[str]:
+    """Columns to profile, in table order."""
+    include = set(include_columns) if include_columns else None
+    exclude = set(exclude_columns or [])
+    return [
+        column for column in columns
+        if (include is None or column in include) and column not in exclude
+    ]
+
+
+def profile_in_chunks(
+    datasource_key: str,
+    all_columns: list[str],
+    columns: list[str],
+    profile_chunk: Callable[[list[str], list[str], int], list[dict]],
+    *,
+    chunk_size: int,
+    slots: "DatasourceSlots",
+) -> list[dict]:
+    """
+    Profile `columns` in chunks, concurrently, and merge the suggested expectations.
+
+    `profile_chunk(ignored_columns, excluded_expectations, slot)` profiles one chunk. Table level
+    expectations are only suggested by the first chunk. Suggestions are returned in the same order
+    as a serial run: table expectations first, then columns in table order.
+    """
+    chunks = chunk_columns(columns, chunk_size)
+
+    def run(index: int) -> list[dict]:
+        chunk = set(chunks[index])
+        ignored_columns = [column for column in all_columns if column not in chunk]
+        excluded_expectations = [] if index == 0 else TABLE_EXPECTATIONS
+        with slots.acquire(datasource_key) as slot:
+            return profile_chunk(ignored_columns, excluded_expectations, slot)
+
+    max_workers = min(len(chunks), slots.size)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="profiling") as executor:
+        results = list(executor.map(run, range(len(chunks))))
+
+    return [expectation for result in results for expectation in result]
+
+
+profiling_slots = DatasourceSlots(size=settings.PROFILING_MAX_CONCURRENCY_PER_DATASOURCE)
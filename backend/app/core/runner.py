@@ -1,7 +1,9 @@
 import json
-import datetime
 import uuid
-from typing import Literal
+from decimal import Decimal
+from numbers import Number
+from contextlib import contextmanager
+from typing import Iterator, Literal, Optional
 
 from great_expectations.core import ExpectationSuite, ExpectationConfiguration
 from great_expectations.core.batch import RuntimeBatchRequest, BatchRequest
@@ -10,25 +12,37 @@ from great_expectations.data_context.types.base import DataContextConfig, Anonym
 from great_expectations.data_context.types.base import InMemoryStoreBackendDefaults
 from great_expectations.profile.user_configurable_profiler import UserConfigurableProfiler
 from opensearchpy import OpenSearch
-from pandas import isnull
+import sqlalchemy as sa
 
 
 from app import constants as c
 from app import utils
 from app.core.actions import action_dispatcher
+from app.core.data_context import data_context_cache
+from app.core.engines import engine_registry
 from app.core.expectations import supported_unsupported_expectations
+from app.core.profiling import profile_in_chunks, profiling_slots, select_columns
+from app.core.sample import rows_to_records
+from app.core.sampling import get_sample_method, sample_selectable, success_percent_interval
+from app.core.validator import get_validator
 from app.db.client import client as os_client
+from app.models.dataset import RuntimeParameters, ValidationMode
+from app.models.action import Action
 from app.models.datasource import Engine
-from app.models.validation import Validation
+from app.models.validation import Sampling, Validation, Watermark
+from app.repositories.base import ConsistencySession
 from app.repositories.dataset import DatasetRepository
 from app.repositories.datasource import DatasourceRepository
-from app.repositories.expectation import ExpectationRepository
+from app.repositories.validation import ValidationRepository
+from app.repositories.validation_bundle import ValidationBundleRepository
 from app.settings import settings
 
 
 class Runner:
     def __init__(self, datasource, batch, meta, dataset_id=None, datasource_id=None, expectations=None,
-                 identifiers=None, excluded_expectations=[]):
+                 identifiers=None, excluded_expectations=[], watermark: Optional[Watermark] = None,
+                 sample_fraction: Optional[float] = None, ignored_columns: Optional[list[str]] = None,
+                 context_scope: Optional[str] = None, actions: Optional[list[Action]] = None):
         self.identifiers = identifiers
         self.datasource = datasource
         self.batch = batch
@@ -37,28 +51,35 @@ class Runner:
         self.datasource_id = datasource_id
         self.dataset_id = dataset_id
         self.excluded_expectations = excluded_expectations
+        self.watermark = watermark
+        self.sample_fraction = sample_fraction if sample_fraction and sample_fraction < 1 else None
+        self.ignored_columns = ignored_columns
+        # Extra data context cache scope, used to give concurrent runs their own context.
+        self.context_scope = context_scope
+        # Validation actions of the dataset, read when dispatching them if None.
+        self.actions = actions
 
     def profile(self):
         assert self.datasource_id is not None, 'Require "datasource_id" when profiling.'
         assert self.dataset_id is not None, 'Require "dataset_id" when profiling.'
 
-        data_context_config = self.get_data_context_config()
-        context = BaseDataContext(project_config=data_context_config)
-        suite: ExpectationSuite = context.create_expectation_suite("default", overwrite_existing=True)
+        with self.data_context() as context:
+            suite = ExpectationSuite(expectation_suite_name="default", data_context=context)
 
-        batch_request = self.get_batch_request(is_profile=True)
+            batch_request = self.get_batch_request(is_profile=True)
 
-        validator = context.get_validator(
-            batch_request=batch_request,
-            expectation_suite=suite,
-        )
+            validator = context.get_validator(
+                batch_request=batch_request,
+                expectation_suite=suite,
+            )
 
-        profiler = UserConfigurableProfiler(
-            validator,
-            excluded_expectations=self.excluded_expectations,
-            value_set_threshold="few",
-        )
-        expectations = profiler.build_suite().to_json_dict()['expectations']
+            profiler = UserConfigurableProfiler(
+                validator,
+                excluded_expectations=self.excluded_expectations,
+                ignored_columns=self.ignored_columns,
+                value_set_threshold="few",
+            )
+            expectations = profiler.build_suite().to_json_dict()['expectations']
 
         for expectation in expectations:
             expectation["kwargs"].update({"result_format": "SUMMARY", "include_config": True, "catch_exceptions": True})
@@ -77,18 +98,15 @@ class Runner:
         return expectations
 
     def sample(self):
-        data_context_config = self.get_data_context_config()
-        context = BaseDataContext(project_config=data_context_config)
-
         batch_request = self.get_batch_request()
 
-        suite: ExpectationSuite = context.create_expectation_suite("default", overwrite_existing=True)
-
         try:
-            validator = context.get_validator(
-                batch_request=batch_request, expectation_suite=suite,
-            )
-            head = validator.head()
+            with self.data_context() as context:
+                suite = ExpectationSuite(expectation_suite_name="default", data_context=context)
+                validator = context.get_validator(
+                    batch_request=batch_request, expectation_suite=suite,
+                )
+                head = validator.head()
         except KeyError as ex:
             if self.batch.runtime_parameters:
                 return {"exception": f"Syntax error in query."}
@@ -96,27 +114,17 @@ class Runner:
                 print(str(ex))
                 return {"exception": f"{self.batch.dataset_name} is not recognized."}
 
-        rows = head.to_dict(orient='records')
-        columns = head.columns
-
-        for record in rows:
-            for column in columns:
-                if isinstance(record[column], datetime.datetime):
-                    record[column] = record[column].__str__()
-
-                if isnull(record[column]):
-                    record[column] = None
-        return {'columns': list(columns), 'rows': rows}
+        columns = list(head.columns)
+        rows = rows_to_records(columns, list(head.itertuples(index=False, name=None)))
+        return {'columns': columns, 'rows': rows}
 
     def validate(self) -> Validation:
-        data_context_config = self.get_data_context_config()
-        context = BaseDataContext(project_config=data_context_config)
-
-        suite: ExpectationSuite = context.create_expectation_suite("default", overwrite_existing=True)
+        suite = ExpectationSuite(expectation_suite_name="default")
 
+        runtime_parameters = self._get_runtime_parameters()
         for expectation in self.expectations:
-            if self.batch.runtime_parameters:
-                expectation_meta = {**self.meta, **self.batch.runtime_parameters.dict(by_alias=True)}
+            if runtime_parameters:
+                expectation_meta = {**self.meta, **runtime_parameters.dict(by_alias=True)}
             else:
                 expectation_meta = {**self.meta}
 
@@ -135,15 +143,19 @@ class Runner:
             suite.add_expectation(expectation_configuration=expectation_configuration)
 
         batch_request = self.get_batch_request()
-        validator = context.get_validator(
-            batch_request=batch_request, expectation_suite=suite,
-        )
+        with self.data_context() as context:
+            validator = get_validator(context, batch_request, suite)
+
+            validation = validator.validate().to_json_dict()
 
-        validation = validator.validate().to_json_dict()
         validation["meta"]["run_id"]["run_time"] = utils.remove_t_from_date_string(
             validation["meta"]["run_id"]["run_time"])
         validation["meta"]["run_id"]["run_name"] = self.identifiers.pop("task_id")
         validation["meta"].update(self.identifiers)
+        if self.watermark:
+            validation["meta"]["watermark"] = self.watermark.dict()
+        if self.sample_fraction:
+            validation["meta"]["sampling"] = self._get_sampling(validation["results"]).dict()
 
         for result in validation["results"]:
             # GE "mostly" is synonymous for Swiple "objective"
@@ -160,11 +172,38 @@ class Runner:
             resource_key=self.identifiers["dataset_id"],
             action_type="validation",
             action_status=self._get_status(validation["success"]),
+            actions=self.actions,
             validation=validation,
         )
 
         return Validation(**validation)
 
+    @contextmanager
+    def data_context(self) -> Iterator[BaseDataContext]:
+        """
+        Yield a data context for this runner's datasource.
+
+        Contexts are cached per process (see app.core.data_context) so that consecutive runs
+        against the same datasource reuse its execution engine and connection pool.
+        """
+        fingerprint = data_context_cache.fingerprint(
+            self.datasource.datasource_name,
+            self._get_connection_string(),
+        )
+        with data_context_cache.checkout(
+            self.datasource.key,
+            fingerprint,
+            self.get_data_context_config,
+            scope=self._data_context_scope(),
+        ) as cached_context:
+            if self._get_runtime_parameters():
+                cached_context.add_runtime_batch_identifier(
+                    self.datasource.datasource_name,
+                    "default_runtime_data_connector",
+                    self.batch.dataset_name,
+                )
+            yield cached_context.context
+
     def get_data_context_config(self):
         connection_string = self._get_connection_string()
 
@@ -176,6 +215,9 @@ class Runner:
                     "execution_engine": {
                         "class_name": "SqlAlchemyExecutionEngine",
                         "connection_string": connection_string,
+                        # GE copies this config, so the engine can't be shared with engine_registry.
+                        # Contexts are cached per datasource instead, using the same pool settings.
+                        **engine_registry.engine_kwargs(),
                     },
                     "data_connectors": {
                         "default_runtime_data_connector": {
@@ -208,7 +250,8 @@ class Runner:
         return context
 
     def get_batch_request(self, is_profile=True):
-        if self.batch.runtime_parameters:
+        runtime_parameters = self._get_runtime_parameters()
+        if runtime_parameters:
             batch_spec_passthrough = None
             if is_profile:
                 # Bug when profiling. Requires physical/temp table to get column types.
@@ -216,12 +259,11 @@ class Runner:
                 # is fixed
                 batch_spec_passthrough = {"create_temp_table": True}
 
-            runtime_parameters = self.batch.runtime_parameters.dict(by_alias=True)
             return RuntimeBatchRequest(
                 datasource_name=self.datasource.datasource_name,
                 data_connector_name="default_runtime_data_connector",
                 data_asset_name=self.batch.dataset_name,
-                runtime_parameters=runtime_parameters,
+                runtime_parameters=runtime_parameters.dict(by_alias=True),
                 batch_identifiers={self.batch.dataset_name: self.batch.dataset_name},
                 batch_spec_passthrough=batch_spec_passthrough,
             )
@@ -234,15 +276,16 @@ class Runner:
             )
 
     def _get_connection_string(self):
+        runtime_parameters = self._get_runtime_parameters()
         # Snowflake SQLAlchemy connector requires the schema in the connection string in order to create TEMP tables.
-        if self.datasource.engine == Engine.SNOWFLAKE and self.batch.runtime_parameters:
-            schema = self.batch.runtime_parameters.schema_name
+        if self.datasource.engine == Engine.SNOWFLAKE and runtime_parameters:
+            schema = runtime_parameters.schema_name
             connection_string = self.datasource.connection_string(schema)
         # BigQuery SQLAlchemy connector requires the dataset_id/schema in connection string
-        elif self.datasource.engine == Engine.BIGQUERY and self.batch.runtime_parameters:
-            schema = self.batch.runtime_parameters.schema_name
+        elif self.datasource.engine == Engine.BIGQUERY and runtime_parameters:
+            schema = runtime_parameters.schema_name
             connection_string = self.datasource.connection_string(schema)
-        elif self.datasource.engine == Engine.BIGQUERY and not self.batch.runtime_parameters:
+        elif self.datasource.engine == Engine.BIGQUERY and not runtime_parameters:
             schema, _ = self.batch.dataset_name.split(".")
             connection_string = self.datasource.connection_string(schema)
         else:
@@ -250,6 +293,55 @@ class Runner:
 
         return connection_string
 
+    def _get_runtime_parameters(self) -> Optional[RuntimeParameters]:
+        """
+        Runtime parameters of the batch to validate. Incremental runs wrap the dataset in a query
+        that only selects rows newer than the previous run's watermark, sampled runs in a query
+        that only reads a fraction of its rows.
+        """
+        incremental = self.watermark is not None and self.watermark.mode == ValidationMode.INCREMENTAL
+        if not incremental and not self.sample_fraction:
+            return self.batch.runtime_parameters
+
+        schema, _, _ = self.batch.get_resource_names()
+        dialect = engine_registry.get_engine(self.datasource).dialect
+        source = get_dataset_selectable(self.batch)
+        if self.sample_fraction:
+            source = sample_selectable(source, self.batch, self.datasource.engine, dialect, self.sample_fraction)
+
+        query = sa.select([sa.text("*")]).select_from(source)
+        if incremental:
+            column = sa.column(self.watermark.column)
+            query = query.where(
+                sa.and_(
+                    column > _watermark_literal(self.watermark.low, self.watermark.numeric),
+                    column <= _watermark_literal(self.watermark.high, self.watermark.numeric),
+                )
+            )
+        compiled = query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+        return RuntimeParameters(schema=schema, query=str(compiled))
+
+    def _get_sampling(self, results: list[dict]) -> Sampling:
+        confidence_level = settings.SAMPLED_VALIDATION_CONFIDENCE_LEVEL
+        interval = success_percent_interval(results, confidence_level)
+        return Sampling(
+            fraction=self.sample_fraction,
+            method=get_sample_method(self.batch, self.datasource.engine),
+            confidence_level=confidence_level,
+            success_percent_lower=interval[0] if interval else None,
+            success_percent_upper=interval[1] if interval else None,
+        )
+
+    def _data_context_scope(self) -> Optional[str]:
+        # Snowflake and BigQuery connection strings depend on the dataset's schema,
+        # so contexts for those engines are cached per schema.
+        scope = None
+        if self.datasource.engine in (Engine.SNOWFLAKE, Engine.BIGQUERY):
+            scope, _, _ = self.batch.get_resource_names()
+        if self.context_scope:
+            scope = f"{scope}:{self.context_scope}" if scope else self.context_scope
+        return scope
+
     @staticmethod
     def _get_status(success: bool) -> Literal["success", "failure"]:
         action_status: Literal["failure"] = "failure"
@@ -258,10 +350,17 @@ class Runner:
         return action_status
 
 
-def run_dataset_validation(dataset_id: str, task_id: str, client: OpenSearch = os_client):
-    dataset = DatasetRepository(client).get(dataset_id)
-    datasource = DatasourceRepository(client).get(dataset.datasource_id)
-    expectations = ExpectationRepository(client).query_by_filter(dataset_id=dataset.key, enabled=True)
+def run_dataset_validation(
+    dataset_id: str,
+    task_id: str,
+    client: OpenSearch = os_client,
+    sample_fraction: Optional[float] = None,
+    consistency_token: Optional[str] = None,
+):
+    # The token of the client requesting the validation, to read the expectations and actions it just wrote.
+    session = ConsistencySession(consistency_token)
+    bundle = ValidationBundleRepository(client, session=session).get(dataset_id)
+    dataset, datasource, expectations = bundle.dataset, bundle.datasource, bundle.expectations
 
     identifiers = {
         "datasource_id": datasource.key,
@@ -274,6 +373,10 @@ def run_dataset_validation(dataset_id: str, task_id: str, client: OpenSearch = o
         "dataset_name": dataset.dataset_name,
     }
 
+    watermark = None
+    if dataset.validation_mode == ValidationMode.INCREMENTAL:
+        watermark = get_next_watermark(dataset, datasource, ValidationRepository(client))
+
     runner_expectations = []
     for expectation in expectations:
         runner_expectation = expectation.dict()
@@ -286,12 +389,74 @@ def run_dataset_validation(dataset_id: str, task_id: str, client: OpenSearch = o
         meta=meta,
         expectations=runner_expectations,
         identifiers=identifiers,
+        watermark=watermark,
+        sample_fraction=sample_fraction or dataset.sample_fraction,
+        actions=bundle.actions,
     ).validate()
 
     return validation
 
 
-def create_dataset_suggestions(dataset_id: str, client: OpenSearch = os_client):
+def get_dataset_selectable(dataset):
+    if dataset.runtime_parameters:
+        return sa.text(dataset.runtime_parameters.query).columns().subquery("swiple_dataset")
+    schema, table, _ = dataset.get_resource_names()
+    return sa.table(table, schema=schema)
+
+
+def get_next_watermark(dataset, datasource, repository: ValidationRepository) -> Watermark:
+    """
+    Bounds of the next validation of an incremental dataset.
+
+    Rows newer than the last successful run's high-water mark are validated. A full validation
+    runs instead when there is no usable previous watermark, or when no full validation ran
+    within the dataset's full_validation_interval.
+    """
+    previous = repository.get_last_watermark(dataset.key)
+    if previous is not None and previous.column != dataset.watermark_column:
+        previous = None
+
+    full = (
+        previous is None
+        or previous.high is None
+        or (
+            dataset.full_validation_interval > 0
+            and not repository.has_full_validation_since(dataset.key, dataset.full_validation_interval)
+        )
+    )
+
+    query = sa.select([sa.func.max(sa.column(dataset.watermark_column))]).select_from(get_dataset_selectable(dataset))
+    with engine_registry.connect(datasource) as connection:
+        high = connection.execute(query).scalar()
+
+    if high is None:
+        # Empty dataset, keep the previous high-water mark so the next run starts from it.
+        high_value = previous.high if previous else None
+        numeric = previous.numeric if previous else False
+    else:
+        high_value = str(high)
+        numeric = isinstance(high, Number) and not isinstance(high, bool)
+
+    return Watermark(
+        column=dataset.watermark_column,
+        mode=ValidationMode.FULL if full else ValidationMode.INCREMENTAL,
+        low=None if full else previous.high,
+        high=high_value,
+        numeric=numeric,
+    )
+
+
+def _watermark_literal(value: str, numeric: bool):
+    return sa.literal(Decimal(value) if numeric else value)
+
+
+def create_dataset_suggestions(
+    dataset_id: str,
+    client: OpenSearch = os_client,
+    include_columns: Optional[list[str]] = None,
+    exclude_columns: Optional[list[str]] = None,
+) -> tuple[list[str], list[dict]]:
+    """The profiled columns of a dataset and the expectations suggested for them."""
     dataset = DatasetRepository(client).get(dataset_id)
     datasource = DatasourceRepository(client).get(dataset.datasource_id)
     
@@ -308,14 +473,37 @@ def create_dataset_suggestions(dataset_id: str, client: OpenSearch = os_client):
     excluded_expectations = supported_unsupported_expectations()["unsupported_expectations"]
     excluded_expectations.append(c.EXPECT_COLUMN_VALUES_TO_BE_BETWEEN)
 
-    results = Runner(
-        datasource=datasource,
-        batch=dataset,
-        meta=meta,
-        identifiers=identifiers,
-        datasource_id=dataset.datasource_id,
-        dataset_id=dataset.key,
-        excluded_expectations=excluded_expectations,
-    ).profile()
-
-    return results
+    def profile_chunk(ignored_columns: list[str], excluded_table_expectations: list[str], slot: int):
+        return Runner(
+            datasource=datasource,
+            batch=dataset,
+            meta=meta,
+            identifiers=identifiers,
+            datasource_id=dataset.datasource_id,
+            dataset_id=dataset.key,
+            excluded_expectations=excluded_expectations + excluded_table_expectations,
+            ignored_columns=ignored_columns,
+            context_scope=f"profiling-{slot}",
+        ).profile()
+
+    all_columns = get_dataset_columns(dataset, datasource)
+    columns = select_columns(all_columns, include_columns, exclude_columns)
+    # Query datasets are materialised into a temp table by each profiling run (see get_batch_request),
+    # so they are profiled in a single chunk rather than running their query once per chunk.
+    chunk_size = len(columns) if dataset.runtime_parameters else settings.PROFILING_COLUMNS_PER_CHUNK
+    results = profile_in_chunks(
+        datasource.key,
+        all_columns,
+        columns,
+        profile_chunk,
+        chunk_size=chunk_size,
+        slots=profiling_slots,
+    )
+
+    return columns, results
+
+
+def get_dataset_columns(dataset, datasource) -> list[str]:
+    query = sa.select([sa.text("*")]).select_from(get_dataset_selectable(dataset)).limit(0)
+    with engine_registry.connect(datasource) as connection:
+        return list(connection.execute(query).keys())
@@ -1,11 +1,22 @@
 import datetime
-from typing import Any
+import hashlib
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Optional, Sequence, Union
+
+import numpy as np
+from pandas import NaT
 
-from sqlalchemy import create_engine
 from sqlalchemy.exc import ProgrammingError, OperationalError, DatabaseError
 
+from app.core.engines import engine_registry
 from app.models.dataset import BaseDataset, Sample
 from app.models.datasource import Datasource
+from app.settings import settings
 from app.utils import add_limit_clause
 
 
@@ -15,44 +26,108 @@ class GetSampleException(Exception):
         super().__init__(*args)
 
 
-def get_dataset_sample(dataset: BaseDataset, datasource: Datasource) -> Sample:
+class CachedSample:
+    def __init__(self, sample: Sample, created_at: float):
+        self.sample = sample
+        self.created_at = created_at
+
+
+class SampleCache:
+    """
+    Per-process LRU cache of sample query results with a TTL.
+
+    Entries are keyed by datasource key and a hash of the normalized query and the datasource's
+    connection string, so the same SQL sampled again while a dataset is being edited is served
+    without querying the warehouse, and a sample taken with other credentials is never reused.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[tuple[str, str], CachedSample] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.split()).rstrip(";").strip()
+
+    @classmethod
+    def fingerprint(cls, query: str, connection_string: str) -> str:
+        return hashlib.sha256(f"{connection_string}|{cls.normalize_query(query)}".encode()).hexdigest()
+
+    def get(self, datasource_key: str, fingerprint: str) -> Optional[CachedSample]:
+        if self.maxsize <= 0:
+            return None
+        key = (datasource_key, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.clock() - entry.created_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, datasource_key: str, fingerprint: str, sample: Sample):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[(datasource_key, fingerprint)] = CachedSample(sample, self.clock())
+            self._entries.move_to_end((datasource_key, fingerprint))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def age(self, entry: CachedSample) -> float:
+        return max(self.clock() - entry.created_at, 0.0)
+
+    def invalidate(self, datasource_key: str):
+        """Drop every sample taken from a datasource."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == datasource_key]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def get_dataset_sample(dataset: BaseDataset, datasource: Datasource, use_cache: bool = True) -> Sample:
+    """
+    Sample a dataset, reusing a recent sample of the same query when `use_cache` is set.
+
+    Samples served from the cache have `cache_age` set to their age in seconds.
+    """
     if dataset.runtime_parameters:
-        return get_sample_query_results(
-            query=dataset.runtime_parameters.query,
-            url=datasource.connection_string()
-        )
+        query = dataset.runtime_parameters.query
+    else:
+        query = f"select * from {dataset.dataset_name}"
+
+    fingerprint = sample_cache.fingerprint(query, datasource.connection_string())
+    if use_cache:
+        entry = sample_cache.get(datasource.key, fingerprint)
+        if entry is not None:
+            sample = entry.sample.copy()
+            sample._cache_age = sample_cache.age(entry)
+            return sample
 
-    return get_sample_query_results(
-        query=f"select * from {dataset.dataset_name}",
-        url=datasource.connection_string(),
-    )
+    sample = get_sample_query_results(query=query, datasource=datasource)
+    sample_cache.set(datasource.key, fingerprint, sample)
+    return sample
 
 
-def get_sample_query_results(query: str, url: str) -> Sample:
+def get_sample_query_results(query: str, datasource: Datasource) -> Sample:
     try:
         query = add_limit_clause(query)
 
-        with create_engine(url).connect() as con:
+        with engine_registry.connect(datasource) as con:
             execution = con.execute(query)
-            # TODO neaten up
-            result_set = []
             columns, rows = get_columns_and_rows(execution)
-
-            for i, row in enumerate(rows):
-                temp_row = {"key": i}
-                row = list(row)
-
-                for key in columns:
-                    for value in row:
-                        if isinstance(value, datetime.datetime):
-                            temp_row[key] = value.__str__()
-                        else:
-                            temp_row[key] = value
-
-                        row.remove(value)
-                        break
-
-                result_set.append(temp_row)
+            result_set = rows_to_records(columns, rows, key=True)
 
             if len(columns) == 0:
                 raise GetSampleException("No columns included in statement.")
@@ -69,6 +144,118 @@ def get_columns_and_rows(execution):
     return list(execution.keys()), execution.all()
 
 
+def _decimal_to_json(value: Decimal) -> Optional[Union[int, float]]:
+    if not value.is_finite():
+        return None
+    if value.as_tuple().exponent >= 0:
+        return int(value)
+    return float(value)
+
+
+def _float_to_json(value: float) -> Optional[float]:
+    return value if math.isfinite(value) else None
+
+
+def _bytes_to_json(value: Union[bytes, bytearray, memoryview]) -> str:
+    value = bytes(value)
+    try:
+        return value.decode("utf-8")
+    except UnicodeDecodeError:
+        return "0x" + value.hex()
+
+
+def _datetime_to_json(value: datetime.datetime) -> Optional[str]:
+    # pandas.NaT is a datetime subclass.
+    return None if value is NaT else value.__str__()
+
+
+# Converters to a JSON-safe value, by Python type (subclasses use the converter of their closest
+# listed base). Other types are kept as is when JSON-safe and converted with str() otherwise.
+_CONVERTERS: dict[type, Callable[[Any], Any]] = {
+    datetime.datetime: _datetime_to_json,
+    datetime.date: str,
+    datetime.time: str,
+    datetime.timedelta: str,
+    Decimal: _decimal_to_json,
+    float: _float_to_json,
+    bytes: _bytes_to_json,
+    bytearray: _bytes_to_json,
+    memoryview: _bytes_to_json,
+    uuid.UUID: str,
+}
+
+_JSON_TYPES = (str, int, float, bool, dict, list)
+
+# Types of columns that need no conversion.
+_SAFE_TYPES = {str, int, bool}
+
+
+def to_json_safe(value: Any) -> Any:
+    """Convert a single value of a result set to a JSON-safe value."""
+    if value is None:
+        return None
+    converter = _converter(type(value))
+    if converter is not None:
+        return converter(value)
+    if isinstance(value, _JSON_TYPES):
+        return value
+    if isinstance(value, np.generic):
+        return to_json_safe(value.item())
+    return str(value)
+
+
+def _converter(cls: type) -> Optional[Callable[[Any], Any]]:
+    for base in cls.__mro__:
+        converter = _CONVERTERS.get(base)
+        if converter is not None:
+            return converter
+    return None
+
+
+def convert_column(values: Sequence[Any]) -> Sequence[Any]:
+    """
+    Convert the values of one column to JSON-safe values.
+
+    The converter is picked once from the types found in the column. Columns of strings and
+    integers are returned as is, columns mixing several types (e.g. in SQLite) are converted
+    value by value.
+    """
+    types = set(map(type, values))
+    types.discard(type(None))
+    if not types or types <= _SAFE_TYPES:
+        return values
+    if len(types) == 1:
+        converter = _converter(types.pop())
+        if converter is not None:
+            return [None if value is None else converter(value) for value in values]
+    return [to_json_safe(value) for value in values]
+
+
+def rows_to_records(columns: Sequence[str], rows: Sequence[Sequence[Any]], key: bool = False) -> list[dict[str, Any]]:
+    """
+    Convert a result set to JSON-safe records, column by column.
+
+    Datetimes become strings, NaN and infinite numbers become None, decimals become int or
+    float, and bytes are decoded (or hex encoded when not UTF-8). When `key` is set, each record
+    also gets its row number under "key".
+    """
+    columns = list(columns)
+    if any(len(row) != len(columns) for row in rows):
+        # Ragged rows can't be transposed, convert them value by value.
+        rows = [[to_json_safe(value) for value in row] for row in rows]
+    else:
+        converted = [convert_column(values) for values in zip(*rows)]
+        rows = list(zip(*converted)) if converted else [() for _ in rows]
+
+    if key:
+        names = ["key", *columns]
+        return [dict(zip(names, (i, *values))) for i, values in enumerate(rows)]
+    return [dict(zip(columns, values)) for values in rows]
+
+
+sample_cache = SampleCache(maxsize=settings.SAMPLE_CACHE_SIZE, ttl=settings.SAMPLE_CACHE_TTL)
+
+
 def error_msg_from_exception(ex: Exception) -> str:
     """Translate exception into error message
     Database have different ways to handle exception. This function attempts
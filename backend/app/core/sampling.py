@@ -0,0 +1,116 @@
+import math
+from enum import Enum
+from statistics import NormalDist
+from typing import Any, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.engine import Dialect
+from sqlalchemy.sql import FromClause
+
+from app.models.dataset import BaseDataset
+from app.models.datasource import Engine
+
+
+class SampleMethod(str, Enum):
+    TABLESAMPLE = "tablesample"
+    RANDOM = "random"
+
+
+# Engines that support TABLESAMPLE SYSTEM on physical tables.
+TABLESAMPLE_ENGINES = (Engine.POSTGRESQL, Engine.SNOWFLAKE, Engine.TRINO, Engine.ATHENA, Engine.BIGQUERY)
+
+# Function returning a uniformly distributed float in [0, 1) for each engine.
+RANDOM_FUNCTIONS = {
+    Engine.POSTGRESQL: "random()",
+    Engine.REDSHIFT: "random()",
+    Engine.MYSQL: "rand()",
+    Engine.SNOWFLAKE: "uniform(0::float, 1::float, random())",
+    Engine.BIGQUERY: "rand()",
+    Engine.TRINO: "rand()",
+    Engine.ATHENA: "rand()",
+}
+
+
+def get_sample_method(dataset: BaseDataset, engine: Engine) -> SampleMethod:
+    _, _, is_virtual = dataset.get_resource_names()
+    if not is_virtual and engine in TABLESAMPLE_ENGINES:
+        return SampleMethod.TABLESAMPLE
+    return SampleMethod.RANDOM
+
+
+def sample_selectable(
+    source: FromClause,
+    dataset: BaseDataset,
+    engine: Engine,
+    dialect: Dialect,
+    fraction: float,
+) -> FromClause:
+    """
+    Wrap a dataset's selectable so that only about `fraction` of its rows are read.
+
+    Physical tables use the engine's native TABLESAMPLE, which skips whole blocks and avoids
+    scanning the table. Virtual datasets, and engines without TABLESAMPLE, keep each row
+    with probability `fraction` using a random predicate.
+    """
+    if get_sample_method(dataset, engine) == SampleMethod.TABLESAMPLE:
+        percent = round(fraction * 100, 6)
+        table = dialect.identifier_preparer.format_table(source)
+        if engine == Engine.BIGQUERY:
+            clause = f"{table} TABLESAMPLE SYSTEM ({percent} PERCENT)"
+        else:
+            clause = f"{table} TABLESAMPLE SYSTEM ({percent})"
+        query = sa.select([sa.text("*")]).select_from(sa.text(clause))
+    else:
+        random_function = RANDOM_FUNCTIONS.get(engine, "random()")
+        query = sa.select([sa.text("*")]).select_from(source).where(
+            sa.text(f"{random_function} < {fraction}")
+        )
+    return query.subquery("swiple_sample")
+
+
+def wilson_interval(successes: int, n: int, z: float) -> tuple[float, float]:
+    """Wilson score interval of a binomial proportion."""
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return max(0.0, center - margin), min(1.0, center + margin)
+
+
+def success_percent_interval(
+    results: list[dict[str, Any]],
+    confidence_level: float,
+) -> Optional[tuple[float, float]]:
+    """
+    Confidence interval of a sampled validation's success_percent.
+
+    For row-level (map) expectations the interval of the unexpected proportion is computed from the
+    sampled rows, and the expectation counts as passing at the lower bound only when it passes for
+    every proportion in the interval, and at the upper bound when it passes for any of them.
+    Other expectations, and expectations that raised an exception, count as observed.
+    """
+    if not results:
+        return None
+
+    z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+    lower = upper = 0
+    for result in results:
+        success = bool(result["success"])
+        observed = result.get("result") or {}
+        kwargs = result["expectation_config"]["kwargs"]
+
+        if result["exception_info"].get("raised_exception") or "unexpected_count" not in observed:
+            lower += success
+            upper += success
+            continue
+
+        n = observed.get("element_count", 0) - (observed.get("missing_count") or 0)
+        unexpected_low, unexpected_high = wilson_interval(observed["unexpected_count"], n, z)
+        allowed = 1 - (kwargs.get("mostly") or 1)
+        lower += unexpected_high <= allowed
+        upper += unexpected_low <= allowed
+
+    total = len(results)
+    return lower / total * 100, upper / total * 100
@@ -5,13 +5,15 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.jobstores.redis import RedisJobStore
 from apscheduler.executors.pool import ProcessPoolExecutor
 from apscheduler.job import Job
 from pytz import utc
 from app.settings import settings
 import app.constants as c
-from app.worker.tasks.validation import run_validation
+from app.worker.app import celery_app
+from app.worker.tasks.validation import maintain_validation_partitions, run_validation
 from app.models.schedule import Schedule
 import uuid
 import datetime
@@ -26,7 +28,9 @@ class ApScheduler(SchedulerInterface):
             'default': RedisJobStore(
                 db=settings.SCHEDULER_REDIS_DB,
                 **settings.SCHEDULER_REDIS_KWARGS,
-            )
+            ),
+            # Internal jobs, kept out of the schedules of datasets.
+            'maintenance': MemoryJobStore(),
         }
         executors = {
             'default': ProcessPoolExecutor(
@@ -45,6 +49,24 @@ class ApScheduler(SchedulerInterface):
             timezone=utc,
         )
         self.ap_scheduler.start()
+        self.ap_scheduler.add_job(
+            id="maintain_validation_partitions",
+            func=maintain_validation_partitions.delay,
+            trigger=IntervalTrigger(hours=1),
+            next_run_time=datetime.datetime.now(datetime.timezone.utc),
+            jobstore="maintenance",
+            replace_existing=True,
+        )
+        if settings.TASK_RESULT_EXPIRES:
+            # Celery's task deleting expired results, see OpenSearchBackend.cleanup.
+            self.ap_scheduler.add_job(
+                id="cleanup_task_results",
+                func=celery_app.tasks["celery.backend_cleanup"].delay,
+                trigger=IntervalTrigger(hours=1),
+                next_run_time=datetime.datetime.now(datetime.timezone.utc),
+                jobstore="maintenance",
+                replace_existing=True,
+            )
         print("-- Scheduler Started --")
 
     def shutdown(self):
@@ -55,7 +77,7 @@ class ApScheduler(SchedulerInterface):
         return self.ap_scheduler.add_job(
             id=f"{datasource_id}__{dataset_id}__{uuid.uuid4()}",
             func=run_validation.delay,
-            kwargs={"dataset_id": dataset_id},
+            kwargs={"dataset_id": dataset_id, "sample_fraction": schedule.sample_fraction},
             misfire_grace_time=schedule.misfire_grace_time,
             max_instances=schedule.max_instances,
             **schedule.trigger.dict(exclude_none=True)
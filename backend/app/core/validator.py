@@ -0,0 +1,136 @@
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from great_expectations.core import ExpectationSuite
+from great_expectations.core.batch import BatchRequestBase
+from great_expectations.data_context import BaseDataContext
+from great_expectations.validator.metric_configuration import MetricConfiguration
+from great_expectations.validator.validation_graph import ValidationGraph
+from great_expectations.validator.validator import Validator
+
+from app.settings import settings
+
+AGGREGATE_PARTIAL_SUFFIX = ".aggregate_fn"
+UNEXPECTED_VALUES_SUFFIX = ".unexpected_values"
+ROW_FETCH_SUFFIXES = (
+    ".unexpected_values",
+    ".unexpected_value_counts",
+    ".unexpected_index_list",
+    ".unexpected_rows",
+)
+
+
+class AggregatePushdownValidator(Validator):
+    """
+    Validator that computes every aggregate metric of a suite in as few table scans as possible.
+
+    Great Expectations already compiles metrics ending in ".aggregate_fn" (column mean/min/max/sum,
+    table row count, unexpected counts of map expectations such as not-null) that are resolved
+    together into a single SELECT per compute domain. It resolves the validation graph level by level
+    though, so aggregates whose dependencies sit at different depths end up in different SELECTs.
+
+    This validator changes the order metrics are resolved in, not how they are computed:
+
+    1. Ready metrics that are neither aggregates nor row fetches (table.columns, conditions, ...) first.
+    2. Then all ready aggregates at once, giving one SELECT with every aggregate of the suite.
+    3. Then row fetches (unexpected_values, ...). When the unexpected count of a map expectation is
+       already known to be 0, its unexpected_values are [] and the query is skipped.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._submitted_aggregates: Set[Tuple[str, str, str]] = set()
+
+    def _parse_validation_graph(
+        self,
+        validation_graph: ValidationGraph,
+        metrics: Dict[Tuple[str, str, str], Any],
+    ) -> Tuple[Set[MetricConfiguration], Set[MetricConfiguration]]:
+        ready, needed = Validator._parse_validation_graph(validation_graph=validation_graph, metrics=metrics)
+
+        aggregates = {metric for metric in ready if _is_aggregate(metric)}
+        row_fetches = {metric for metric in ready if _is_row_fetch(metric)}
+        others = ready - aggregates - row_fetches
+
+        if others:
+            return others, needed | aggregates | row_fetches
+
+        if aggregates:
+            retrying = any(metric.id in self._submitted_aggregates for metric in aggregates)
+            self._submitted_aggregates.update(metric.id for metric in aggregates)
+            if retrying:
+                # The aggregate SELECT failed, don't hold back row fetches for a result that may never come.
+                return ready, needed
+            return aggregates, needed | row_fetches
+
+        return ready, needed
+
+    def _resolve_metrics(
+        self,
+        execution_engine,
+        metrics_to_resolve: Iterable[MetricConfiguration],
+        metrics: Optional[Dict[Tuple[str, str, str], Any]] = None,
+        runtime_configuration: Optional[dict] = None,
+    ) -> Dict[Tuple[str, str, str], Any]:
+        metrics = metrics or {}
+        resolved = {}
+        remaining = []
+        for metric in metrics_to_resolve:
+            if _has_no_unexpected_rows(metric, metrics):
+                resolved[metric.id] = []
+            else:
+                remaining.append(metric)
+
+        if remaining:
+            resolved.update(
+                Validator._resolve_metrics(
+                    execution_engine=execution_engine,
+                    metrics_to_resolve=remaining,
+                    metrics=metrics,
+                    runtime_configuration=runtime_configuration,
+                )
+            )
+        return resolved
+
+
+def _is_aggregate(metric: MetricConfiguration) -> bool:
+    return metric.metric_name.endswith(AGGREGATE_PARTIAL_SUFFIX)
+
+
+def _is_row_fetch(metric: MetricConfiguration) -> bool:
+    return metric.metric_name.endswith(ROW_FETCH_SUFFIXES)
+
+
+def _has_no_unexpected_rows(metric: MetricConfiguration, metrics: Dict[Tuple[str, str, str], Any]) -> bool:
+    if not metric.metric_name.endswith(UNEXPECTED_VALUES_SUFFIX):
+        return False
+
+    condition = (metric.metric_dependencies or {}).get("unexpected_condition")
+    if condition is None or not condition.metric_name.endswith(".condition"):
+        return False
+
+    unexpected_count_id = (
+        f"{condition.metric_name[:-len('.condition')]}.unexpected_count",
+        condition.metric_domain_kwargs_id,
+        condition.metric_value_kwargs_id,
+    )
+    return metrics.get(unexpected_count_id) == 0
+
+
+def get_validator(
+    context: BaseDataContext,
+    batch_request: BatchRequestBase,
+    expectation_suite: ExpectationSuite,
+) -> Validator:
+    """Drop-in replacement for context.get_validator that uses AggregatePushdownValidator when enabled."""
+    if not settings.AGGREGATE_PUSHDOWN_ENABLED:
+        return context.get_validator(batch_request=batch_request, expectation_suite=expectation_suite)
+
+    batch_list = context.get_batch_list(batch_request=batch_request)
+    execution_engine = context.datasources[batch_request.datasource_name].execution_engine
+    return AggregatePushdownValidator(
+        execution_engine=execution_engine,
+        interactive_evaluation=True,
+        expectation_suite=expectation_suite,
+        data_context=context,
+        batches=batch_list,
+    )
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from enum import Enum
+from typing import Any, Callable, Optional
+
+from opensearchpy import OpenSearch, TransportError
+
+# Item and request statuses that may succeed when retried.
+RETRYABLE_STATUSES = (429, 502, 503, 504)
+
+
+class Durability(str, Enum):
+    # Return as soon as the document is buffered. Buffered documents are lost if the process is killed.
+    BUFFERED = "buffered"
+    # Wait until OpenSearch acknowledged the document.
+    ACKNOWLEDGED = "acknowledged"
+    # Wait until the document is visible to searches, i.e. for the next refresh of the index.
+    REFRESHED = "refreshed"
+
+
+class BulkWriteError(Exception):
+    def __init__(self, index: str, id: str, error: Any):
+        super().__init__(f"Failed to index document {id} into {index}: {error}")
+        self.index = index
+        self.id = id
+        self.error = error
+
+
+class BulkItem:
+    def __init__(self, index: str, id: str, source: dict[str, Any], refresh: bool, added_at: float):
+        self.index = index
+        self.id = id
+        self.source = source
+        self.refresh = refresh
+        self.added_at = added_at
+        self.attempts = 0
+        self.future: Future = Future()
+
+
+class BulkWriter:
+    """
+    Per-process buffer of documents indexed with the bulk API.
+
+    The buffer is flushed when it holds `max_actions` documents, when its oldest document is
+    `max_age` seconds old (by a background thread), and on `close`. Documents failing with a
+    retryable status are retried up to `max_retries` times with exponential backoff, each bulk
+    request timing out after `request_timeout` seconds. Each write returns a future resolved with
+    the bulk item result, or failed with a BulkWriteError.
+
+    The writer is safe to use from several threads, and to inherit across a fork: a forked
+    process starts with an empty buffer and its own flush thread.
+    """
+
+    def __init__(
+        self,
+        client: OpenSearch,
+        *,
+        max_actions: int = 500,
+        max_age: float = 1.0,
+        max_retries: int = 3,
+        initial_backoff: float = 0.5,
+        request_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.max_actions = max(max_actions, 1)
+        self.max_age = max_age
+        self.max_retries = max_retries
+        self.initial_backoff = initial_backoff
+        self.request_timeout = request_timeout
+        self.clock = clock
+        self.sleep = sleep
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._buffer: list[BulkItem] = []
+        self._condition = threading.Condition()
+        # Serializes flushes so that documents are written in the order they were buffered.
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def write(
+        self,
+        index: str,
+        id: str,
+        source: dict[str, Any],
+        *,
+        durability: Durability = Durability.ACKNOWLEDGED,
+    ) -> Future:
+        """
+        Buffer a document, then wait according to `durability`.
+
+        Acknowledged and refreshed writes flush the buffer right away instead of waiting for it to
+        fill up or age, since the caller is blocked until they are written anyway.
+        """
+        if self._pid != os.getpid():
+            self._reset()
+
+        item = BulkItem(index, id, source, durability == Durability.REFRESHED, self.clock())
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("BulkWriter is closed")
+            self._buffer.append(item)
+            full = len(self._buffer) >= self.max_actions
+            self._start_thread()
+            self._condition.notify()
+
+        if durability == Durability.BUFFERED:
+            if full:
+                self.flush()
+            return item.future
+
+        self.flush()
+        try:
+            item.future.result(timeout=self._write_timeout())
+        except FutureTimeoutError as ex:
+            raise BulkWriteError(item.index, item.id, "timed out waiting for the bulk write") from ex
+        return item.future
+
+    def flush(self):
+        """Write every buffered document."""
+        with self._flush_lock:
+            with self._condition:
+                items, self._buffer = self._buffer, []
+            try:
+                for start in range(0, len(items), self.max_actions):
+                    self._write(items[start:start + self.max_actions])
+            finally:
+                # Documents of the chunks left after an unexpected error are failed rather than lost.
+                for item in items:
+                    if not item.future.done():
+                        self._fail(item, "the flush of the buffer failed")
+
+    def close(self):
+        """Flush the buffer and stop the flush thread."""
+        if self._pid != os.getpid():
+            return
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self.flush()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def _start_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bulk-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._closed and (
+                    not self._buffer or self.clock() - self._buffer[0].added_at < self.max_age
+                ):
+                    timeout = None if not self._buffer else self.max_age - (self.clock() - self._buffer[0].added_at)
+                    self._condition.wait(timeout)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as ex:
+                # Failures are reported through the futures of the documents, this only guards the thread.
+                print(f"Failed to flush bulk writer: {ex}")
+
+    def _write(self, items: list[BulkItem]):
+        try:
+            self._write_with_retries(items)
+        except Exception as ex:
+            # E.g. a SerializationError, the documents waiting on this batch must not wait forever.
+            for item in items:
+                if not item.future.done():
+                    self._fail(item, ex)
+
+    def _write_with_retries(self, items: list[BulkItem]):
+        while items:
+            retry = []
+            body = []
+            for item in items:
+                item.attempts += 1
+                body.append({"index": {"_index": item.index, "_id": item.id}})
+                body.append(item.source)
+            refresh = "wait_for" if any(item.refresh for item in items) else "false"
+
+            try:
+                response = self.client.bulk(body=body, refresh=refresh, request_timeout=self.request_timeout)
+            except TransportError as ex:
+                # Connection errors have no HTTP status.
+                status = ex.status_code if isinstance(ex.status_code, int) else None
+                for item in items:
+                    if status is None or status in RETRYABLE_STATUSES:
+                        retry.append((item, ex))
+                    else:
+                        self._fail(item, ex)
+            else:
+                for item, result in zip(items, response["items"]):
+                    result = next(iter(result.values()))
+                    status = result.get("status", 500)
+                    if 200 <= status < 300:
+                        item.future.set_result(result)
+                    elif status in RETRYABLE_STATUSES:
+                        retry.append((item, result.get("error")))
+                    else:
+                        self._fail(item, result.get("error"))
+
+            items = []
+            for item, error in retry:
+                if item.attempts > self.max_retries:
+                    self._fail(item, error)
+                else:
+                    items.append(item)
+            if items:
+                self.sleep(self.initial_backoff * 2 ** (items[0].attempts - 1))
+
+    def _write_timeout(self) -> float:
+        """The longest a write can take: its age in the buffer, then every attempt and backoff."""
+        backoff = self.initial_backoff * (2 ** self.max_retries - 1)
+        return self.max_age + backoff + (self.max_retries + 1) * self.request_timeout
+
+    @staticmethod
+    def _fail(item: BulkItem, error: Any):
+        print(f"Failed to index document {item.id} into {item.index}: {error}")
+        item.future.set_exception(BulkWriteError(item.index, item.id, error))
@@ -26,3 +26,7 @@ async_client = AsyncOpenSearch(
 
 async def get_client() -> OpenSearch:
     return client
+
+
+async def get_async_client() -> AsyncOpenSearch:
+    return async_client
@@ -0,0 +1,126 @@
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Literal, Optional
+
+from opensearchpy import OpenSearch
+
+Granularity = Literal["monthly", "daily"]
+
+
+class TimePartitions:
+    """
+    An index split into one index per month or day of its documents' time, e.g. validations-2022.10
+    or validations-2022.10.31, all under the `alias`.
+
+    Documents are written to the partition of their own time, which is created on first write from
+    an index template adding it to the alias. The alias also acts as write alias for the current
+    partition, for writers that do not know the time of their documents. Reads of a time range only
+    target the partitions overlapping it. Partitions ending more than `retention_days` ago are
+    deleted by `delete_expired`.
+    """
+
+    def __init__(self, alias: str, granularity: Granularity, retention_days: int = 0):
+        self.alias = alias
+        self.granularity = granularity
+        self.retention_days = retention_days
+        self._name = re.compile(rf"^{re.escape(alias)}-(\d{{4}})\.(\d{{2}})(?:\.(\d{{2}}))?$")
+
+    def partition(self, time: datetime) -> str:
+        """Name of the partition of a document's time."""
+        time = self._utc(time)
+        if self.granularity == "daily":
+            return f"{self.alias}-{time:%Y.%m.%d}"
+        return f"{self.alias}-{time:%Y.%m}"
+
+    def indices(self, start: datetime, end: datetime) -> list[str]:
+        """
+        Index expressions of the partitions overlapping [start, end], to search with ignore_unavailable.
+
+        Monthly expressions also match the daily partitions of the month, and daily ones are completed
+        with the monthly partitions, so that partitions written before a change of granularity are read.
+        """
+        start, end = self._utc(start), self._utc(end)
+        months = []
+        month = start.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        while month <= end:
+            months.append(f"{self.alias}-{month:%Y.%m}")
+            month = self._next_month(month)
+        if self.granularity == "monthly":
+            return [f"{name}*" for name in months]
+
+        days = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= end:
+            days.append(f"{self.alias}-{day:%Y.%m.%d}")
+            day += timedelta(days=1)
+        return days + months
+
+    def period(self, name: str) -> Optional[tuple[datetime, datetime]]:
+        """Start and end of the period of a partition, None if `name` is not a partition."""
+        match = self._name.match(name)
+        if match is None:
+            return None
+        year, month, day = match.groups()
+        if day is None:
+            start = datetime(int(year), int(month), 1, tzinfo=timezone.utc)
+            return start, self._next_month(start)
+        start = datetime(int(year), int(month), int(day), tzinfo=timezone.utc)
+        return start, start + timedelta(days=1)
+
+    def expired(self, names: list[str], now: datetime) -> list[str]:
+        """Partitions among `names` past the retention, none without retention."""
+        if self.retention_days <= 0:
+            return []
+        cutoff = self._utc(now) - timedelta(days=self.retention_days)
+        periods = {name: self.period(name) for name in names}
+        return sorted(name for name, period in periods.items() if period is not None and period[1] <= cutoff)
+
+    def template(self, mappings: dict[str, Any], *, aliased: bool = True) -> dict[str, Any]:
+        """Body of the index template of the partitions."""
+        template = {"mappings": mappings}
+        if aliased:
+            template["aliases"] = {self.alias: {}}
+        return {"index_patterns": [f"{self.alias}-*"], "template": template}
+
+    def existing(self, client: OpenSearch) -> dict[str, dict[str, Any]]:
+        """Existing partitions, with their aliases."""
+        response = client.indices.get_alias(index=f"{self.alias}-*", allow_no_indices=True)
+        return {name: value for name, value in response.items() if self.period(name) is not None}
+
+    def rollover(self, client: OpenSearch, now: Optional[datetime] = None):
+        """
+        Create the current and next partitions, and make the current one the write index of the alias.
+        """
+        now = self._utc(now or datetime.now(timezone.utc))
+        current = self.partition(now)
+        upcoming = self.partition(now + timedelta(days=1) if self.granularity == "daily" else self._next_month(now))
+        partitions = self.existing(client)
+        for name in (current, upcoming):
+            if name not in partitions:
+                client.indices.create(index=name, ignore=400)
+
+        actions = [{"add": {"index": current, "alias": self.alias, "is_write_index": True}}]
+        for name, value in partitions.items():
+            alias = value.get("aliases", {}).get(self.alias)
+            if name != current and (alias is None or alias.get("is_write_index")):
+                # Also adds partitions created before the template had the alias.
+                actions.append({"add": {"index": name, "alias": self.alias, "is_write_index": False}})
+        client.indices.update_aliases(body={"actions": actions})
+
+    def delete_expired(self, client: OpenSearch, now: Optional[datetime] = None) -> list[str]:
+        """Delete the partitions past the retention, and return their names."""
+        now = now or datetime.now(timezone.utc)
+        expired = [name for name in self.expired(list(self.existing(client)), now) if name != self.partition(now)]
+        for name in expired:
+            client.indices.delete(index=name, ignore=404)
+        return expired
+
+    @staticmethod
+    def _utc(time: datetime) -> datetime:
+        if time.tzinfo is None:
+            return time.replace(tzinfo=timezone.utc)
+        return time.astimezone(timezone.utc)
+
+    @staticmethod
+    def _next_month(time: datetime) -> datetime:
+        return (time.replace(day=1) + timedelta(days=32)).replace(day=1)
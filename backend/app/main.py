@@ -3,6 +3,7 @@ from fastapi import FastAPI
 from app.api.api_v1 import auth_router
 from app.settings import settings
 from app.db.client import client, async_client
+from app.core.engines import engine_registry
 import app.constants as c
 from app.core.schedulers.scheduler import scheduler
 from app.api import exception_handlers
@@ -19,6 +20,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Consistency-Token", "X-Next-Cursor", "X-Sample-Cache", "Age"],
     )
 
 app.include_router(auth_router.router, prefix=settings.API_VERSION)
@@ -44,6 +46,7 @@ async def startup():
 async def shutdown():
     await async_client.close()
     client.close()
+    engine_registry.dispose_all()
 
     if settings.APP == c.APP_SCHEDULER:
         scheduler.shutdown()
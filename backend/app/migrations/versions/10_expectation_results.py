@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+from opensearch_reindexer.base import BaseMigration, Config, Language
+from app.repositories.expectation_result import expectation_result_partitions
+from app.scripts.backfill_expectation_results import backfill_expectation_results
+from app.settings import settings
+
+TEMPLATE_NAME = settings.EXPECTATION_RESULT_INDEX
+# Created from the template, further partitions are created by the maintain_partitions task.
+REINDEX_BODY = {
+    "source": {"index": None},
+    "dest": {"index": expectation_result_partitions.partition(datetime.now(timezone.utc))},
+}
+DESTINATION_INDEX_BODY = None
+MAPPINGS = {
+    "properties": {
+        "expectation_id": {
+            "type": "keyword"
+        },
+        "dataset_id": {
+            "type": "keyword"
+        },
+        "datasource_id": {
+            "type": "keyword"
+        },
+        "run_time": {
+            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSZZZZZ",
+            "type": "date"
+        },
+        "success": {
+            "type": "boolean"
+        },
+        # Observed values differ in type between expectations, they are only returned.
+        "observed_value": {
+            "type": "object",
+            "enabled": False
+        },
+        "observed_value_list": {
+            "type": "object",
+            "enabled": False
+        },
+        "unexpected_percent": {
+            "type": "double"
+        },
+        "objective": {
+            "type": "double"
+        },
+        "raised_exception": {
+            "type": "boolean"
+        },
+        "exception_message": {
+            "type": "text",
+            "index": False
+        }
+    }
+}
+
+
+class Migration(BaseMigration):
+    def before_revision(self):
+        self.destination_client.indices.put_index_template(
+            name=TEMPLATE_NAME,
+            body=expectation_result_partitions.template(MAPPINGS),
+        )
+
+    def after_revision(self):
+        expectation_result_partitions.rollover(self.destination_client)
+        # Index the results of the validations stored before this revision.
+        backfill_expectation_results(self.destination_client)
+
+
+config = Config(
+    reindex_body=REINDEX_BODY,
+    destination_index_body=DESTINATION_INDEX_BODY,
+    language=Language.painless,
+)
@@ -0,0 +1,60 @@
+from opensearch_reindexer.base import BaseMigration, Config, Language
+from app.settings import settings
+
+# Copy the samples stored in datasets to their own index, keyed by dataset.
+REINDEX_BODY = {
+    "source": {
+        "index": settings.DATASET_INDEX,
+        "query": {"exists": {"field": "sample"}},
+        "_source": ["sample", "datasource_id"],
+    },
+    "dest": {"index": settings.DATASET_SAMPLE_INDEX},
+    "script": {
+        "lang": "painless",
+        "source": """
+            def sample = ctx._source.remove('sample');
+            ctx._source.columns = sample.columns;
+            ctx._source.rows = sample.rows;
+        """,
+    },
+}
+DESTINATION_INDEX_BODY = {
+    "mappings": {
+        "properties": {
+            "datasource_id": {
+                "type": "keyword"
+            },
+            "columns": {
+                "type": "keyword"
+            },
+            # JSON, only returned
+            "rows": {
+                "type": "text",
+                "index": False
+            }
+        }
+    }
+}
+
+
+class Migration(BaseMigration):
+    def before_revision(self):
+        pass
+
+    def after_revision(self):
+        self.destination_client.update_by_query(
+            index=settings.DATASET_INDEX,
+            body={
+                "query": {"exists": {"field": "sample"}},
+                "script": {"source": "ctx._source.remove('sample')", "lang": "painless"},
+            },
+            conflicts="proceed",
+            refresh=True,
+        )
+
+
+config = Config(
+    reindex_body=REINDEX_BODY,
+    destination_index_body=DESTINATION_INDEX_BODY,
+    language=Language.painless,
+)
@@ -0,0 +1,38 @@
+from opensearch_reindexer.base import BaseMigration, Config, Language
+from app.settings import settings
+
+# Store the id of expectations and actions in their documents, see BaseRepository.source_key.
+INDICES = [settings.EXPECTATION_INDEX, settings.ACTION_INDEX]
+REINDEX_BODY = {
+    "source": {"index": None},
+    "dest": {"index": settings.EXPECTATION_INDEX},
+}
+DESTINATION_INDEX_BODY = None
+
+
+class Migration(BaseMigration):
+    def before_revision(self):
+        for index in INDICES:
+            self.destination_client.indices.put_mapping(
+                index=index,
+                body={"properties": {"key": {"type": "keyword"}}},
+            )
+
+    def after_revision(self):
+        for index in INDICES:
+            self.destination_client.update_by_query(
+                index=index,
+                body={
+                    "query": {"bool": {"must_not": {"exists": {"field": "key"}}}},
+                    "script": {"source": "ctx._source.key = ctx._id", "lang": "painless"},
+                },
+                conflicts="proceed",
+                refresh=True,
+            )
+
+
+config = Config(
+    reindex_body=REINDEX_BODY,
+    destination_index_body=DESTINATION_INDEX_BODY,
+    language=Language.painless,
+)
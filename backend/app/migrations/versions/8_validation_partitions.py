@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from opensearch_reindexer.base import BaseMigration, Config, Language
+from app.repositories.validation import get_validation_index, validation_partitions
+from app.settings import settings
+
+# number of documents to index at a time
+BATCH_SIZE = 1000
+SOURCE_INDEX = settings.VALIDATION_INDEX
+# Created before reindexing, documents are then indexed into the partition of their run time.
+DESTINATION_INDEX = validation_partitions.partition(datetime.now(timezone.utc))
+DESTINATION_INDEX_BODY = None
+TEMPLATE_NAME = settings.VALIDATION_INDEX
+MAPPINGS = {
+    "properties": {
+        "meta": {
+            "type": "object",
+            "properties": {
+                "run_id": {
+                    "type": "object",
+                    "properties": {
+                        "run_time": {
+                            "format": "yyyy-MM-dd HH:mm:ss.SSSSSSZZZZZ",
+                            "type": "date"
+                        }
+                    }
+                },
+                "watermark": {
+                    "type": "object",
+                    "properties": {
+                        "column": {"type": "keyword"},
+                        "mode": {"type": "keyword"},
+                        "low": {"type": "keyword"},
+                        "high": {"type": "keyword"},
+                        "numeric": {"type": "boolean"},
+                    }
+                }
+            }
+        }
+    }
+}
+
+
+class Migration(BaseMigration):
+    def before_revision(self):
+        # The validations index holds the name of the alias until it is deleted, so partitions
+        # are first created without it.
+        self.destination_client.indices.put_index_template(
+            name=TEMPLATE_NAME,
+            body=validation_partitions.template(MAPPINGS, aliased=False),
+        )
+
+    def transform_document(self, doc: dict) -> dict:
+        # Fails on run times that cannot be parsed, rather than filing them in the current partition.
+        return {"_index": get_validation_index(doc["meta"]["run_id"]["run_time"]), **doc}
+
+    def after_revision(self):
+        self.source_client.indices.delete(index=SOURCE_INDEX)
+        self.destination_client.indices.put_index_template(
+            name=TEMPLATE_NAME,
+            body=validation_partitions.template(MAPPINGS),
+        )
+        validation_partitions.rollover(self.destination_client)
+
+
+config = Config(
+    source_index=SOURCE_INDEX,
+    destination_index=DESTINATION_INDEX,
+    batch_size=BATCH_SIZE,
+    destination_index_body=DESTINATION_INDEX_BODY,
+    language=Language.python,
+)
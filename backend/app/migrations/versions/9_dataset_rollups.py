@@ -0,0 +1,69 @@
+from opensearch_reindexer.base import BaseMigration, Config, Language
+from app.scripts.backfill_rollups import backfill_rollups
+from app.settings import settings
+
+REINDEX_BODY = {
+    "source": {"index": None},
+    "dest": {"index": settings.DATASET_ROLLUP_INDEX},
+}
+DESTINATION_INDEX_BODY = {
+    "mappings": {
+        "properties": {
+            "dataset_id": {
+                "type": "keyword"
+            },
+            "datasource_id": {
+                "type": "keyword"
+            },
+            "day": {
+                "format": "yyyy-MM-dd",
+                "type": "date"
+            },
+            "validations": {
+                "type": "long"
+            },
+            "failed_validations": {
+                "type": "long"
+            },
+            "evaluated_expectations": {
+                "type": "long"
+            },
+            "successful_expectations": {
+                "type": "long"
+            },
+            "unsuccessful_expectations": {
+                "type": "long"
+            },
+            "success_percent_sum": {
+                "type": "double"
+            },
+            "success_percent_count": {
+                "type": "long"
+            },
+            "failing_validations": {
+                "type": "long"
+            },
+            # Only read from the rollups of top issues.
+            "failing_hours": {
+                "type": "object",
+                "enabled": False
+            }
+        }
+    }
+}
+
+
+class Migration(BaseMigration):
+    def before_revision(self):
+        pass
+
+    def after_revision(self):
+        # Roll up the validations stored before this revision.
+        backfill_rollups(self.destination_client)
+
+
+config = Config(
+    reindex_body=REINDEX_BODY,
+    destination_index_body=DESTINATION_INDEX_BODY,
+    language=Language.painless,
+)
@@ -1,7 +1,8 @@
 import json
+from enum import Enum
 from typing import Any, Optional
 
-from pydantic import Field, constr, validator
+from pydantic import Field, PrivateAttr, constr, validator
 
 from app.models.base_model import BaseModel, CreateUpdateDateModel, KeyModel
 from app.models.datasource import Engine
@@ -21,6 +22,12 @@ class RuntimeParameters(BaseModel):
 class Sample(BaseModel):
 	columns: list[str]
 	rows: list[dict[str, Any]]
+	# Seconds since the sample was taken when it was served from the sample cache. Not stored.
+	_cache_age: Optional[float] = PrivateAttr(default=None)
+
+	@property
+	def cache_age(self) -> Optional[float]:
+		return self._cache_age
 
 	@validator("rows", pre=True)
 	def parse_json_rows(cls, v: Any):
@@ -29,6 +36,16 @@ class Sample(BaseModel):
 		return v
 
 
+class DatasetSample(Sample, KeyModel):
+	"""The sample of a dataset, stored apart from the dataset under its key."""
+	datasource_id: str
+
+
+class ValidationMode(str, Enum):
+	FULL = "full"
+	INCREMENTAL = "incremental"
+
+
 class BaseDataset(BaseModel):
 	runtime_parameters: Optional[RuntimeParameters]
 	datasource_id: str
@@ -37,6 +54,13 @@ class BaseDataset(BaseModel):
 	connector_type: str = "RuntimeDataConnector"
 	description: Optional[constr(max_length=500)]  # requires update in src/screens/datasetOverview/components/DatasetModal
 	dataset_name: str
+	validation_mode: ValidationMode = ValidationMode.FULL
+	# Monotonically increasing column (e.g. a load timestamp or id) used by incremental validations.
+	watermark_column: Optional[str]
+	# Hours between full validations of an incremental dataset. 0 disables full validations.
+	full_validation_interval: int = Field(default=24, ge=0)
+	# Validate a random sample of about this fraction of rows instead of the whole dataset.
+	sample_fraction: Optional[float] = Field(default=None, gt=0, le=1)
 
 	@validator("dataset_name")
 	def dataset_name_should_match_format(cls, v, values, **kwargs):
@@ -49,6 +73,14 @@ class BaseDataset(BaseModel):
 				raise ValueError("'dataset_name' should match format 'schema.table' when dataset is a physical table")
 		return v
 
+	@validator("watermark_column", always=True)
+	def watermark_column_required_when_incremental(cls, v, values, **kwargs):
+		if values.get("validation_mode") == ValidationMode.INCREMENTAL and not v:
+			raise ValueError("'watermark_column' is required when 'validation_mode' is incremental")
+		if v and ' ' in v:
+			raise ValueError("should not contain spaces")
+		return v
+
 	def get_resource_names(self) -> tuple[str, str, bool]:
 		if self.runtime_parameters:
 			dataset_schema = self.runtime_parameters.schema_name
@@ -61,6 +93,18 @@ class BaseDataset(BaseModel):
 		return dataset_schema, dataset_name, is_virtual
 
 
+class DatasetColumn(BaseModel):
+	name: str
+	# Type as reported by the database, not known for virtual datasets.
+	type: Optional[str]
+
+
+class SuggestionOptions(BaseModel):
+	# Columns to profile. All columns are profiled when not set.
+	include_columns: Optional[list[str]]
+	exclude_columns: Optional[list[str]]
+
+
 class DatasetCreate(BaseDataset):
 	pass
 
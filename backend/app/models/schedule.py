@@ -87,3 +87,4 @@ class Schedule(BaseModel):
     ] = Field(discriminator="trigger")
     misfire_grace_time: Optional[int] = Field(default=300, description=c.MISFIRE_GRACE_TIME)
     max_instances: Optional[int] = Field(default=1, description=c.MAX_INSTANCES)
+    sample_fraction: Optional[float] = Field(default=None, gt=0, le=1, description=c.SAMPLE_FRACTION)
@@ -9,6 +9,8 @@ from app.models.base_model import BaseModel
 class TaskStatus(str, Enum):
     PENDING = "PENDING"
     STARTED = "STARTED"
+    # Progress of tasks reporting it, in their result.
+    PROGRESS = "PROGRESS"
     RETRY = "RETRY"
     SUCCESS = "SUCCESS"
     FAILURE = "FAILURE"
@@ -20,6 +22,10 @@ class Result(BaseModel):
     exc_message: Optional[list[str]]
     exc_module: Optional[str]
     exc_type: Optional[str]
+    # Progress of the deletes of datasource.delete_documents.
+    total: Optional[int]
+    deleted: Optional[int]
+    indices: Optional[dict[str, dict]]
 
     def dict(self, *args, **kwargs) -> Dict[str, Any]:
         _ignored = kwargs.pop('exclude_none')
@@ -68,6 +74,12 @@ class TaskIdResponse(BaseModel):
     task_id: str
 
 
+class TaskQueue(BaseModel):
+    name: str
+    # Tasks waiting to be run
+    messages: int
+
+
 class Task(BaseModel):
     result: TaskResult
     timestamp: str
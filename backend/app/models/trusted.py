@@ -0,0 +1,165 @@
+"""
+Parsing of trusted documents, i.e. documents the application wrote after validating them.
+
+`trusted_parser(model_class)` returns a function building `model_class` from such a document
+with `construct` instead of validating it. Nested models, discriminated unions, enums and
+encrypted strings are built from the type of their field, compiled once per model. Pre
+validators still run, as they convert the stored representation, e.g. JSON encoded kwargs.
+Fields of types without a fast path are validated as usual.
+
+Values are not checked: documents that may not match the model must be parsed with `parse_obj`.
+"""
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Literal, Optional, Type, get_origin
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_DICT, SHAPE_LIST, SHAPE_SINGLETON, ModelField
+
+from app.models.types import EncryptedStr
+
+Parser = Callable[[Any], Any]
+
+# Types whose stored value is already the value of the field.
+_PLAIN_TYPES = (str, int, float, bool, dict, list)
+
+
+@lru_cache(maxsize=None)
+def trusted_parser(model_class: Type[BaseModel]) -> Parser:
+    """
+    Parser of trusted documents of `model_class`. For models with a custom root, e.g. a
+    discriminated union of models, the parser returns the root rather than the model.
+    """
+    root = model_class.__fields__.get("__root__")
+    if root is not None and model_class.__custom_root_type__:
+        parse_root = _field_parser(model_class, root)
+        if parse_root is None:
+            return lambda data: data
+        return lambda data: parse_root(data, {})
+    return _model_parser(model_class)
+
+
+def _model_parser(model_class: Type[BaseModel]) -> Parser:
+    # Fields are compiled on first use, so that models may refer to themselves.
+    fields: Optional[list[tuple[str, str, Optional[Callable[[Any, dict], Any]], ModelField, bool]]] = None
+
+    def parse(data: Any) -> Any:
+        nonlocal fields
+        if not isinstance(data, dict):
+            return data
+        if fields is None:
+            fields = [
+                (name, field.alias, _field_parser(model_class, field), field, _shares_default(field))
+                for name, field in model_class.__fields__.items()
+            ]
+        # As BaseModel.construct, without going through every field again for defaults.
+        values = {}
+        fields_set = set()
+        for name, alias, parse_field, field, shares_default in fields:
+            if alias in data:
+                value = data[alias]
+            elif name in data:
+                value = data[name]
+            else:
+                if not field.required:
+                    values[name] = field.default if shares_default else field.get_default()
+                continue
+            values[name] = value if parse_field is None else parse_field(value, values)
+            fields_set.add(name)
+        model = model_class.__new__(model_class)
+        object.__setattr__(model, "__dict__", values)
+        object.__setattr__(model, "__fields_set__", fields_set)
+        model._init_private_attributes()
+        return model
+
+    return parse
+
+
+def _shares_default(field: ModelField) -> bool:
+    """Whether the default of a field is immutable, and can be shared instead of copied."""
+    return field.default_factory is None and isinstance(field.default, (type(None), str, int, float, bool, tuple, Enum))
+
+
+def _field_parser(model_class: Type[BaseModel], field: ModelField) -> Optional[Callable[[Any, dict], Any]]:
+    """Parser of the values of a field, or None when stored values are used as they are."""
+    pre_validators = field.pre_validators or []
+    parse_type = _type_parser(model_class, field)
+    if getattr(parse_type, "validates", False):
+        # Validation runs the pre validators itself.
+        return lambda value, values: _validate(model_class, field, value, values)
+    if not pre_validators and parse_type is None:
+        return None
+
+    def parse(value: Any, values: dict) -> Any:
+        for validator in pre_validators:
+            value = validator(model_class, value, values, field, model_class.__config__)
+        if value is None or parse_type is None:
+            return value
+        return parse_type(value)
+
+    return parse
+
+
+def _type_parser(model_class: Type[BaseModel], field: ModelField) -> Optional[Parser]:
+    if field.discriminator_key is not None:
+        return _discriminated_parser(model_class, field)
+
+    if field.shape == SHAPE_LIST:
+        parse_item = _type_parser(model_class, field.sub_fields[0])
+        if parse_item is None:
+            return None
+        return lambda value: [None if item is None else parse_item(item) for item in value]
+
+    if field.shape == SHAPE_DICT:
+        parse_value = _type_parser(model_class, field.sub_fields[0])
+        if parse_value is None:
+            return None
+        return lambda value: {key: None if item is None else parse_value(item) for key, item in value.items()}
+
+    type_ = field.type_
+    if field.shape == SHAPE_SINGLETON and not field.sub_fields:
+        if type_ is Any or type_ is object or get_origin(type_) is Literal:
+            return None
+        if isinstance(type_, type):
+            if issubclass(type_, BaseModel):
+                return trusted_parser(type_)
+            if issubclass(type_, Enum):
+                return type_
+            if issubclass(type_, EncryptedStr):
+                # Stored values are encrypted already, creating them anew would try to decrypt them.
+                return lambda value: value if isinstance(value, type_) else str.__new__(type_, value)
+            if issubclass(type_, _PLAIN_TYPES):
+                return None
+
+    return _validating_parser(model_class, field)
+
+
+def _discriminated_parser(model_class: Type[BaseModel], field: ModelField) -> Parser:
+    parsers = {
+        value: _type_parser(model_class, sub_field) or (lambda item: item)
+        for value, sub_field in field.sub_fields_mapping.items()
+    }
+    discriminator = field.discriminator_alias
+
+    def parse(value: Any) -> Any:
+        parser = parsers.get(value.get(discriminator)) if isinstance(value, dict) else None
+        if parser is None:
+            return _validating_parser(model_class, field)(value)
+        return parser(value)
+
+    return parse
+
+
+def _validating_parser(model_class: Type[BaseModel], field: ModelField) -> Parser:
+    def parse(value: Any) -> Any:
+        return _validate(model_class, field, value, {})
+
+    parse.validates = True
+    return parse
+
+
+def _validate(model_class: Type[BaseModel], field: ModelField, value: Any, values: dict) -> Any:
+    value, errors = field.validate(value, values, loc=field.alias, cls=model_class)
+    if errors:
+        raise ValidationError([errors], model_class)
+    return value
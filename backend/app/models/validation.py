@@ -3,7 +3,9 @@ from typing import Optional, Any, List
 from pydantic.config import Extra
 from pydantic.fields import Field
 
-from app.models.base_model import BaseModel
+from app.models.base_model import BaseModel, KeyModel
+from app.models.dataset import ValidationMode
+from app import utils
 
 
 class Stats(BaseModel):
@@ -17,7 +19,7 @@ class Statistics(BaseModel):
     evaluated_expectations: int
     successful_expectations: int
     unsuccessful_expectations: int
-    success_percent: float
+    success_percent: Optional[float]  # None without evaluated expectations
 
 
 class ActiveBatchDefinition(BaseModel):
@@ -48,6 +50,26 @@ class BatchSpec(BaseModel):
     temp_table_schema_name: Optional[bool]
 
 
+class Watermark(BaseModel):
+    column: str
+    mode: ValidationMode
+    # Exclusive lower bound of the validated rows. None when all rows were validated.
+    low: Optional[str]
+    # Inclusive upper bound, the maximum value of the watermark column when the run started.
+    high: Optional[str]
+    # Whether low/high are numbers, they are stored as strings to keep a single index mapping.
+    numeric: bool = False
+
+
+class Sampling(BaseModel):
+    fraction: float
+    method: str
+    confidence_level: float
+    # Confidence interval of statistics.success_percent.
+    success_percent_lower: Optional[float]
+    success_percent_upper: Optional[float]
+
+
 class Meta(BaseModel):
     great_expectations_version: str
     expectation_suite_name: str
@@ -59,6 +81,8 @@ class Meta(BaseModel):
     checkpoint_name: Optional[str]
     datasource_id: str
     dataset_id: str
+    watermark: Optional[Watermark]
+    sampling: Optional[Sampling]
 
 
 class ExceptionInfo(BaseModel):
@@ -99,3 +123,86 @@ class Validation(BaseModel):
     evaluation_parameters: dict
 
 
+class FailingSums(BaseModel):
+    """Sums of the validations with unsuccessful expectations of a dataset in one hour."""
+    validations: int = 0
+    evaluated_expectations: int = 0
+    successful_expectations: int = 0
+    unsuccessful_expectations: int = 0
+    success_percent_sum: float = 0
+    success_percent_count: int = 0
+
+
+class DatasetRollup(BaseModel, KeyModel):
+    """Sums of the validations of a dataset on one UTC day, keyed by "<dataset_id>__<day>"."""
+    dataset_id: str
+    datasource_id: str
+    day: str  # yyyy-MM-dd
+    validations: int = 0
+    failed_validations: int = 0
+    evaluated_expectations: int = 0
+    successful_expectations: int = 0
+    unsuccessful_expectations: int = 0
+    # Averages divide by the validations having a success percent, those evaluating expectations.
+    success_percent_sum: float = 0
+    success_percent_count: int = 0
+    # Validations with at least one unsuccessful expectation, and their sums by UTC hour ("00" to "23"),
+    # read by top issues over the last 24 hours.
+    failing_validations: int = 0
+    failing_hours: dict[str, FailingSums] = {}
+
+
+class ExpectationResult(BaseModel, KeyModel):
+    """One result of a validation, stored apart from it for the history of its expectation."""
+    expectation_id: str
+    dataset_id: str
+    datasource_id: str
+    run_time: str
+    success: bool
+    observed_value: Optional[Any]
+    # Only set by expectations observing a list, e.g. of columns.
+    observed_value_list: Optional[list[Any]]
+    unexpected_percent: Optional[float]
+    objective: Optional[float]
+    raised_exception: bool = False
+    exception_message: Optional[str]
+
+    @classmethod
+    def from_validation(cls, validation_id: str, validation: Validation) -> list["ExpectationResult"]:
+        return [
+            cls(
+                key=f"{validation_id}__{result.expectation_id}",
+                expectation_id=result.expectation_id,
+                dataset_id=validation.meta.dataset_id,
+                datasource_id=validation.meta.datasource_id,
+                run_time=validation.meta.run_id.run_time,
+                success=result.success,
+                observed_value=result.result.get("observed_value"),
+                observed_value_list=result.result.get("observed_value_list"),
+                unexpected_percent=result.result.get("unexpected_percent"),
+                objective=getattr(result.expectation_config.kwargs, "objective", None),
+                raised_exception=result.exception_info.raised_exception,
+                exception_message=result.exception_info.exception_message,
+            )
+            for result in validation.results
+        ]
+
+    def history(self) -> dict[str, Any]:
+        """The result as listed in the history of expectations, shaped like the results of validations."""
+        return {
+            "expectation_id": self.expectation_id,
+            "run_time": utils.string_to_utc_time(self.run_time),
+            "success": self.success,
+            "result": {
+                key: value for key, value in (
+                    ("observed_value", self.observed_value),
+                    ("observed_value_list", self.observed_value_list),
+                    ("unexpected_percent", self.unexpected_percent),
+                ) if value is not None
+            },
+            "expectation_config": {"kwargs": {"objective": self.objective}},
+            "exception_info": {
+                "raised_exception": self.raised_exception,
+                "exception_message": self.exception_message,
+            },
+        }
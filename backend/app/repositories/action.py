@@ -1,13 +1,15 @@
-from typing import Optional, List
+from typing import Optional
 
 from app.models.action import Action
-from app.repositories.base import BaseRepository, get_repository
+from app.repositories.base import BaseRepository, Page, get_repository
 from app.settings import settings
 
 
 class ActionRepository(BaseRepository[Action]):
     model_class = Action
     index = settings.ACTION_INDEX
+    tiebreaker = ["resource_key", "action_type", "destination.key", "key"]
+    source_key = True
 
     def list(
         self,
@@ -16,14 +18,16 @@ class ActionRepository(BaseRepository[Action]):
         action_type: Optional[str] = None,
         destination_name: Optional[str] = None,
         asc: Optional[bool] = True,
-    ) -> List[Action]:
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Action]:
         query = self._build_query_filter(
             resource_key=resource_key,
             action_type=action_type,
             destination_name=destination_name,
             asc=asc,
         )
-        return super().query(query, size=1000)
+        return self.paginate(query, limit=limit, cursor=cursor)
 
     def count_by_filter(
         self,
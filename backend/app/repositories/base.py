@@ -1,12 +1,24 @@
-from typing import Any, Generic, Optional, Type, TypeVar
+import base64
+import binascii
+import copy
+import hashlib
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Any, AsyncIterator, Generic, Iterable, Iterator, List, Optional, Type, TypeVar
 
-from fastapi import Depends
-from opensearchpy import OpenSearch, NotFoundError as OSNotFoundError
-from opensearchpy.helpers import bulk
+from fastapi import Depends, Header, Response
+from opensearchpy import AsyncOpenSearch, OpenSearch, NotFoundError as OSNotFoundError, TransportError
+from opensearchpy.helpers import async_bulk, bulk
 
 from app import utils
-from app.db.client import get_client
+from app.db.client import get_async_client, get_client
+from app.db.partitions import TimePartitions
 from app.models.base_model import BaseModel, CreateUpdateDateModel
+from app.models.trusted import trusted_parser
+from app.repositories.cache import DocumentCache
+from app.settings import settings
 
 M = TypeVar("M", bound=BaseModel)
 
@@ -15,93 +27,761 @@ class NotFoundError(OSNotFoundError):
     pass
 
 
+class InvalidCursorError(ValueError):
+    pass
+
+
+class Page(List[M]):
+    """A page of results. `next_cursor` is None on the last page."""
+
+    def __init__(self, items: Iterable[M] = (), next_cursor: Optional[str] = None):
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+class Consistency(str, Enum):
+    # Refresh the index on write, the write is searchable when the call returns.
+    IMMEDIATE = "immediate"
+    # Wait for the next periodic refresh of the index, up to its refresh interval.
+    WAIT_FOR = "wait_for"
+    # Return once the write is acknowledged. It is readable by id right away and searchable after the next refresh.
+    ASYNC = "async"
+
+
+REFRESH = {
+    Consistency.IMMEDIATE: "true",
+    Consistency.WAIT_FOR: "wait_for",
+    Consistency.ASYNC: "false",
+}
+
+
+class ConsistencySession:
+    """
+    Read-your-writes for the asynchronous writes of a client.
+
+    Asynchronous writes are recorded in a token, the time of the last write of each index, sent to the
+    client in the X-Consistency-Token header. When a client sends the token back, indices it wrote to
+    less than a refresh interval ago are refreshed before they are searched.
+    """
+    header = "X-Consistency-Token"
+
+    def __init__(
+        self,
+        token: Optional[str] = None,
+        response: Optional[Response] = None,
+        *,
+        refresh_interval: float = settings.OPENSEARCH_REFRESH_INTERVAL,
+        clock=time.time,
+    ):
+        self.response = response
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.writes: dict[str, float] = self._decode(token)
+        self.refreshed: set[str] = set()
+
+    def written(self, index: str):
+        self.writes[index] = self.clock()
+        self.refreshed.discard(index)
+        if self.response is not None:
+            self.response.headers[self.header] = self.token()
+
+    def needs_refresh(self, index: str) -> bool:
+        written_at = self.writes.get(index)
+        return (
+            written_at is not None
+            and index not in self.refreshed
+            and self.clock() - written_at < self.refresh_interval
+        )
+
+    def token(self) -> str:
+        now = self.clock()
+        writes = {index: t for index, t in self.writes.items() if now - t < self.refresh_interval}
+        return base64.urlsafe_b64encode(json.dumps(writes).encode()).decode()
+
+    def _decode(self, token: Optional[str]) -> dict[str, float]:
+        if not token:
+            return {}
+        try:
+            writes = json.loads(base64.urlsafe_b64decode(token.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            # A stale or foreign token only costs consistency, not correctness.
+            return {}
+        if not isinstance(writes, dict):
+            return {}
+        # Tokens come from clients: writes in the future, which would refresh the index on every
+        # search for as long as the token is sent, are dropped along with expired ones.
+        now = self.clock()
+        return {
+            index: t for index, t in writes.items()
+            if isinstance(index, str) and isinstance(t, (int, float)) and now - self.refresh_interval < t <= now
+        }
+
+
 class BaseRepository(Generic[M]):
+    """
+    Writes are made with the `consistency` of the repository, or of the call. Searches of a repository
+    with a ConsistencySession see the asynchronous writes recorded in the session.
+
+    Repositories with a `cache` serve `get` from it, and invalidate it on write.
+
+    `search_options` are passed to the searches, counts, refreshes and points in time of the repository,
+    e.g. ignore_unavailable for an `index` listing indices that may not exist.
+
+    `delete_options` are passed to delete_by_query, see `in_background`.
+
+    `tiebreaker` is appended to the sort of paginated queries, so that documents sorting alike are neither
+    repeated nor skipped across pages: sort clauses on doc values fields identifying a document, rather
+    than `_id`, whose fielddata is loaded on the heap. Repositories without such fields set `source_key`,
+    their documents then store their id as a `key` keyword field, which ends their `tiebreaker`.
+
+    Fields in `source_excludes` are left out of the documents returned by searches and gets.
+    `query` and `get` can further project documents on `source_includes` and `source_excludes`,
+    they then return objects holding only the fields read.
+
+    Documents of `trusted` repositories, only written by the repository, are read without
+    validation (see app.models.trusted), as are projected documents.
+    """
     model_class: Type[M]
     index: str
+    search_options: dict[str, Any] = {}
+    delete_options: dict[str, Any] = {}
+    tiebreaker: list[Any] = []
+    source_key: bool = False
+    source_excludes: list[str] = []
+    trusted: bool = False
+    cache: Optional[DocumentCache] = None
+    consistency: Consistency = Consistency(settings.REPOSITORY_WRITE_CONSISTENCY)
 
-    def __init__(self, client: OpenSearch):
+    def __init__(
+        self,
+        client: OpenSearch,
+        *,
+        consistency: Optional[Consistency] = None,
+        session: Optional[ConsistencySession] = None,
+    ):
         self.client = client
+        if consistency is not None:
+            self.consistency = consistency
+        self.session = session
 
-    def query(self, body: dict[str, Any], *, size: int = 100) -> list[M]:
-        response = self.client.search(index=self.index, size=size, body=body)
+    def query(
+        self,
+        body: dict[str, Any],
+        *,
+        size: int = 100,
+        source_includes: Optional[list[str]] = None,
+        source_excludes: Optional[list[str]] = None,
+    ) -> list[M]:
+        self._read_your_writes()
+        response = self.client.search(
+            index=self.index,
+            size=size,
+            body=body,
+            **self.search_options,
+            **self._source_options(source_includes, source_excludes),
+        )
+        projected = bool(source_includes or source_excludes)
         results = response["hits"]["hits"]
         return [
-            self._get_object_from_dict(result["_source"], id=result["_id"]) for result in results
+            self._get_object_from_source(result["_source"], id=result["_id"], projected=projected)
+            for result in results
         ]
 
+    def query_page(self, body: dict[str, Any], *, limit: int, cursor: Optional[str] = None) -> Page[M]:
+        """
+        Return one page of results and an opaque cursor to the next one.
+
+        Pages after the first are read from a point in time with search_after, so documents
+        written while paging neither shift nor duplicate results. The `tiebreaker` of the repository
+        is appended to the sort. Clusters without point in time support page with search_after alone.
+        """
+        fingerprint, pit_id, search_body = self._page_search(body, limit=limit, cursor=cursor)
+        if pit_id is not None:
+            response = self.client.search(body=search_body, **self._source_options())
+            pit_id = response.get("pit_id", pit_id)
+        else:
+            self._read_your_writes()
+            response = self.client.search(
+                index=self.index, body=search_body, **self.search_options, **self._source_options()
+            )
+
+        hits = response["hits"]["hits"]
+        page = self._page_from_hits(hits, limit)
+        if len(hits) > limit:
+            if cursor is None:
+                # The first page is read from the index directly, so results that fit in one
+                # page take a single request. Following pages are read from a point in time.
+                pit_id = self._open_point_in_time()
+            page.next_cursor = self._next_cursor(fingerprint, pit_id, hits[limit - 1])
+        elif pit_id is not None:
+            self._close_point_in_time(pit_id)
+        return page
+
+    def scan(self, body: dict[str, Any], *, batch_size: int = 1000) -> Iterator[M]:
+        """Iterate over every result of a query, one page at a time."""
+        cursor = None
+        while True:
+            page = self.query_page(body, limit=batch_size, cursor=cursor)
+            yield from page
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    def paginate(self, body: dict[str, Any], *, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page[M]:
+        """One page when `limit` or `cursor` is given, otherwise every result."""
+        if limit is None and cursor is None:
+            return Page(self.scan(body))
+        return self.query_page(body, limit=limit or settings.PAGINATION_DEFAULT_LIMIT, cursor=cursor)
+
     def count(self, body: dict[str, Any]) -> int:
-        return self.client.count(index=self.index, body=body)["count"]
+        self._read_your_writes()
+        return self.client.count(index=self.index, body=body, **self.search_options)["count"]
+
+    def get(
+        self,
+        id: str,
+        *,
+        source_includes: Optional[list[str]] = None,
+        source_excludes: Optional[list[str]] = None,
+    ) -> M:
+        if source_includes or source_excludes:
+            # Projected objects are partial, they are neither read from nor added to the cache.
+            try:
+                document = self.client.get(
+                    index=self.index, id=id, **self._source_options(source_includes, source_excludes)
+                )
+            except OSNotFoundError as e:
+                raise NotFoundError() from e
+            return self._get_object_from_source(document["_source"], id=document["_id"], projected=True)
 
-    def get(self, id: str) -> M:
+        object = self._get_cached(id)
+        if object is not None:
+            return object
+        generation = self.cache.generation if self.cache is not None else None
         try:
-            document = self.client.get(index=self.index, id=id)
+            document = self.client.get(index=self.index, id=id, **self._source_options())
         except OSNotFoundError as e:
             raise NotFoundError() from e
-        return self._get_object_from_dict(document["_source"], id=document["_id"])
+        return self._cache(self._get_object_from_source(document["_source"], id=document["_id"]), generation)
 
-    def create(self, id: str, object: M, *, refresh: str = "wait_for") -> M:
-        body = self._get_dict_from_object(object, exclude={"key"})
-        response = self.client.index(index=self.index, id=id, body=body, refresh=refresh)
-        return self._get_object_from_dict(self._get_dict_from_object(object), id=response["_id"])
+    def get_many(self, ids: Iterable[str]) -> dict[str, M]:
+        """Objects of the documents `ids` that exist, by id. Like `get`, documents are read in real time."""
+        objects, missing = self._get_many_cached(ids)
+        if missing:
+            generation = self.cache.generation if self.cache is not None else None
+            response = self.client.mget(index=self.index, body={"ids": missing}, **self._source_options())
+            objects.update(self._objects_from_mget(response, generation))
+        return objects
 
-    def update(self, id: str, object: M, update_dict: dict[str, Any], *, refresh: str = "wait_for") -> M:
-        # Make sure we don't override create_date
-        update_dict.pop("create_date", None)
-
-        updated_object = object.copy(update=update_dict)
+    def create(self, id: str, object: M, *, consistency: Optional[Consistency] = None) -> M:
+        consistency = consistency or self.consistency
+        body = self._document_source(id, object)
+        response = self.client.index(index=self.index, id=id, body=body, refresh=REFRESH[consistency])
+        self._invalidate(id)
+        self._written(consistency)
+        return self._get_object_from_dict(self._get_dict_from_object(object), id=response["_id"])
 
-        # Update modified_date automatically
-        if isinstance(object, CreateUpdateDateModel):
-            updated_object.modified_date = utils.current_time()
+    def update(
+        self, id: str, object: M, update_dict: dict[str, Any], *, consistency: Optional[Consistency] = None
+    ) -> M:
+        consistency = consistency or self.consistency
+        updated_object = self._updated_object(object, update_dict)
 
         try:
             document = self.client.update(
                 index=self.index,
                 id=id,
-                body={"doc": self._get_dict_from_object(updated_object, exclude={"key"})},
-                refresh=refresh,
+                body={"doc": self._document_source(id, updated_object)},
+                refresh=REFRESH[consistency],
                 _source=True,
+                **self._source_options(),
             )["get"]
         except OSNotFoundError as e:
             raise NotFoundError() from e
-        return self._get_object_from_dict(document["_source"], id=id)
+        finally:
+            self._invalidate(id)
+        self._written(consistency)
+        return self._get_object_from_source(document["_source"], id=id)
 
     def update_by_query(self, body: dict[str, Any], *, wait_for_completion: bool = True):
+        self._read_your_writes()
         self.client.update_by_query(index=self.index, body=body, wait_for_completion=wait_for_completion)
+        self._invalidate()
 
-    def delete(self, id: str, *, refresh: str = "wait_for"):
+    def delete(self, id: str, *, consistency: Optional[Consistency] = None):
+        consistency = consistency or self.consistency
         try:
-            self.client.delete(index=self.index, id=id, refresh=refresh)
+            self.client.delete(index=self.index, id=id, refresh=REFRESH[consistency])
         except OSNotFoundError as e:
             raise NotFoundError() from e
+        finally:
+            self._invalidate(id)
+        self._written(consistency)
+
+    def bulk_create(self, objects: list[M], *, consistency: Optional[Consistency] = None):
+        consistency = consistency or self.consistency
+        bulk(self.client, self._bulk_index_actions(objects), refresh=REFRESH[consistency])
+        for object in objects:
+            self._invalidate(object.key)
+        self._written(consistency)
+
+    def delete_by_query(self, body: dict[str, Any]) -> dict[str, Any]:
+        self._read_your_writes()
+        response = self.client.delete_by_query(index=self.index, body=body, **self.delete_options)
+        self._invalidate()
+        return response
+
+    def in_background(self, *, requests_per_second: float = -1) -> "BaseRepository[M]":
+        """
+        The repository whose delete_by_query starts a delete task of OpenSearch and returns its
+        response, holding the id of the task, rather than waiting for the documents to be deleted.
+        The task is sliced across the shards of the index and throttled to `requests_per_second`.
+        Documents read until it completes may still be cached.
+        """
+        repository = copy.copy(self)
+        repository.delete_options = {
+            "wait_for_completion": False,
+            "slices": "auto",
+            "requests_per_second": requests_per_second,
+            "conflicts": "proceed",
+        }
+        return repository
+
+    def _get_cached(self, id: str) -> Optional[M]:
+        if self.cache is None:
+            return None
+        return self.cache.get(self.index, id)
+
+    def _get_many_cached(self, ids: Iterable[str]) -> tuple[dict[str, M], list[str]]:
+        """Cached objects of `ids` by id, and the ids left to read."""
+        objects, missing = {}, []
+        for id in dict.fromkeys(ids):
+            object = self._get_cached(id)
+            if object is None:
+                missing.append(id)
+            else:
+                objects[id] = object
+        return objects, missing
+
+    def _objects_from_mget(self, response: dict[str, Any], generation: Optional[int]) -> dict[str, M]:
+        objects = {}
+        for document in response["docs"]:
+            if document.get("found"):
+                object = self._get_object_from_source(document["_source"], id=document["_id"])
+                objects[document["_id"]] = self._cache(object, generation)
+        return objects
+
+    def _cache(self, object: M, generation: Optional[int]) -> M:
+        if self.cache is not None:
+            self.cache.set(self.index, object.key, object, generation=generation)
+        return object
+
+    def _invalidate(self, id: Optional[str] = None):
+        """Drop a document, or every document of the index when `id` is None, from the cache."""
+        if self.cache is not None:
+            self.cache.invalidate(self.index, id)
+
+    def _read_your_writes(self):
+        """Refresh the index before searching it if the session wrote to it asynchronously."""
+        if self.session is not None and self.session.needs_refresh(self._session_index()):
+            self.client.indices.refresh(index=self.index, **self.search_options)
+            self.session.refreshed.add(self._session_index())
 
-    def bulk_create(self, objects: list[M], *, refresh: str = "wait_for"):
-        actions = [
+    def _written(self, consistency: Consistency):
+        if self.session is not None and consistency == Consistency.ASYNC:
+            self.session.written(self._session_index())
+
+    def _session_index(self) -> str:
+        """Name of the index in the writes of a ConsistencySession."""
+        return self.index
+
+    def _open_point_in_time(self) -> Optional[str]:
+        try:
+            response = self.client.create_point_in_time(
+                index=self.index, keep_alive=settings.PAGINATION_KEEP_ALIVE, **self.search_options
+            )
+        except TransportError:
+            # Point in time needs OpenSearch 2.4 or later.
+            return None
+        return response["pit_id"]
+
+    def _close_point_in_time(self, pit_id: str):
+        try:
+            self.client.delete_point_in_time(body={"pit_id": [pit_id]})
+        except TransportError:
+            # It expires after keep_alive anyway.
+            pass
+
+    def _page_search(
+        self, body: dict[str, Any], *, limit: int, cursor: Optional[str]
+    ) -> tuple[str, Optional[str], dict[str, Any]]:
+        """Query fingerprint, point in time id and search body of a page."""
+        fingerprint = self._query_fingerprint(body)
+        state = {} if cursor is None else self._decode_cursor(cursor)
+        if cursor is not None and state.get("query") != fingerprint:
+            raise InvalidCursorError("cursor does not belong to this query")
+
+        search_body = {**body, "sort": self._pagination_sort(body), "size": limit + 1}
+        if state.get("search_after") is not None:
+            search_body["search_after"] = state["search_after"]
+
+        pit_id = state.get("pit")
+        if pit_id is not None:
+            search_body["pit"] = {"id": pit_id, "keep_alive": settings.PAGINATION_KEEP_ALIVE}
+        return fingerprint, pit_id, search_body
+
+    def _page_from_hits(self, hits: list[dict[str, Any]], limit: int) -> Page[M]:
+        return Page(self._get_object_from_source(hit["_source"], id=hit["_id"]) for hit in hits[:limit])
+
+    def _search_request(self, body: dict[str, Any], *, size: int = 100) -> list[dict[str, Any]]:
+        """The header and body of a search of the repository in a multi search."""
+        header = {"index": self.index, **self.search_options}
+        body = {**body, "size": size}
+        if self.source_excludes:
+            body["_source"] = {"excludes": self.source_excludes}
+        return [header, body]
+
+    def _objects_from_response(self, response: dict[str, Any]) -> list[M]:
+        """The objects of a response of a multi search, raising its error if it failed."""
+        if "error" in response:
+            error = response["error"]
+            raise TransportError(
+                response.get("status", "N/A"), error.get("type") if isinstance(error, dict) else error, error
+            )
+        return [self._get_object_from_source(hit["_source"], id=hit["_id"]) for hit in response["hits"]["hits"]]
+
+    def _next_cursor(self, fingerprint: str, pit_id: Optional[str], last_hit: dict[str, Any]) -> str:
+        return self._encode_cursor({"query": fingerprint, "pit": pit_id, "search_after": last_hit["sort"]})
+
+    def _bulk_index_actions(self, objects: list[M]) -> list[dict[str, Any]]:
+        return [
             {
                 "_op_type": "index",
                 "_index": self.index,
                 "_id": object.key,
-                "_source": self._get_dict_from_object(object, exclude={"key"}),
+                "_source": self._document_source(object.key, object),
             } for object in objects
         ]
-        bulk(self.client, actions, refresh=refresh)
 
-    def delete_by_query(self, body: dict[str, Any]):
-        self.client.delete_by_query(index=self.index, body=body)
+    def _updated_object(self, object: M, update_dict: dict[str, Any]) -> M:
+        # Make sure we don't override create_date
+        update_dict.pop("create_date", None)
+
+        updated_object = object.copy(update=update_dict)
+
+        # Update modified_date automatically
+        if isinstance(object, CreateUpdateDateModel):
+            updated_object.modified_date = utils.current_time()
+        return updated_object
+
+    def _pagination_sort(self, body: dict[str, Any]) -> list:
+        sort = body.get("sort", [])
+        sort = list(sort) if isinstance(sort, list) else [sort]
+        sorted_fields = {self._sort_field(clause) for clause in sort}
+        return sort + [clause for clause in self.tiebreaker if self._sort_field(clause) not in sorted_fields]
+
+    @staticmethod
+    def _sort_field(clause: Any) -> str:
+        return clause if isinstance(clause, str) else next(iter(clause))
+
+    @staticmethod
+    def _query_fingerprint(body: dict[str, Any]) -> str:
+        return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _encode_cursor(state: dict[str, Any]) -> str:
+        return base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> dict[str, Any]:
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise InvalidCursorError("invalid cursor") from e
+        if not isinstance(state, dict):
+            raise InvalidCursorError("invalid cursor")
+        return state
+
+    def _source_options(
+        self, includes: Optional[list[str]] = None, excludes: Optional[list[str]] = None
+    ) -> dict[str, Any]:
+        options = {}
+        excludes = [*self.source_excludes, *(excludes or [])]
+        if excludes:
+            options["_source_excludes"] = excludes
+        if includes:
+            options["_source_includes"] = includes
+        return options
 
     def _get_dict_from_object(self, object: M, **kwargs) -> dict[str, Any]:
         return object.dict(by_alias=True, **kwargs)
 
+    def _document_source(self, id: str, object: M) -> dict[str, Any]:
+        """Source of the document `id` of an object, holding its key only with `source_key`."""
+        source = self._get_dict_from_object(object, exclude={"key"})
+        if self.source_key:
+            source["key"] = id
+        return source
+
     def _get_object_from_dict(self, d: dict[str, Any], *, id: Optional[str] = None) -> M:
         if id is not None:
             d["key"] = id
         return self.model_class.parse_obj(d)
 
+    def _get_object_from_source(self, d: dict[str, Any], *, id: Optional[str] = None, projected: bool = False) -> M:
+        """The object of a stored document."""
+        if self.trusted or projected:
+            return self._construct_object(d, id=id)
+        return self._get_object_from_dict(d, id=id)
+
+    def _construct_object(self, d: dict[str, Any], *, id: Optional[str] = None) -> M:
+        """The object of a trusted or projected document, built without validation."""
+        if id is not None:
+            d["key"] = id
+        return trusted_parser(self.model_class)(d)
+
+
+class PartitionedRepository(BaseRepository[M]):
+    """
+    Repository of the alias of time `partitions`. Queries of the last days can be limited to the
+    partitions of these days with `since`.
+    """
+    partitions: TimePartitions
+
+    def since(self, period: timedelta) -> "PartitionedRepository[M]":
+        """The repository reading only the partitions of the last `period`."""
+        now = datetime.now(timezone.utc)
+        repository = copy.copy(self)
+        repository.index = ",".join(self.partitions.indices(now - period, now))
+        repository.search_options = {"ignore_unavailable": True}
+        return repository
+
+    def _session_index(self) -> str:
+        # Writes go through the alias, reads of `since` through the partitions under it.
+        return self.partitions.alias
+
+
+class AsyncBaseRepository(BaseRepository[M]):
+    """
+    BaseRepository on an AsyncOpenSearch client, for endpoints that should not hold a threadpool
+    thread while waiting on OpenSearch.
+
+    Model repositories get an async variant by combining the sync repository with this class,
+    sync repository first, e.g. `class AsyncDatasetRepository(DatasetRepository, AsyncBaseRepository[Dataset])`.
+    Query building and (de)serialization are then shared, and a sync repository method returning
+    `self.<request>(...)` returns an awaitable. Such methods are still redeclared with `async def`,
+    and methods that use the result of a request are reimplemented.
+    """
+
+    def __init__(
+        self,
+        client: AsyncOpenSearch,
+        *,
+        consistency: Optional[Consistency] = None,
+        session: Optional[ConsistencySession] = None,
+    ):
+        super().__init__(client, consistency=consistency, session=session)
+
+    async def query(
+        self,
+        body: dict[str, Any],
+        *,
+        size: int = 100,
+        source_includes: Optional[list[str]] = None,
+        source_excludes: Optional[list[str]] = None,
+    ) -> list[M]:
+        await self._read_your_writes()
+        response = await self.client.search(
+            index=self.index,
+            size=size,
+            body=body,
+            **self.search_options,
+            **self._source_options(source_includes, source_excludes),
+        )
+        projected = bool(source_includes or source_excludes)
+        return [
+            self._get_object_from_source(result["_source"], id=result["_id"], projected=projected)
+            for result in response["hits"]["hits"]
+        ]
+
+    async def query_page(self, body: dict[str, Any], *, limit: int, cursor: Optional[str] = None) -> Page[M]:
+        fingerprint, pit_id, search_body = self._page_search(body, limit=limit, cursor=cursor)
+        if pit_id is not None:
+            response = await self.client.search(body=search_body, **self._source_options())
+            pit_id = response.get("pit_id", pit_id)
+        else:
+            await self._read_your_writes()
+            response = await self.client.search(
+                index=self.index, body=search_body, **self.search_options, **self._source_options()
+            )
+
+        hits = response["hits"]["hits"]
+        page = self._page_from_hits(hits, limit)
+        if len(hits) > limit:
+            if cursor is None:
+                pit_id = await self._open_point_in_time()
+            page.next_cursor = self._next_cursor(fingerprint, pit_id, hits[limit - 1])
+        elif pit_id is not None:
+            await self._close_point_in_time(pit_id)
+        return page
+
+    async def scan(self, body: dict[str, Any], *, batch_size: int = 1000) -> AsyncIterator[M]:
+        cursor = None
+        while True:
+            page = await self.query_page(body, limit=batch_size, cursor=cursor)
+            for object in page:
+                yield object
+            if page.next_cursor is None:
+                return
+            cursor = page.next_cursor
+
+    async def paginate(self, body: dict[str, Any], *, limit: Optional[int] = None, cursor: Optional[str] = None) -> Page[M]:
+        if limit is None and cursor is None:
+            return Page([object async for object in self.scan(body)])
+        return await self.query_page(body, limit=limit or settings.PAGINATION_DEFAULT_LIMIT, cursor=cursor)
+
+    async def count(self, body: dict[str, Any]) -> int:
+        await self._read_your_writes()
+        return (await self.client.count(index=self.index, body=body, **self.search_options))["count"]
+
+    async def get(
+        self,
+        id: str,
+        *,
+        source_includes: Optional[list[str]] = None,
+        source_excludes: Optional[list[str]] = None,
+    ) -> M:
+        if source_includes or source_excludes:
+            try:
+                document = await self.client.get(
+                    index=self.index, id=id, **self._source_options(source_includes, source_excludes)
+                )
+            except OSNotFoundError as e:
+                raise NotFoundError() from e
+            return self._get_object_from_source(document["_source"], id=document["_id"], projected=True)
+
+        object = self._get_cached(id)
+        if object is not None:
+            return object
+        generation = self.cache.generation if self.cache is not None else None
+        try:
+            document = await self.client.get(index=self.index, id=id, **self._source_options())
+        except OSNotFoundError as e:
+            raise NotFoundError() from e
+        return self._cache(self._get_object_from_source(document["_source"], id=document["_id"]), generation)
+
+    async def get_many(self, ids: Iterable[str]) -> dict[str, M]:
+        objects, missing = self._get_many_cached(ids)
+        if missing:
+            generation = self.cache.generation if self.cache is not None else None
+            response = await self.client.mget(
+                index=self.index, body={"ids": missing}, **self._source_options()
+            )
+            objects.update(self._objects_from_mget(response, generation))
+        return objects
+
+    async def create(self, id: str, object: M, *, consistency: Optional[Consistency] = None) -> M:
+        consistency = consistency or self.consistency
+        body = self._document_source(id, object)
+        response = await self.client.index(index=self.index, id=id, body=body, refresh=REFRESH[consistency])
+        self._invalidate(id)
+        self._written(consistency)
+        return self._get_object_from_dict(self._get_dict_from_object(object), id=response["_id"])
+
+    async def update(
+        self, id: str, object: M, update_dict: dict[str, Any], *, consistency: Optional[Consistency] = None
+    ) -> M:
+        consistency = consistency or self.consistency
+        updated_object = self._updated_object(object, update_dict)
+        try:
+            response = await self.client.update(
+                index=self.index,
+                id=id,
+                body={"doc": self._document_source(id, updated_object)},
+                refresh=REFRESH[consistency],
+                _source=True,
+                **self._source_options(),
+            )
+        except OSNotFoundError as e:
+            raise NotFoundError() from e
+        finally:
+            self._invalidate(id)
+        self._written(consistency)
+        return self._get_object_from_source(response["get"]["_source"], id=id)
+
+    async def update_by_query(self, body: dict[str, Any], *, wait_for_completion: bool = True):
+        await self._read_your_writes()
+        await self.client.update_by_query(index=self.index, body=body, wait_for_completion=wait_for_completion)
+        self._invalidate()
+
+    async def delete(self, id: str, *, consistency: Optional[Consistency] = None):
+        consistency = consistency or self.consistency
+        try:
+            await self.client.delete(index=self.index, id=id, refresh=REFRESH[consistency])
+        except OSNotFoundError as e:
+            raise NotFoundError() from e
+        finally:
+            self._invalidate(id)
+        self._written(consistency)
+
+    async def bulk_create(self, objects: list[M], *, consistency: Optional[Consistency] = None):
+        consistency = consistency or self.consistency
+        await async_bulk(self.client, self._bulk_index_actions(objects), refresh=REFRESH[consistency])
+        for object in objects:
+            self._invalidate(object.key)
+        self._written(consistency)
+
+    async def delete_by_query(self, body: dict[str, Any]) -> dict[str, Any]:
+        await self._read_your_writes()
+        response = await self.client.delete_by_query(index=self.index, body=body, **self.delete_options)
+        self._invalidate()
+        return response
+
+    async def _read_your_writes(self):
+        if self.session is not None and self.session.needs_refresh(self._session_index()):
+            await self.client.indices.refresh(index=self.index, **self.search_options)
+            self.session.refreshed.add(self._session_index())
+
+    async def _open_point_in_time(self) -> Optional[str]:
+        try:
+            response = await self.client.create_point_in_time(
+                index=self.index, keep_alive=settings.PAGINATION_KEEP_ALIVE, **self.search_options
+            )
+        except TransportError:
+            return None
+        return response["pit_id"]
+
+    async def _close_point_in_time(self, pit_id: str):
+        try:
+            await self.client.delete_point_in_time(body={"pit_id": [pit_id]})
+        except TransportError:
+            pass
+
 
 R = TypeVar('R', bound=BaseRepository)
 
 
+async def get_consistency_session(
+    response: Response,
+    x_consistency_token: Optional[str] = Header(default=None),
+) -> ConsistencySession:
+    # One session per request, shared by the repositories of the request.
+    return ConsistencySession(x_consistency_token, response)
+
+
 def get_repository(repository_class: Type[R]):
-    async def _get_repository(client: OpenSearch = Depends(get_client)) -> R:
-        return repository_class(client)
+    async def _get_repository(
+        client: OpenSearch = Depends(get_client),
+        session: ConsistencySession = Depends(get_consistency_session),
+    ) -> R:
+        return repository_class(client, session=session)
     return _get_repository
+
+
+def get_async_repository(repository_class: Type[R]):
+    async def _get_async_repository(
+        client: AsyncOpenSearch = Depends(get_async_client),
+        session: ConsistencySession = Depends(get_consistency_session),
+    ) -> R:
+        return repository_class(client, session=session)
+    return _get_async_repository
@@ -0,0 +1,173 @@
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, Optional
+
+import redis
+
+from app.models.base_model import BaseModel
+from app.settings import settings
+
+
+class CachedDocument:
+    def __init__(self, object: BaseModel, cached_at: float):
+        self.object = object
+        self.cached_at = cached_at
+
+
+class DocumentCache:
+    """
+    Per-process LRU cache of documents read by id, keyed by index and id.
+
+    Entries expire after `ttl` seconds. Repositories invalidate the documents they write, and, when
+    a Redis URL is given, publish the invalidation on `channel` so that the caches of the other API
+    and worker processes drop them too. Without Redis, other processes may serve a document up to
+    `ttl` seconds old.
+
+    Cached objects are returned as shallow copies: assigning their fields is safe, mutating
+    nested values in place is not.
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        ttl: float,
+        *,
+        redis_url: Optional[str] = None,
+        channel: str = "swiple:repository-cache",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.redis_url = redis_url
+        self.channel = channel
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        # Incremented by every invalidation, so that a document read before an invalidation is not cached after it.
+        self.generation = 0
+        self._entries: OrderedDict[tuple[str, str], CachedDocument] = OrderedDict()
+        self._lock = threading.Lock()
+        self._sender = uuid.uuid4().hex
+        self._pid: Optional[int] = None
+        self._redis: Optional[redis.Redis] = None
+
+    def get(self, index: str, id: str) -> Optional[BaseModel]:
+        self._subscribe()
+        with self._lock:
+            entry = self._entries.get((index, id))
+            if entry is not None and self.clock() - entry.cached_at > self.ttl:
+                del self._entries[(index, id)]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((index, id))
+            self.hits += 1
+        return entry.object.copy()
+
+    def set(self, index: str, id: str, object: BaseModel, *, generation: Optional[int] = None):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[(index, id)] = CachedDocument(object.copy(), self.clock())
+            self._entries.move_to_end((index, id))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, index: str, id: Optional[str] = None):
+        """Drop a document, or every document of an index when `id` is None, in every process."""
+        self._invalidate(index, id)
+        self._publish(index, id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _invalidate(self, index: str, id: Optional[str]):
+        with self._lock:
+            if id is None:
+                keys = [key for key in self._entries if key[0] == index]
+            else:
+                keys = [(index, id)] if (index, id) in self._entries else []
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += 1
+            self.generation += 1
+
+    def _publish(self, index: str, id: Optional[str]):
+        if self.redis_url is None:
+            return
+        self._subscribe()
+        message = json.dumps({"sender": self._sender, "index": index, "id": id})
+        try:
+            self._redis.publish(self.channel, message)
+        except redis.RedisError as ex:
+            print(f"Failed to publish repository cache invalidation: {ex}")
+
+    def _on_message(self, message: dict):
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        if data.get("sender") != self._sender:
+            self._invalidate(data["index"], data.get("id"))
+
+    def _on_error(self, ex: Exception, pubsub, thread):
+        # Without invalidations, entries could be served until they expire.
+        print(f"Repository cache invalidations unavailable, clearing the cache: {ex}")
+        with self._lock:
+            self._entries.clear()
+        pubsub.close()
+        thread.stop()
+        self._pid = None
+
+    def _subscribe(self):
+        """Listen to the invalidations of the other processes, once per process."""
+        if self.redis_url is None or self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            # A forked process needs its own connections, and sender id to receive its siblings' messages.
+            self._sender = uuid.uuid4().hex
+            self._redis = redis.Redis.from_url(self.redis_url)
+            self._entries.clear()
+        try:
+            pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(**{self.channel: self._on_message})
+            pubsub.run_in_thread(sleep_time=1, daemon=True, exception_handler=self._on_error)
+        except redis.RedisError as ex:
+            # Entries of this process then only expire after the TTL.
+            print(f"Failed to subscribe to repository cache invalidations: {ex}")
+
+
+document_cache = DocumentCache(
+    maxsize=settings.REPOSITORY_CACHE_SIZE,
+    ttl=settings.REPOSITORY_CACHE_TTL,
+    redis_url=settings.REPOSITORY_CACHE_REDIS_URL,
+)
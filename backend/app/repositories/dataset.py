@@ -3,14 +3,29 @@ from typing import Any, Optional
 
 from fastapi.encoders import jsonable_encoder
 
-from app.repositories.base import BaseRepository, get_repository
-from app.models.dataset import Dataset
+from app.repositories.base import (
+    AsyncBaseRepository,
+    BaseRepository,
+    NotFoundError,
+    get_async_repository,
+    get_repository,
+)
+from app.repositories.cache import document_cache
+from app.models.dataset import Dataset, DatasetSample, Sample
 from app.settings import settings
 
 
 class DatasetRepository(BaseRepository[Dataset]):
+    """
+    Samples are stored by DatasetSampleRepository, datasets are read and written without them.
+    """
     model_class = Dataset
     index = settings.DATASET_INDEX
+    tiebreaker = ["datasource_id", "dataset_name.keyword"]
+    cache = document_cache
+    trusted = True
+    # Datasets indexed before samples were stored apart may still hold one.
+    source_excludes = ["sample"]
 
     def query_by_resource_name(
         self,
@@ -55,6 +70,17 @@ class DatasetRepository(BaseRepository[Dataset]):
         actions while getting the list of datasets is. Using nested docs was considered,
         but we chose index simplicity over an increase in index load.
         """
+        body = self._datasource_update_by_query(datasource_id, database=database, datasource_name=datasource_name)
+        if body is not None:
+            self.update_by_query(body)
+
+    @staticmethod
+    def _datasource_update_by_query(
+        datasource_id: str,
+        *,
+        database: Optional[str] = None,
+        datasource_name: Optional[str] = None,
+    ) -> Optional[dict[str, Any]]:
         update_by_query_string = ""
 
         if database is not None:
@@ -63,29 +89,96 @@ class DatasetRepository(BaseRepository[Dataset]):
         if datasource_name is not None:
             update_by_query_string += f"ctx._source.datasource_name = '{datasource_name}';"
 
-        if update_by_query_string != "":
-            self.client.update_by_query(
-                index=self.index,
-                body={
-                    "query": {"match": {"datasource_id": datasource_id}},
-                    "script": {
-                        "source": update_by_query_string,
-                        "lang": "painless"
-                    }
-                },
-                wait_for_completion=True,
-            )
+        if update_by_query_string == "":
+            return None
 
-    def _get_dict_from_object(self, object: Dataset, **kwargs) -> dict[str, Any]:
-        d = object.dict(by_alias=True, **kwargs)
-        sample = object.sample
-        if sample is not None:
-            sample_dict = {
-                **sample.dict(exclude={"rows"}),
-                "rows": json.dumps(jsonable_encoder(sample.rows)),
+        return {
+            "query": {"match": {"datasource_id": datasource_id}},
+            "script": {
+                "source": update_by_query_string,
+                "lang": "painless"
             }
-            d["sample"] = sample_dict
-        return d
+        }
+
+    def _get_dict_from_object(self, object: Dataset, **kwargs) -> dict[str, Any]:
+        exclude = {"sample"} | set(kwargs.pop("exclude", None) or ())
+        return object.dict(by_alias=True, exclude=exclude, **kwargs)
 
 
 get_dataset_repository = get_repository(DatasetRepository)
+
+
+class AsyncDatasetRepository(DatasetRepository, AsyncBaseRepository[Dataset]):
+    async def query_by_resource_name(
+        self,
+        *,
+        datasource_name: str,
+        schema: str,
+        name: str,
+        virtual_name: str,
+    ) -> list[Dataset]:
+        return await super().query_by_resource_name(
+            datasource_name=datasource_name,
+            schema=schema,
+            name=name,
+            virtual_name=virtual_name,
+        )
+
+    async def delete_by_datasource(self, datasource_id: str):
+        return await super().delete_by_datasource(datasource_id)
+
+    async def update_datasource(self, datasource_id: str, *, database: Optional[str] = None, datasource_name: Optional[str] = None):
+        body = self._datasource_update_by_query(datasource_id, database=database, datasource_name=datasource_name)
+        if body is not None:
+            await self.update_by_query(body)
+
+
+get_async_dataset_repository = get_async_repository(AsyncDatasetRepository)
+
+
+class DatasetSampleRepository(BaseRepository[DatasetSample]):
+    """Samples of datasets, keyed by dataset, so that reading datasets does not read their samples."""
+    model_class = DatasetSample
+    index = settings.DATASET_SAMPLE_INDEX
+
+    def save(self, dataset: Dataset, sample: Sample) -> DatasetSample:
+        return self.create(
+            dataset.key, DatasetSample(key=dataset.key, datasource_id=dataset.datasource_id, **sample.dict())
+        )
+
+    def delete_by_dataset(self, dataset_id: str):
+        try:
+            self.delete(dataset_id)
+        except NotFoundError:
+            pass
+
+    def delete_by_datasource(self, datasource_id: str):
+        query = {"query": {"match": {"datasource_id": datasource_id}}}
+        return super().delete_by_query(query)
+
+    def _get_dict_from_object(self, object: DatasetSample, **kwargs) -> dict[str, Any]:
+        # Rows are stored as JSON, their columns differ between datasets.
+        return {
+            **object.dict(exclude={"rows"} | set(kwargs.pop("exclude", None) or ()), **kwargs),
+            "rows": json.dumps(jsonable_encoder(object.rows)),
+        }
+
+
+get_dataset_sample_repository = get_repository(DatasetSampleRepository)
+
+
+class AsyncDatasetSampleRepository(DatasetSampleRepository, AsyncBaseRepository[DatasetSample]):
+    async def save(self, dataset: Dataset, sample: Sample) -> DatasetSample:
+        return await super().save(dataset, sample)
+
+    async def delete_by_dataset(self, dataset_id: str):
+        try:
+            await self.delete(dataset_id)
+        except NotFoundError:
+            pass
+
+    async def delete_by_datasource(self, datasource_id: str):
+        return await super().delete_by_datasource(datasource_id)
+
+
+get_async_dataset_sample_repository = get_async_repository(AsyncDatasetSampleRepository)
@@ -1,13 +1,18 @@
 from typing import Any, Optional
 
-from app.repositories.base import BaseRepository, get_repository
+from app.repositories.base import AsyncBaseRepository, BaseRepository, get_async_repository, get_repository
+from app.repositories.cache import document_cache
 from app.models.datasource import Datasource, DatasourceInput
+from app.models.trusted import trusted_parser
 from app.settings import settings
 
 
 class DatasourceRepository(BaseRepository[Datasource]):
     model_class = Datasource
     index = settings.DATASOURCE_INDEX
+    tiebreaker = ["datasource_name.keyword"]
+    cache = document_cache
+    trusted = True
 
     def query_by_name(self, name: str) -> list[Datasource]:
         return self.query({"query": {"match": {"datasource_name.keyword": name}}})
@@ -18,5 +23,18 @@ class DatasourceRepository(BaseRepository[Datasource]):
         object = DatasourceInput.parse_obj(d).__root__
         return object
 
+    def _construct_object(self, d: dict[str, Any], *, id: Optional[str] = None) -> Datasource:
+        if id is not None:
+            d["key"] = id
+        return trusted_parser(DatasourceInput)(d)
+
 
 get_datasource_repository = get_repository(DatasourceRepository)
+
+
+class AsyncDatasourceRepository(DatasourceRepository, AsyncBaseRepository[Datasource]):
+    async def query_by_name(self, name: str) -> list[Datasource]:
+        return await super().query_by_name(name)
+
+
+get_async_datasource_repository = get_async_repository(AsyncDatasourceRepository)
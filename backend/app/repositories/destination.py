@@ -1,6 +1,6 @@
 from typing import Optional, List
 
-from app.repositories.base import BaseRepository, get_repository
+from app.repositories.base import BaseRepository, Page, get_repository
 from app.models.destinations.destination import Destination
 from app.settings import settings
 
@@ -8,8 +8,15 @@ from app.settings import settings
 class DestinationRepository(BaseRepository[Destination]):
     model_class = Destination
     index = settings.DESTINATION_INDEX
-
-    def list(self, *, asc: Optional[bool]) -> list[Destination]:
+    tiebreaker = ["destination_name.keyword"]
+
+    def list(
+        self,
+        *,
+        asc: Optional[bool],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Destination]:
         direction = "asc" if asc else "desc"
         query = {
             "query": {
@@ -19,7 +26,7 @@ class DestinationRepository(BaseRepository[Destination]):
                 {"destination_name": direction}
             ]
         }
-        return super().query(query, size=1000)
+        return self.paginate(query, limit=limit, cursor=cursor)
 
     def query_by_name(self, destination_name: str) -> List[Destination]:
         query = {
@@ -2,14 +2,18 @@ import json
 from typing import Any, Optional
 
 from app.models.base_model import BaseModel
-from app.repositories.base import BaseRepository, get_repository
+from app.repositories.base import AsyncBaseRepository, BaseRepository, Page, get_async_repository, get_repository
 from app.models.expectation import Expectation, ExpectationInput
+from app.models.trusted import trusted_parser
 from app.settings import settings
 
 
 class ExpectationRepository(BaseRepository[Expectation]):
     model_class = Expectation
     index = settings.EXPECTATION_INDEX
+    tiebreaker = ["create_date", "dataset_id", "expectation_type", "key"]
+    source_key = True
+    trusted = True
 
     def query_by_filter(
         self,
@@ -19,8 +23,10 @@ class ExpectationRepository(BaseRepository[Expectation]):
         suggested: Optional[bool] = None,
         enabled: Optional[bool] = None,
         asc: Optional[bool] = False,
-        expectation_type: Optional[str] = None
-    ) -> list[Expectation]:
+        expectation_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Expectation]:
         direction = "asc" if asc else "desc"
         sort_by_key: str = "expectation_type"
         sort = {"sort": [{sort_by_key: direction}]}
@@ -33,7 +39,7 @@ class ExpectationRepository(BaseRepository[Expectation]):
             expectation_type=expectation_type,
             sort=sort,
         )
-        return super().query(query, size=1000)
+        return self.paginate(query, limit=limit, cursor=cursor)
 
     def count_by_filter(
         self,
@@ -87,6 +93,15 @@ class ExpectationRepository(BaseRepository[Expectation]):
         object.documentation = object._documentation()
         return object
 
+    def _construct_object(self, d: dict[str, Any], *, id: Optional[str] = None) -> Expectation:
+        if id is not None:
+            d["key"] = id
+        object = trusted_parser(ExpectationInput)(d)
+        if "kwargs" in object.__fields_set__:
+            # Set without validate_assignment, like the fields of the object.
+            object.__dict__["documentation"] = object._documentation()
+        return object
+
     @staticmethod
     def _build_query_filter(
         *,
@@ -121,3 +136,66 @@ class ExpectationRepository(BaseRepository[Expectation]):
 
 
 get_expectation_repository = get_repository(ExpectationRepository)
+
+
+class AsyncExpectationRepository(ExpectationRepository, AsyncBaseRepository[Expectation]):
+    async def query_by_filter(
+        self,
+        *,
+        datasource_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        suggested: Optional[bool] = None,
+        enabled: Optional[bool] = None,
+        asc: Optional[bool] = False,
+        expectation_type: Optional[str] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Expectation]:
+        return await super().query_by_filter(
+            datasource_id=datasource_id,
+            dataset_id=dataset_id,
+            suggested=suggested,
+            enabled=enabled,
+            asc=asc,
+            expectation_type=expectation_type,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def count_by_filter(
+        self,
+        *,
+        datasource_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        suggested: Optional[bool] = None,
+        enabled: Optional[bool] = None,
+        expectation_type: Optional[str] = None
+    ) -> int:
+        return await super().count_by_filter(
+            datasource_id=datasource_id,
+            dataset_id=dataset_id,
+            suggested=suggested,
+            enabled=enabled,
+            expectation_type=expectation_type,
+        )
+
+    async def delete_by_filter(
+        self,
+        *,
+        datasource_id: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        suggested: Optional[bool] = None,
+        enabled: Optional[bool] = None,
+    ):
+        return await super().delete_by_filter(
+            datasource_id=datasource_id,
+            dataset_id=dataset_id,
+            suggested=suggested,
+            enabled=enabled,
+        )
+
+    async def delete_by_datasource(self, datasource_id: str):
+        return await self.delete_by_filter(datasource_id=datasource_id)
+
+
+get_async_expectation_repository = get_async_repository(AsyncExpectationRepository)
@@ -0,0 +1,133 @@
+from datetime import timedelta
+from typing import Any, Optional
+
+from app.db.partitions import TimePartitions
+from app.models.validation import ExpectationResult
+from app.repositories.base import AsyncBaseRepository, PartitionedRepository, get_async_repository, get_repository
+from app.repositories.validation import parse_run_time
+from app.settings import settings
+
+expectation_result_partitions = TimePartitions(
+    settings.EXPECTATION_RESULT_INDEX,
+    settings.VALIDATION_INDEX_PARTITION,
+    settings.VALIDATION_RETENTION_DAYS,
+)
+
+
+def get_expectation_result_index(run_time: str) -> str:
+    """Partition of an expectation result, by the run time of its validation."""
+    return expectation_result_partitions.partition(parse_run_time(run_time))
+
+
+class ExpectationResultRepository(PartitionedRepository[ExpectationResult]):
+    """
+    Results of validations, one small document per expectation and run, for the history of
+    expectations. Written alongside validations, in partitions of their run time.
+    """
+    model_class = ExpectationResult
+    index = settings.EXPECTATION_RESULT_INDEX
+    tiebreaker = ["run_time", "expectation_id"]
+    partitions = expectation_result_partitions
+    trusted = True
+
+    def history(
+        self, expectation_ids: list[str], *, size: int, period: int = 14
+    ) -> dict[str, list[ExpectationResult]]:
+        """The last `size` results of each expectation over the last `period` days, oldest first."""
+        if not expectation_ids:
+            return {}
+        repository = self.since(timedelta(days=period))
+        repository._read_your_writes()
+        response = self.client.search(
+            index=repository.index,
+            body=self._history_query(expectation_ids, size, period),
+            **repository.search_options,
+        )
+        return self._history(response)
+
+    def delete_by_filter(
+        self,
+        dataset_id: Optional[str] = None,
+        datasource_id: Optional[str] = None,
+        expectation_id: Optional[str] = None,
+    ):
+        return super().delete_by_query(self._filter_query(dataset_id, datasource_id, expectation_id))
+
+    @staticmethod
+    def _history_query(expectation_ids: list[str], size: int, period: int) -> dict[str, Any]:
+        return {
+            "size": 0,
+            "query": {
+                "bool": {
+                    "filter": [
+                        {"terms": {"expectation_id": expectation_ids}},
+                        {"range": {"run_time": {"gte": f"now-{period}d", "lte": "now"}}},
+                    ]
+                }
+            },
+            "aggs": {
+                "expectations": {
+                    "terms": {"field": "expectation_id", "size": len(expectation_ids)},
+                    "aggs": {
+                        "latest": {"top_hits": {"size": size, "sort": [{"run_time": "desc"}]}},
+                    },
+                }
+            },
+        }
+
+    def _history(self, response: dict[str, Any]) -> dict[str, list[ExpectationResult]]:
+        history = {}
+        for bucket in response["aggregations"]["expectations"]["buckets"]:
+            hits = bucket["latest"]["hits"]["hits"]
+            history[bucket["key"]] = [
+                self._get_object_from_source(hit["_source"], id=hit["_id"]) for hit in reversed(hits)
+            ]
+        return history
+
+    @staticmethod
+    def _filter_query(
+        dataset_id: Optional[str], datasource_id: Optional[str], expectation_id: Optional[str]
+    ) -> dict[str, Any]:
+        query = {"query": {"bool": {"must": []}}}
+        for field, value in (
+            ("dataset_id", dataset_id),
+            ("datasource_id", datasource_id),
+            ("expectation_id", expectation_id),
+        ):
+            if value is not None:
+                query["query"]["bool"]["must"].append({"term": {field: value}})
+        return query
+
+
+get_expectation_result_repository = get_repository(ExpectationResultRepository)
+
+
+class AsyncExpectationResultRepository(ExpectationResultRepository, AsyncBaseRepository[ExpectationResult]):
+    async def history(
+        self, expectation_ids: list[str], *, size: int, period: int = 14
+    ) -> dict[str, list[ExpectationResult]]:
+        if not expectation_ids:
+            return {}
+        repository = self.since(timedelta(days=period))
+        await repository._read_your_writes()
+        response = await self.client.search(
+            index=repository.index,
+            body=self._history_query(expectation_ids, size, period),
+            **repository.search_options,
+        )
+        return self._history(response)
+
+    async def delete_by_filter(
+        self,
+        dataset_id: Optional[str] = None,
+        datasource_id: Optional[str] = None,
+        expectation_id: Optional[str] = None,
+    ):
+        return await super().delete_by_filter(
+            dataset_id=dataset_id,
+            datasource_id=datasource_id,
+            expectation_id=expectation_id,
+        )
+
+
+get_async_expectation_result_repository = get_async_repository(AsyncExpectationResultRepository)
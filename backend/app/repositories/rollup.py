@@ -0,0 +1,269 @@
+from datetime import datetime, timedelta, timezone
+from typing import Any, Iterable, Optional
+
+from app.models.validation import DatasetRollup, FailingSums, Stats, Validation
+from app.repositories.base import (
+    REFRESH,
+    AsyncBaseRepository,
+    BaseRepository,
+    get_async_repository,
+    get_repository,
+)
+from app.repositories.validation import parse_run_time
+from app.settings import settings
+
+# Fields of a rollup summed over its validations.
+SUMS = (
+    "validations",
+    "failed_validations",
+    "evaluated_expectations",
+    "successful_expectations",
+    "unsuccessful_expectations",
+    "success_percent_sum",
+    "success_percent_count",
+    "failing_validations",
+)
+# Fields of FailingSums, summed by hour.
+FAILING_SUMS = (
+    "validations",
+    "evaluated_expectations",
+    "successful_expectations",
+    "unsuccessful_expectations",
+    "success_percent_sum",
+    "success_percent_count",
+)
+
+ADD_SCRIPT = """
+for (entry in params.sums.entrySet()) {
+    def value = ctx._source[entry.getKey()];
+    ctx._source[entry.getKey()] = (value == null ? 0 : value) + entry.getValue();
+}
+if (ctx._source.failing_hours == null) {
+    ctx._source.failing_hours = [:];
+}
+for (hour in params.failing_hours.entrySet()) {
+    def stored = ctx._source.failing_hours[hour.getKey()];
+    if (stored == null) {
+        ctx._source.failing_hours[hour.getKey()] = hour.getValue();
+        continue;
+    }
+    for (entry in hour.getValue().entrySet()) {
+        def value = stored[entry.getKey()];
+        stored[entry.getKey()] = (value == null ? 0 : value) + entry.getValue();
+    }
+}
+"""
+
+
+class DatasetRollupRepository(BaseRepository[DatasetRollup]):
+    """
+    Daily sums of the validations of each dataset, upserted when a validation is stored, so that
+    statistics read a few rollups instead of aggregating raw validations. Days are UTC days, and
+    the windows of the statistics are whole days: "1 day" covers yesterday and today.
+    """
+    model_class = DatasetRollup
+    index = settings.DATASET_ROLLUP_INDEX
+    tiebreaker = ["day", "dataset_id"]
+
+    def add(self, validation: Validation):
+        """Add a stored validation to the rollup of its dataset and day."""
+        (rollup,) = self.rollups([validation])
+        self.client.update(
+            index=self.index,
+            id=rollup.key,
+            body=self._add_body(rollup),
+            retry_on_conflict=5,
+            refresh=REFRESH[self.consistency],
+        )
+
+    def rebuild(self, validations: Iterable[Validation], *, batch_size: int = 1000) -> int:
+        """
+        Replace the rollups of the days of `validations`, which must hold every validation of these days.
+        Validations added to these days while rebuilding may be lost.
+        """
+        rollups = self.rollups(validations)
+        for start in range(0, len(rollups), batch_size):
+            self.bulk_create(rollups[start:start + batch_size])
+        return len(rollups)
+
+    def statistics(self, dataset_id: str) -> Stats:
+        return self._statistics(self.query(self._statistics_query(dataset_id)))
+
+    def top_issues(self, size: int = 10) -> list[dict[str, Any]]:
+        """
+        Datasets with validations having unsuccessful expectations in the last 24 hours, lowest average
+        success rate of these validations first.
+        """
+        return self._top_issues(self.paginate(self._top_issues_query()), size)
+
+    def delete_by_filter(self, dataset_id: str = None, datasource_id: str = None):
+        return super().delete_by_query(self._filter_query(dataset_id, datasource_id))
+
+    @staticmethod
+    def rollups(validations: Iterable[Validation]) -> list[DatasetRollup]:
+        rollups: dict[str, DatasetRollup] = {}
+        for validation in validations:
+            try:
+                run_time = parse_run_time(validation.meta.run_id.run_time)
+            except ValueError as ex:
+                # Rather than counting it on a day it did not run.
+                print(f"Skipped validation of dataset {validation.meta.dataset_id} in rollups: {ex}")
+                continue
+            day = run_time.date().isoformat()
+            key = f"{validation.meta.dataset_id}__{day}"
+            rollup = rollups.get(key)
+            if rollup is None:
+                rollup = rollups[key] = DatasetRollup(
+                    key=key,
+                    dataset_id=validation.meta.dataset_id,
+                    datasource_id=validation.meta.datasource_id,
+                    day=day,
+                )
+            statistics = validation.statistics
+            rollup.validations += 1
+            rollup.failed_validations += 0 if validation.success else 1
+            rollup.evaluated_expectations += statistics.evaluated_expectations
+            rollup.successful_expectations += statistics.successful_expectations
+            rollup.unsuccessful_expectations += statistics.unsuccessful_expectations
+            has_success_percent = statistics.success_percent is not None
+            if has_success_percent:
+                rollup.success_percent_sum += statistics.success_percent
+                rollup.success_percent_count += 1
+            if statistics.unsuccessful_expectations:
+                rollup.failing_validations += 1
+                failing = rollup.failing_hours.setdefault(f"{run_time.hour:02d}", FailingSums())
+                failing.validations += 1
+                failing.evaluated_expectations += statistics.evaluated_expectations
+                failing.successful_expectations += statistics.successful_expectations
+                failing.unsuccessful_expectations += statistics.unsuccessful_expectations
+                if has_success_percent:
+                    failing.success_percent_sum += statistics.success_percent
+                    failing.success_percent_count += 1
+        return list(rollups.values())
+
+    def _add_body(self, rollup: DatasetRollup) -> dict[str, Any]:
+        return {
+            "script": {
+                "source": ADD_SCRIPT,
+                "lang": "painless",
+                "params": {
+                    "sums": {field: getattr(rollup, field) for field in SUMS},
+                    "failing_hours": {hour: sums.dict() for hour, sums in rollup.failing_hours.items()},
+                },
+            },
+            "upsert": self._get_dict_from_object(rollup, exclude={"key"}),
+        }
+
+    @staticmethod
+    def _days_ago(days: int) -> str:
+        return (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+
+    @classmethod
+    def _statistics_query(cls, dataset_id: str) -> dict[str, Any]:
+        return {
+            "query": {
+                "bool": {
+                    "must": [
+                        {"term": {"dataset_id": dataset_id}},
+                        {"range": {"day": {"gte": cls._days_ago(31)}}},
+                    ]
+                }
+            },
+            "sort": [{"day": "asc"}],
+        }
+
+    @classmethod
+    def _statistics(cls, rollups: list[DatasetRollup]) -> Stats:
+        def average(days: int) -> Optional[float]:
+            since = cls._days_ago(days)
+            window = [rollup for rollup in rollups if rollup.day >= since]
+            count = sum(rollup.success_percent_count for rollup in window)
+            if not count:
+                return None
+            return sum(rollup.success_percent_sum for rollup in window) / count
+
+        return Stats(
+            **{
+                "1_day_avg": average(1),
+                "7_day_avg": average(7),
+                "31_day_avg": average(31),
+                "validations": [
+                    [f"{rollup.day}T00:00:00Z", rollup.success_percent_sum / rollup.success_percent_count]
+                    for rollup in sorted(rollups, key=lambda rollup: rollup.day)
+                    if rollup.success_percent_count
+                ],
+            }
+        )
+
+    @classmethod
+    def _top_issues_query(cls) -> dict[str, Any]:
+        return {
+            "query": {
+                "bool": {
+                    "must": [
+                        {"range": {"day": {"gte": cls._days_ago(1)}}},
+                        {"range": {"failing_validations": {"gte": 1}}},
+                    ]
+                }
+            },
+            "sort": [{"day": "asc"}],
+        }
+
+    @staticmethod
+    def _top_issues(
+        rollups: Iterable[DatasetRollup], size: int, now: Optional[datetime] = None
+    ) -> list[dict[str, Any]]:
+        # The last 24 hours, from the start of the hour 24 hours ago.
+        since = (now or datetime.now(timezone.utc)) - timedelta(days=1)
+        since = since.replace(minute=0, second=0, microsecond=0)
+        datasets: dict[str, FailingSums] = {}
+        for rollup in rollups:
+            for hour, sums in rollup.failing_hours.items():
+                if datetime.fromisoformat(f"{rollup.day}T{hour}:00:00+00:00") < since:
+                    continue
+                dataset = datasets.setdefault(rollup.dataset_id, FailingSums())
+                for field in FAILING_SUMS:
+                    setattr(dataset, field, getattr(dataset, field) + getattr(sums, field))
+
+        ranked = sorted(
+            (dataset.success_percent_sum / dataset.success_percent_count, dataset_id, dataset)
+            for dataset_id, dataset in datasets.items()
+            if dataset.success_percent_count
+        )
+        issues = [
+            {
+                "rate": f"{rate} %",
+                "#_failures": f"{dataset.unsuccessful_expectations} of {dataset.evaluated_expectations}",
+                "pass_count": dataset.successful_expectations,
+                "fail_count": dataset.unsuccessful_expectations,
+                "dataset_id": dataset_id,
+            }
+            for rate, dataset_id, dataset in ranked
+        ]
+        return issues[:size]
+
+    @staticmethod
+    def _filter_query(dataset_id: Optional[str], datasource_id: Optional[str]) -> dict[str, Any]:
+        query = {"query": {"bool": {"must": []}}}
+        if dataset_id is not None:
+            query["query"]["bool"]["must"].append({"term": {"dataset_id": dataset_id}})
+        if datasource_id is not None:
+            query["query"]["bool"]["must"].append({"term": {"datasource_id": datasource_id}})
+        return query
+
+
+get_dataset_rollup_repository = get_repository(DatasetRollupRepository)
+
+
+class AsyncDatasetRollupRepository(DatasetRollupRepository, AsyncBaseRepository[DatasetRollup]):
+    async def statistics(self, dataset_id: str) -> Stats:
+        return self._statistics(await self.query(self._statistics_query(dataset_id)))
+
+    async def top_issues(self, size: int = 10) -> list[dict[str, Any]]:
+        return self._top_issues(await self.paginate(self._top_issues_query()), size)
+
+    async def delete_by_filter(self, dataset_id: str = None, datasource_id: str = None):
+        return await super().delete_by_filter(dataset_id=dataset_id, datasource_id=datasource_id)
+
+
+get_async_dataset_rollup_repository = get_async_repository(AsyncDatasetRollupRepository)
@@ -1,5 +1,6 @@
+from datetime import datetime, timezone
 from typing import Any, Optional
-from app.repositories.base import BaseRepository, get_repository
+from app.repositories.base import BaseRepository, Page, get_repository
 from app.settings import settings
 from app.models.task import TaskResult
 from app.repositories.base import OSNotFoundError
@@ -8,6 +9,7 @@ from app.repositories.base import OSNotFoundError
 class TaskRepository(BaseRepository[TaskResult]):
     model_class = TaskResult
     index = settings.CELERY_INDEX
+    tiebreaker = ["timestamp", {"result.task_id.keyword": {"order": "asc", "unmapped_type": "keyword"}}]
     id_prefix = "celery-task-meta-"
 
     def get(self, id: str) -> TaskResult:
@@ -21,7 +23,19 @@ class TaskRepository(BaseRepository[TaskResult]):
             })
         return self._get_object_from_dict(result_dict)
 
-    def query_by_dataset_id(self, dataset_id: str, status=None) -> list[TaskResult]:
+    def query_by_dataset_id(
+        self,
+        dataset_id: str,
+        status=None,
+        *,
+        since: Optional[datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[TaskResult]:
+        """
+        Results of the tasks of a dataset stored since `since`, by default the results not expired yet,
+        most recent first.
+        """
         # Construct the must array
         must = [{"match": {"result.kwargs.dataset_id.keyword": dataset_id}}]
 
@@ -29,13 +43,23 @@ class TaskRepository(BaseRepository[TaskResult]):
         if status:
             must.append({"match": {"result.status.keyword": status}})
 
-        return self.query({
+        if since is not None:
+            if since.tzinfo is not None:
+                since = since.astimezone(timezone.utc).replace(tzinfo=None)
+            # As stored by OpenSearchBackend
+            must.append({"range": {"timestamp": {"gte": f"{since.isoformat(timespec='milliseconds')}Z"}}})
+        elif settings.TASK_RESULT_EXPIRES:
+            # Relative to the time of the search, the query of every page is the same.
+            must.append({"range": {"timestamp": {"gte": f"now-{settings.TASK_RESULT_EXPIRES}s"}}})
+
+        return self.paginate({
             "query": {
                 "bool": {
                     "must": must
                 }
-            }
-        })
+            },
+            "sort": [{"timestamp": "desc"}],
+        }, limit=limit, cursor=cursor)
 
     def _get_object_from_dict(self, d: dict[str, Any], *, id: Optional[str] = None) -> TaskResult:
         if id is not None:
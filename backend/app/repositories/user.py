@@ -8,6 +8,7 @@ from app.settings import settings
 class UserRepository(BaseRepository[User]):
     model_class = User
     index = settings.USER_INDEX
+    tiebreaker = [{"email.keyword": {"order": "asc", "unmapped_type": "keyword"}}]
 
     def _get_object_from_dict(self, d: dict[str, Any], *, id: Optional[str] = None) -> User:
         if id is not None:
@@ -1,20 +1,55 @@
+from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
-from app.repositories.base import BaseRepository, get_repository
-from app.models.validation import Validation
+from app.db.partitions import TimePartitions
+from app.repositories.base import (
+    AsyncBaseRepository,
+    Page,
+    PartitionedRepository,
+    get_async_repository,
+    get_repository,
+)
+from app.models.dataset import ValidationMode
+from app.models.validation import Validation, Watermark
 from app.settings import settings
 
+validation_partitions = TimePartitions(
+    settings.VALIDATION_INDEX,
+    settings.VALIDATION_INDEX_PARTITION,
+    settings.VALIDATION_RETENTION_DAYS,
+)
 
-class ValidationRepository(BaseRepository[Validation]):
+
+def parse_run_time(run_time: str) -> datetime:
+    """Time of a validation run, e.g. 2022-10-11 09:10:44.330614+00:00. Raises ValueError when it cannot be parsed."""
+    try:
+        time = datetime.fromisoformat(run_time)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"invalid validation run time {run_time!r}") from e
+    if time.tzinfo is None:
+        return time.replace(tzinfo=timezone.utc)
+    return time.astimezone(timezone.utc)
+
+
+def get_validation_index(run_time: str) -> str:
+    """Partition of a validation, by its run time."""
+    return validation_partitions.partition(parse_run_time(run_time))
+
+
+class ValidationRepository(PartitionedRepository[Validation]):
     model_class = Validation
     index = settings.VALIDATION_INDEX
+    tiebreaker = ["meta.run_id.run_time", {"meta.dataset_id.keyword": {"order": "asc", "unmapped_type": "keyword"}}]
+    partitions = validation_partitions
 
     def query_by_filter(
         self,
         datasource_id: str = None,
         dataset_id: str = None,
         period: int = 14,
-    ):
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Validation]:
         query = {
             "query": {
                 "bool": {
@@ -32,7 +67,17 @@ class ValidationRepository(BaseRepository[Validation]):
         if datasource_id:
             query["query"]["bool"]["must"].append({"match": {"meta.datasource_id.keyword": datasource_id}})
 
-        return super().query(query, size=2000)
+        return self.since(timedelta(days=period)).paginate(query, limit=limit, cursor=cursor)
+
+    def get_last_watermark(self, dataset_id: str) -> Optional[Watermark]:
+        """Watermark of the most recent successful validation of a dataset that recorded one."""
+        validations = super().query(self._last_watermark_query(dataset_id), size=1)
+        if not validations:
+            return None
+        return validations[0].meta.watermark
+
+    def has_full_validation_since(self, dataset_id: str, hours: int) -> bool:
+        return self.since(timedelta(hours=hours)).count(self._full_validation_query(dataset_id, hours)) > 0
 
     def delete_by_filter(
         self,
@@ -60,65 +105,34 @@ class ValidationRepository(BaseRepository[Validation]):
     def delete_by_expectation(self, expectation_id: str):
         return self.delete_by_filter(expectation_id=expectation_id)
 
-    def statistics(self, dataset_id):
-        query = {
+    @staticmethod
+    def _last_watermark_query(dataset_id: str) -> dict[str, Any]:
+        return {
             "query": {
                 "bool": {
                     "must": [
                         {"match": {"meta.dataset_id.keyword": dataset_id}},
-                        {"range": {"meta.run_id.run_time": {"gte": "now-31d", "lte": "now"}}},
+                        {"term": {"success": True}},
+                        {"exists": {"field": "meta.watermark.high"}},
                     ]
                 }
             },
-            "aggs": {
-                "31_day": {
-                    "filter": {
-                        "range": {"meta.run_id.run_time": {"gte": "now-31d", "lte": "now"}}
-                    },
-                    "aggs": {
-                        "success_counts": {
-                            "avg": {"field": "statistics.success_percent"}
-                        }
-                    }
-                },
-                "7_day": {
-                    "filter": {"range": {"meta.run_id.run_time": {"gte": "now-7d", "lte": "now"}}},
-                    "aggs": {
-                        "success_counts": {
-                            "avg": {"field": "statistics.success_percent"}
-                        }
-                    }
-                },
-                "1_day": {
-                    "filter": {
-                        "range": {"meta.run_id.run_time": {"gte": "now-1d", "lte": "now"}},
-                    },
-                    "aggs": {
-                        "success_counts": {
-                            "avg": {"field": "statistics.success_percent"},
-                        }
-                    }
-                },
-                "validation_counts": {
-                    "date_histogram": {
-                        "field": "meta.run_id.run_time",
-                        "calendar_interval": "1d",
-                        "format": "yyyy-MM-dd'T'HH:mm:ssZZZZZ",
-                    },
-                    "aggs": {
-                        "1_day": {
-                            "avg": {
-                                "field": "statistics.success_percent",
-                            }
-                        }
-                    }
+            "sort": [{"meta.run_id.run_time": "desc"}],
+        }
+
+    @staticmethod
+    def _full_validation_query(dataset_id: str, hours: int) -> dict[str, Any]:
+        return {
+            "query": {
+                "bool": {
+                    "must": [
+                        {"match": {"meta.dataset_id.keyword": dataset_id}},
+                        {"term": {"meta.watermark.mode": ValidationMode.FULL.value}},
+                        {"range": {"meta.run_id.run_time": {"gte": f"now-{hours}h", "lte": "now"}}},
+                    ]
                 }
             }
         }
-        return self.client.search(
-            index=settings.VALIDATION_INDEX,
-            body=query,
-        )
 
     def _get_object_from_dict(self, d: dict[str, Any], *, id: Optional[str] = None) -> Validation:
         return Validation.parse_obj(d)
@@ -128,3 +142,54 @@ class ValidationRepository(BaseRepository[Validation]):
 
 
 get_validation_repository = get_repository(ValidationRepository)
+
+
+class AsyncValidationRepository(ValidationRepository, AsyncBaseRepository[Validation]):
+    async def query_by_filter(
+        self,
+        datasource_id: str = None,
+        dataset_id: str = None,
+        period: int = 14,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> Page[Validation]:
+        return await super().query_by_filter(
+            datasource_id=datasource_id,
+            dataset_id=dataset_id,
+            period=period,
+            limit=limit,
+            cursor=cursor,
+        )
+
+    async def get_last_watermark(self, dataset_id: str) -> Optional[Watermark]:
+        validations = await self.query(self._last_watermark_query(dataset_id), size=1)
+        if not validations:
+            return None
+        return validations[0].meta.watermark
+
+    async def has_full_validation_since(self, dataset_id: str, hours: int) -> bool:
+        return await self.since(timedelta(hours=hours)).count(self._full_validation_query(dataset_id, hours)) > 0
+
+    async def delete_by_filter(
+        self,
+        dataset_id: str = None,
+        datasource_id: str = None,
+        expectation_id: str = None
+    ):
+        return await super().delete_by_filter(
+            dataset_id=dataset_id,
+            datasource_id=datasource_id,
+            expectation_id=expectation_id,
+        )
+
+    async def delete_by_dataset(self, dataset_id: str):
+        return await self.delete_by_filter(dataset_id=dataset_id)
+
+    async def delete_by_datasource(self, datasource_id: str):
+        return await self.delete_by_filter(datasource_id=datasource_id)
+
+    async def delete_by_expectation(self, expectation_id: str):
+        return await self.delete_by_filter(expectation_id=expectation_id)
+
+
+get_async_validation_repository = get_async_repository(AsyncValidationRepository)
@@ -0,0 +1,114 @@
+from typing import Any, Iterable, Optional
+
+from opensearchpy import OpenSearch
+
+from app.models.action import Action
+from app.models.dataset import Dataset
+from app.models.datasource import Datasource
+from app.models.expectation import Expectation
+from app.repositories.action import ActionRepository
+from app.repositories.base import ConsistencySession, NotFoundError
+from app.repositories.dataset import DatasetRepository
+from app.repositories.datasource import DatasourceRepository
+from app.repositories.expectation import ExpectationRepository
+
+# Expectations and actions read with their dataset, more are paginated.
+# MAX_EXPECTATIONS is the default index.max_result_window.
+MAX_EXPECTATIONS = 10000
+MAX_ACTIONS = 1000
+
+
+class ValidationBundle:
+    """What a validation of a dataset reads: the dataset, its datasource, enabled expectations and actions."""
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        datasource: Datasource,
+        expectations: list[Expectation],
+        actions: list[Action],
+    ):
+        self.dataset = dataset
+        self.datasource = datasource
+        self.expectations = expectations
+        self.actions = actions
+
+
+class ValidationBundleRepository:
+    """
+    Reads validation bundles in three requests, whatever the number of datasets: a multi get of
+    the datasets, a multi get of their datasources, and a multi search of their expectations and
+    actions, instead of a get, a get and two searches per dataset.
+
+    Datasets and datasources are read in real time, like `get`. Searches only see refreshed
+    documents: with a ConsistencySession, the expectations and actions the session wrote are
+    refreshed first. The expectations and actions of datasets having more than MAX_EXPECTATIONS
+    or MAX_ACTIONS are paginated.
+    """
+
+    def __init__(self, client: OpenSearch, *, session: Optional[ConsistencySession] = None):
+        self.client = client
+        self.datasets = DatasetRepository(client)
+        self.datasources = DatasourceRepository(client)
+        self.expectations = ExpectationRepository(client, session=session)
+        self.actions = ActionRepository(client, session=session)
+
+    def get(self, dataset_id: str) -> ValidationBundle:
+        bundle = self.get_many([dataset_id]).get(dataset_id)
+        if bundle is None:
+            raise NotFoundError()
+        return bundle
+
+    def get_many(self, dataset_ids: Iterable[str]) -> dict[str, ValidationBundle]:
+        """Bundles of `dataset_ids` by dataset id. Datasets, or datasources, that do not exist are left out."""
+        datasets = self.datasets.get_many(dataset_ids)
+        if not datasets:
+            return {}
+        datasources = self.datasources.get_many(dataset.datasource_id for dataset in datasets.values())
+        datasets = {key: dataset for key, dataset in datasets.items() if dataset.datasource_id in datasources}
+        if not datasets:
+            return {}
+
+        self.expectations._read_your_writes()
+        self.actions._read_your_writes()
+        body = []
+        for dataset_id in datasets:
+            body += self.expectations._search_request(self._expectations_query(dataset_id), size=MAX_EXPECTATIONS)
+            body += self.actions._search_request(self._actions_query(dataset_id), size=MAX_ACTIONS)
+        responses = iter(self.client.msearch(body=body)["responses"])
+
+        bundles = {}
+        for dataset_id, dataset in datasets.items():
+            expectations_response = next(responses)
+            actions_response = next(responses)
+            expectations = self.expectations._objects_from_response(expectations_response)
+            if self._truncated(expectations_response, expectations):
+                expectations = self.expectations.query_by_filter(dataset_id=dataset_id, enabled=True)
+            actions = self.actions._objects_from_response(actions_response)
+            if self._truncated(actions_response, actions):
+                actions = self.actions.list(resource_key=dataset_id, action_type="validation")
+            bundles[dataset_id] = ValidationBundle(
+                dataset=dataset,
+                datasource=datasources[dataset.datasource_id],
+                expectations=expectations,
+                actions=actions,
+            )
+        return bundles
+
+    @staticmethod
+    def _truncated(response: dict[str, Any], objects: list) -> bool:
+        return response["hits"]["total"]["value"] > len(objects)
+
+    @staticmethod
+    def _expectations_query(dataset_id: str) -> dict[str, Any]:
+        # As ExpectationRepository.query_by_filter(dataset_id=dataset_id, enabled=True)
+        return ExpectationRepository._build_query_filter(
+            dataset_id=dataset_id,
+            enabled=True,
+            sort={"sort": [{"expectation_type": "desc"}]},
+        )
+
+    @staticmethod
+    def _actions_query(dataset_id: str) -> dict[str, Any]:
+        # As ActionRepository.list(resource_key=dataset_id, action_type="validation")
+        return ActionRepository._build_query_filter(resource_key=dataset_id, action_type="validation")
@@ -0,0 +1,45 @@
+import argparse
+from datetime import timedelta
+from typing import Optional
+
+from opensearchpy import OpenSearch
+from opensearchpy.helpers import bulk, scan
+
+from app.db.client import client
+from app.models.validation import ExpectationResult, Validation
+from app.repositories.expectation_result import get_expectation_result_index
+from app.repositories.validation import ValidationRepository
+
+
+def backfill_expectation_results(client: OpenSearch, days: Optional[int] = None) -> int:
+    """
+    Index the expectation results of the validations of the last `days` days, or of every stored validation.
+    Results already indexed are overwritten. Returns the number of results written.
+    """
+    validation_repository = ValidationRepository(client)
+    query = {"query": {"match_all": {}}}
+    if days is not None:
+        validation_repository = validation_repository.since(timedelta(days=days))
+        query["query"] = {"range": {"meta.run_id.run_time": {"gte": f"now-{days}d"}}}
+
+    def actions():
+        for hit in scan(client, query=query, index=validation_repository.index, **validation_repository.search_options):
+            validation = Validation.parse_obj(hit["_source"])
+            try:
+                index = get_expectation_result_index(validation.meta.run_id.run_time)
+            except ValueError as ex:
+                print(f"Skipped results of validation {hit['_id']}: {ex}")
+                continue
+            for result in ExpectationResult.from_validation(hit["_id"], validation):
+                yield {"_index": index, "_id": result.key, "_source": result.dict(exclude={"key"})}
+
+    results, _ = bulk(client, actions())
+    print(f"Wrote {results} expectation results")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Index the expectation results of the stored validations.")
+    parser.add_argument("--days", type=int, help="only index the validations of the last DAYS days")
+    args = parser.parse_args()
+    backfill_expectation_results(client, days=args.days)
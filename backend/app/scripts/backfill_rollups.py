@@ -0,0 +1,33 @@
+import argparse
+from datetime import timedelta
+from typing import Optional
+
+from opensearchpy import OpenSearch
+
+from app.db.client import client
+from app.repositories.rollup import DatasetRollupRepository
+from app.repositories.validation import ValidationRepository
+
+
+def backfill_rollups(client: OpenSearch, days: Optional[int] = None) -> int:
+    """
+    Rebuild the dataset rollups of the last `days` days (today included), or of every stored validation.
+    Returns the number of rollups written.
+    """
+    validation_repository = ValidationRepository(client)
+    query = {"query": {"match_all": {}}, "sort": [{"meta.run_id.run_time": "asc"}]}
+    if days is not None:
+        validation_repository = validation_repository.since(timedelta(days=days))
+        # Whole days, as rollups of partial days would replace the complete ones.
+        query["query"] = {"range": {"meta.run_id.run_time": {"gte": f"now-{days - 1}d/d"}}}
+
+    rollups = DatasetRollupRepository(client).rebuild(validation_repository.scan(query))
+    print(f"Wrote {rollups} dataset rollups")
+    return rollups
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild the daily dataset rollups from the stored validations.")
+    parser.add_argument("--days", type=int, help="only rebuild the last DAYS days, today included")
+    args = parser.parse_args()
+    backfill_rollups(client, days=args.days)
@@ -1,4 +1,4 @@
-from typing import List, Union, Literal
+from typing import List, Literal, Optional, Union
 from pydantic import (
     AnyHttpUrl,
     BaseSettings,
@@ -62,6 +62,93 @@ class Settings(BaseSettings):
     # https://github.com/redis/redis-py/blob/bedf3c82a55b4b67eed93f686cb17e82f7ab19cd/redis/client.py#L899
     SCHEDULER_REDIS_KWARGS: dict = Field(default={"host": "redis"})
 
+    # Maximum number of Great Expectations data contexts kept per process.
+    # Each context holds an execution engine (and connection pool) for one datasource.
+    # Set to 0 to build a new context for every run.
+    DATA_CONTEXT_CACHE_SIZE: int = Field(default=16)
+
+    # Samples taken while creating or editing a dataset are cached per process, keyed by datasource
+    # and normalized query. Set SAMPLE_CACHE_SIZE to 0 to always query the datasource.
+    SAMPLE_CACHE_SIZE: int = Field(default=128)
+    SAMPLE_CACHE_TTL: int = Field(default=300)  # seconds
+
+    # Schemas, tables and columns listed by the introspection endpoints are cached per process.
+    # Entries older than INTROSPECTION_CACHE_TTL are served while being refreshed in the background,
+    # entries older than INTROSPECTION_CACHE_MAX_STALE are reloaded before responding.
+    INTROSPECTION_CACHE_TTL: int = Field(default=600)  # seconds
+    INTROSPECTION_CACHE_MAX_STALE: int = Field(default=86400)  # seconds
+    INTROSPECTION_REFRESH_WORKERS: int = Field(default=2)
+
+    # Connection pool settings for engines connecting to datasources (warehouses).
+    # https://docs.sqlalchemy.org/en/14/core/pooling.html#sqlalchemy.pool.QueuePool
+    WAREHOUSE_POOL_SIZE: int = Field(default=5)
+    WAREHOUSE_POOL_MAX_OVERFLOW: int = Field(default=10)
+    WAREHOUSE_POOL_TIMEOUT: int = Field(default=30)  # seconds to wait for a connection
+    WAREHOUSE_POOL_RECYCLE: int = Field(default=1800)  # seconds before an idle connection is replaced
+    WAREHOUSE_POOL_PRE_PING: bool = Field(default=True)
+
+    # Resolve all aggregate metrics of a suite (mean, min, max, sum, row count, null counts, ...)
+    # in a single SELECT per dataset instead of one per dependency level.
+    AGGREGATE_PUSHDOWN_ENABLED: bool = Field(default=True)
+
+    # Confidence level of the success_percent interval recorded for sampled validations.
+    SAMPLED_VALIDATION_CONFIDENCE_LEVEL: float = Field(default=0.95, gt=0, lt=1)
+
+    # Expectation suggestions profile columns in chunks (query datasets in one), running up to
+    # PROFILING_MAX_CONCURRENCY_PER_DATASOURCE chunks at the same time per datasource (per worker process).
+    PROFILING_COLUMNS_PER_CHUNK: int = Field(default=25)
+    PROFILING_MAX_CONCURRENCY_PER_DATASOURCE: int = Field(default=4)
+
+    # List endpoints page through results with a point in time and search_after.
+    # PAGINATION_KEEP_ALIVE is how long a point in time is kept between two pages.
+    PAGINATION_DEFAULT_LIMIT: int = Field(default=100)
+    PAGINATION_MAX_LIMIT: int = Field(default=1000)
+    PAGINATION_KEEP_ALIVE: str = Field(default="5m")
+
+    # Workers index validations with a per-process bulk buffer, flushed when it holds
+    # VALIDATION_BULK_MAX_ACTIONS validations, when the oldest is VALIDATION_BULK_MAX_AGE seconds old
+    # and when the worker process shuts down. VALIDATION_WRITE_DURABILITY is what a validation task
+    # waits for: "buffered" (nothing), "acknowledged" (indexed) or "refreshed" (searchable).
+    # Incremental validations read the watermark of the previous validation, so with "buffered" a
+    # validation scheduled less than VALIDATION_BULK_MAX_AGE seconds after the previous one may not see it.
+    VALIDATION_WRITE_DURABILITY: Literal["buffered", "acknowledged", "refreshed"] = Field(default="acknowledged")
+    VALIDATION_BULK_MAX_ACTIONS: int = Field(default=500)
+    VALIDATION_BULK_MAX_AGE: float = Field(default=1.0)  # seconds
+    VALIDATION_BULK_MAX_RETRIES: int = Field(default=3)
+
+    # Validations are stored in one index per month or day of their run time, e.g. validations-2022.10,
+    # all under the VALIDATION_INDEX alias. Partitions whose period ended more than VALIDATION_RETENTION_DAYS
+    # ago are deleted, 0 keeps every validation. Changing the partitioning applies to new partitions.
+    # Expectation results (EXPECTATION_RESULT_INDEX) are partitioned and retained the same way.
+    VALIDATION_INDEX_PARTITION: Literal["monthly", "daily"] = Field(default="monthly")
+    VALIDATION_RETENTION_DAYS: int = Field(default=0)
+
+    # Datasources and datasets read by id are cached per process for REPOSITORY_CACHE_TTL seconds.
+    # Writes invalidate the cache of the writing process, and of every process when REPOSITORY_CACHE_REDIS_URL
+    # (e.g. "redis://redis:6379/2") is set. Set REPOSITORY_CACHE_SIZE to 0 to disable the cache.
+    REPOSITORY_CACHE_SIZE: int = Field(default=1024)
+    REPOSITORY_CACHE_TTL: int = Field(default=60)  # seconds
+    REPOSITORY_CACHE_REDIS_URL: Optional[str] = Field(default=None)
+
+    # Consistency of API writes. "immediate" refreshes the index on every write, "wait_for" waits for its
+    # next refresh and "async" returns once the write is acknowledged. Asynchronous writes are readable by
+    # id right away. Clients sending back the X-Consistency-Token response header of a write also find it
+    # in searches, other clients after at most OPENSEARCH_REFRESH_INTERVAL seconds.
+    REPOSITORY_WRITE_CONSISTENCY: Literal["immediate", "wait_for", "async"] = Field(default="async")
+    # index.refresh_interval of the Swiple indices.
+    OPENSEARCH_REFRESH_INTERVAL: float = Field(default=1.0)  # seconds
+
+    # The validations, expectations and other documents of a deleted datasource are deleted by a background
+    # task, running a delete_by_query task of OpenSearch per index in parallel. Each is sliced across shards and
+    # throttled to CASCADE_DELETE_REQUESTS_PER_SECOND documents per second, -1 does not throttle them. Their
+    # progress is polled every CASCADE_DELETE_POLL_INTERVAL seconds.
+    CASCADE_DELETE_REQUESTS_PER_SECOND: float = Field(default=2000)
+    CASCADE_DELETE_POLL_INTERVAL: float = Field(default=2.0)  # seconds
+
+    # Celery task results (CELERY_INDEX) stored more than TASK_RESULT_EXPIRES seconds ago are deleted every
+    # hour, 0 keeps every result. The tasks of a dataset are listed from the results not expired yet.
+    TASK_RESULT_EXPIRES: int = Field(default=7 * 24 * 60 * 60)
+
     OPENSEARCH_HOST: str = Field(default="opensearch-node1")
     OPENSEARCH_PORT: int = Field(default="9200")
     OPENSEARCH_USERNAME: str = Field(default="admin")
@@ -74,14 +161,25 @@ class Settings(BaseSettings):
     VERSION_CONTROL_INDEX: str = Field(default="reindexer_version")
     DATASOURCE_INDEX: str = "datasources"
     DATASET_INDEX: str = "datasets"
+    DATASET_SAMPLE_INDEX: str = "dataset_samples"
     EXPECTATION_INDEX: str = "expectations"
     VALIDATION_INDEX: str = "validations"
+    DATASET_ROLLUP_INDEX: str = "dataset_rollups"
+    EXPECTATION_RESULT_INDEX: str = "expectation_results"
     SUGGESTION_INDEX: str = "suggestions"
     DESTINATION_INDEX: str = "destinations"
     ACTION_INDEX: str = "actions"
     USER_INDEX: str = "user"
     CELERY_INDEX: str = "celery"
 
+    # Validations requested from the API, scheduled validations and suggestions are sent to queues of their own,
+    # other tasks to the task_default_queue of SWIPLE_CELERY_CONFIG. Workers consume every queue, or those given
+    # with -Q, e.g. a pool for suggestions. With Redis, a worker takes interactive validations first, then scheduled
+    # validations, other tasks and suggestions.
+    TASK_QUEUE_INTERACTIVE: str = Field(default="swiple-interactive")
+    TASK_QUEUE_SCHEDULED: str = Field(default="swiple-scheduled")
+    TASK_QUEUE_SUGGESTIONS: str = Field(default="swiple-suggestions")
+
     SWIPLE_CELERY_CONFIG: dict = {
         "broker_url": "redis://redis:6379/1",
         "result_backend": "app.worker.backends.opensearch.OpenSearchBackend://_:_@_:9200/celery",
@@ -1,4 +1,5 @@
 from celery import Celery
+from kombu import Queue
 from app.settings import settings
 
 
@@ -7,9 +8,33 @@ celery_app = Celery(
     include=[
         'app.worker.tasks.validation',
         'app.worker.tasks.suggestions',
+        'app.worker.tasks.datasource',
     ],
     accept_content=['application/json'],
     task_track_started=True,
     result_extended=True,
+    result_expires=settings.TASK_RESULT_EXPIRES or None,
     **settings.SWIPLE_CELERY_CONFIG
 )
+
+# In order of priority, see settings.TASK_QUEUE_INTERACTIVE and app.worker.queues.
+TASK_QUEUES = [
+    settings.TASK_QUEUE_INTERACTIVE,
+    settings.TASK_QUEUE_SCHEDULED,
+    celery_app.conf.task_default_queue,
+    settings.TASK_QUEUE_SUGGESTIONS,
+]
+
+celery_app.conf.update(
+    task_queues=[Queue(queue) for queue in TASK_QUEUES],
+    # Validations requested from the API are sent to TASK_QUEUE_INTERACTIVE by the endpoint.
+    task_routes={
+        'validation.run': {'queue': settings.TASK_QUEUE_SCHEDULED},
+        'suggestions.run': {'queue': settings.TASK_QUEUE_SUGGESTIONS},
+    },
+    # Redis workers read their queues in the order of TASK_QUEUES rather than in turn.
+    broker_transport_options={
+        'queue_order_strategy': 'priority',
+        **celery_app.conf.broker_transport_options,
+    },
+)
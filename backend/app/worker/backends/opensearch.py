@@ -1,11 +1,11 @@
 """OpenSearch result store backend."""
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from kombu.utils.encoding import bytes_to_str
 from kombu.utils.url import _parse_url
 
 from celery import states
-from celery.exceptions import ImproperlyConfigured
+from celery.exceptions import BackendStoreError, ImproperlyConfigured
 
 from celery.backends.base import KeyValueStoreBackend
 from app.db.client import client
@@ -17,6 +17,32 @@ except ImportError:
 
 __all__ = ('OpenSearchBackend',)
 
+# Replaces the stored state unless it is a success, or a ready state replaced by an unready
+# one, as OpenSearchBackend._update does.
+UPDATE_SCRIPT = """
+def stored = ctx._source.result;
+if (stored instanceof Map && stored.status != null) {
+    if (stored.status == 'SUCCESS'
+            || (params.ready_states.contains(stored.status) && params.unready_states.contains(params.state))) {
+        ctx.op = 'noop';
+        return;
+    }
+}
+ctx._source.putAll(params.doc);
+"""
+
+# Fields of the meta of task results left out of stored results while they are None, or empty
+# lists for those defaulting to one, and restored by decode.
+COMPACT_DEFAULTS = {
+    'result': None,
+    'traceback': None,
+    'date_done': None,
+    'parent_id': None,
+    'group_id': None,
+    'children': [],
+    'args': [],
+}
+
 OS_LIB_MISSING = """\
 You need to install the opensearch-py library to use the OpenSearch \
 result backend.\
@@ -26,6 +52,9 @@ result backend.\
 class OpenSearchBackend(KeyValueStoreBackend):
     """OpenSearch result backend.
 
+    Results stored more than ``result_expires`` ago are deleted by :meth:`cleanup`, run by the
+    ``celery.backend_cleanup`` task.
+
     Raises:
         celery.exceptions.ImproperlyConfigured:
             if module :pypi:`opensearch-py` is not available.
@@ -43,6 +72,7 @@ class OpenSearchBackend(KeyValueStoreBackend):
     os_max_retries = 3
 
     def __init__(self, url=None, *args, **kwargs):
+        kwargs.setdefault('expires_type', int)
         super().__init__(*args, **kwargs)
         self.url = url
         _get = self.app.conf.get
@@ -118,21 +148,41 @@ class OpenSearchBackend(KeyValueStoreBackend):
             id=key,
         )
 
+    def _store_result(self, task_id, result, state,
+                      traceback=None, request=None, **kwargs):
+        """Store the state of a task in a single request.
+
+        Unlike KeyValueStoreBackend, the stored state is not read first to keep a success: the
+        script of _upsert keeps it.
+        """
+        if self.os_save_meta_as_text:
+            return super()._store_result(task_id, result, state, traceback=traceback, request=request, **kwargs)
+        meta = self._get_result_meta(result=result, state=state,
+                                     traceback=traceback, request=request)
+        meta['task_id'] = bytes_to_str(task_id)
+        try:
+            self._set_with_state(self.get_key_for_task(task_id), self.encode(meta), state)
+        except BackendStoreError as ex:
+            raise BackendStoreError(str(ex), state=state, task_id=task_id) from ex
+        return result
+
     def _set_with_state(self, key, value, state):
         body = {
             'result': value,
-            'timestamp': '{}Z'.format(
-                datetime.utcnow().isoformat()[:-3]
-            ),
+            'timestamp': self._timestamp(datetime.utcnow()),
         }
-        try:
-            self._index(
-                id=key,
-                body=body,
-            )
-        except opensearchpy.exceptions.ConflictError:
-            # document already exists, update it
-            self._update(key, body, state)
+        if self.os_save_meta_as_text:
+            # The stored state cannot be read by the update script, see _update.
+            try:
+                self._index(
+                    id=key,
+                    body=body,
+                )
+            except opensearchpy.exceptions.ConflictError:
+                # document already exists, update it
+                self._update(key, body, state)
+        else:
+            self._upsert(key, body, state)
 
     def set(self, key, value):
         return self._set_with_state(key, value, None)
@@ -147,6 +197,37 @@ class OpenSearchBackend(KeyValueStoreBackend):
             **kwargs
         )
 
+    def _upsert(self, id, body, state, **kwargs):
+        """Create or update state in a single request, with the rules of _update applied by a script.
+
+        Concurrent updates of the same document are retried by OpenSearch.
+        """
+        body = {bytes_to_str(k): v for k, v in body.items()}
+        res = self.server.update(
+            id=bytes_to_str(id),
+            index=self.index,
+            body={
+                'script': {
+                    'source': UPDATE_SCRIPT,
+                    'lang': 'painless',
+                    'params': {
+                        'doc': body,
+                        'state': state,
+                        'ready_states': sorted(states.READY_STATES),
+                        'unready_states': sorted(states.UNREADY_STATES),
+                    },
+                },
+                'upsert': body,
+            },
+            params={'retry_on_conflict': self.os_max_retries},
+            **kwargs
+        )
+        # result is OpenSearch update query result
+        # noop = the script kept the stored state
+        if res['result'] == 'noop':
+            return {'result': 'noop'}
+        return res
+
     def _update(self, id, body, state, **kwargs):
         """Update state in a conflict free manner.
 
@@ -156,6 +237,8 @@ class OpenSearchBackend(KeyValueStoreBackend):
 
         This way, a Retry state cannot override a Success or Failure, and chord_unlock
         will not retry indefinitely.
+
+        Used when meta is saved as text, which the script of _upsert cannot read.
         """
         body = {bytes_to_str(k): v for k, v in body.items()}
 
@@ -205,6 +288,11 @@ class OpenSearchBackend(KeyValueStoreBackend):
         else:
             if not isinstance(data, dict):
                 return super().encode(data)
+            if "status" in data:
+                data = {
+                    k: v for k, v in data.items()
+                    if not (k in COMPACT_DEFAULTS and self._is_default(v, COMPACT_DEFAULTS[k]))
+                }
             if data.get("result"):
                 data["result"] = self._encode(data["result"])[2]
             if data.get("traceback"):
@@ -217,6 +305,9 @@ class OpenSearchBackend(KeyValueStoreBackend):
         else:
             if not isinstance(payload, dict):
                 return super().decode(payload)
+            if "status" in payload:
+                for k, default in COMPACT_DEFAULTS.items():
+                    payload.setdefault(k, list(default) if isinstance(default, list) else default)
             if payload.get("result"):
                 payload["result"] = super().decode(payload["result"])
             if payload.get("traceback"):
@@ -224,11 +315,50 @@ class OpenSearchBackend(KeyValueStoreBackend):
             return payload
 
     def mget(self, keys):
-        return [self.get(key) for key in keys]
+        """Results of `keys`, None for unknown keys, read in one request."""
+        keys = [bytes_to_str(key) for key in keys]
+        if not keys:
+            return []
+        res = self.server.mget(index=self.index, body={'ids': keys})
+        results = {}
+        for doc in res['docs']:
+            try:
+                if doc['found']:
+                    results[doc['_id']] = doc['_source']['result']
+            except (TypeError, KeyError):
+                pass
+        return [results.get(key) for key in keys]
 
     def delete(self, key):
         self.server.delete(index=self.index, id=key)
 
+    def cleanup(self):
+        """Delete the results stored more than ``expires`` seconds ago."""
+        if not self.expires:
+            return
+        expired = self._timestamp(datetime.utcnow() - timedelta(seconds=self.expires))
+        try:
+            res = self.server.delete_by_query(
+                index=self.index,
+                body={'query': {'range': {'timestamp': {'lt': expired}}}},
+                params={'conflicts': 'proceed', 'slices': 'auto'},
+            )
+        except opensearchpy.exceptions.NotFoundError:
+            # No result was stored yet.
+            return
+        if res.get('deleted'):
+            print(f"Deleted {res['deleted']} task results stored before {expired}")
+
+    @staticmethod
+    def _timestamp(dt):
+        return '{}Z'.format(dt.isoformat(timespec='milliseconds'))
+
+    @staticmethod
+    def _is_default(value, default):
+        if value is None:
+            return True
+        return default is not None and isinstance(value, (list, tuple)) and not value
+
     def _get_server(self):
         """Connect to the OpenSearch server."""
         http_auth = None
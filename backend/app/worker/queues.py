@@ -0,0 +1,17 @@
+"""Depths of the queues of the tasks, see TASK_QUEUES."""
+from app.worker.app import TASK_QUEUES, celery_app
+
+
+def queue_depths() -> dict[str, int]:
+    """The number of tasks waiting in each queue, in order of priority."""
+    depths = {}
+    with celery_app.connection_for_read() as connection:
+        for queue in TASK_QUEUES:
+            # A failed declare closes the channel on some brokers, each queue is declared on its own.
+            with connection.channel() as channel:
+                try:
+                    depths[queue] = channel.queue_declare(queue, passive=True).message_count
+                except connection.channel_errors:
+                    # Queues are created by their first task.
+                    depths[queue] = 0
+    return depths
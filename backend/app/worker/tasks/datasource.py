@@ -0,0 +1,15 @@
+from celery import current_task
+
+from app.core.cascade import cascade_delete, datasource_deletes
+from app.db.client import client
+from app.worker.app import celery_app
+
+
+@celery_app.task(name="datasource.delete_documents")
+def delete_datasource_documents(*, datasource_id: str):
+    """Delete the validations, expectations and other documents of a deleted datasource, reporting progress."""
+    def report(progress):
+        current_task.update_state(state="PROGRESS", meta={"datasource_id": datasource_id, **progress})
+
+    progress = cascade_delete(client, datasource_deletes(client, datasource_id), on_progress=report)
+    return {"datasource_id": datasource_id, **progress}
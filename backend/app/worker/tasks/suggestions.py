@@ -1,17 +1,35 @@
 from app.core.runner import create_dataset_suggestions
+from app.repositories.base import Consistency
 from app.repositories.expectation import ExpectationRepository
 from app.db.client import client
 from app.worker.app import celery_app
 
 
 @celery_app.task(name="suggestions.run",)
-def run_suggestions(dataset_id):
-    results = create_dataset_suggestions(dataset_id)
-    expectation_repository = ExpectationRepository(client)
-    expectations = [expectation_repository._get_object_from_dict(e) for e in results]
-    expectation_repository.delete_by_filter(
-        dataset_id=dataset_id,
-        suggested=True,
-        enabled=False,
+def run_suggestions(dataset_id, include_columns=None, exclude_columns=None):
+    columns, results = create_dataset_suggestions(
+        dataset_id,
+        include_columns=include_columns,
+        exclude_columns=exclude_columns,
     )
+    # The UI lists suggestions once the task succeeded, without a consistency token.
+    expectation_repository = ExpectationRepository(client, consistency=Consistency.WAIT_FOR)
+    expectations = [expectation_repository._get_object_from_dict(e) for e in results]
+
+    if include_columns or exclude_columns:
+        # Only replace suggestions of the profiled columns, and table level suggestions,
+        # including those the run no longer suggests.
+        replaced_columns = {*columns, None}
+        replaced = [
+            e.key for e in expectation_repository.query_by_filter(dataset_id=dataset_id, suggested=True, enabled=False)
+            if getattr(e.kwargs, "column", None) in replaced_columns
+        ]
+        if replaced:
+            expectation_repository.delete_by_query({"query": {"ids": {"values": replaced}}})
+    else:
+        expectation_repository.delete_by_filter(
+            dataset_id=dataset_id,
+            suggested=True,
+            enabled=False,
+        )
     expectation_repository.bulk_create(expectations)
@@ -1,18 +1,67 @@
 from app.core.runner import run_dataset_validation
 from app.worker.app import celery_app
+from app.db.bulk import BulkWriter, Durability
 from app.db.client import client
+from app.models.validation import ExpectationResult
+from app.repositories.expectation_result import expectation_result_partitions, get_expectation_result_index
+from app.repositories.rollup import DatasetRollupRepository
+from app.repositories.validation import get_validation_index, validation_partitions
 from app.settings import settings
 from uuid import uuid4
-from celery import current_task
+from celery import current_task, signals
+from opensearchpy import TransportError
+from typing import Optional
+
+
+validation_writer = BulkWriter(
+    client,
+    max_actions=settings.VALIDATION_BULK_MAX_ACTIONS,
+    max_age=settings.VALIDATION_BULK_MAX_AGE,
+    max_retries=settings.VALIDATION_BULK_MAX_RETRIES,
+)
+
+
+@signals.worker_process_shutdown.connect
+@signals.worker_shutdown.connect
+def flush_validations(**kwargs):
+    validation_writer.close()
 
 
 @celery_app.task(name="validation.run")
-def run_validation(*, dataset_id: str):
+def run_validation(
+    *, dataset_id: str, sample_fraction: Optional[float] = None, consistency_token: Optional[str] = None
+):
     task_id = current_task.request.id
-    validation = run_dataset_validation(dataset_id, task_id)
-    client.index(
-        index=settings.VALIDATION_INDEX,
-        id=str(uuid4()),
-        body=validation.dict(),
-        refresh="wait_for",
+    validation = run_dataset_validation(
+        dataset_id, task_id, sample_fraction=sample_fraction, consistency_token=consistency_token
     )
+    validation_id = str(uuid4())
+    # Buffered, the results are flushed at the latest with the validation below.
+    result_index = get_expectation_result_index(validation.meta.run_id.run_time)
+    for result in ExpectationResult.from_validation(validation_id, validation):
+        validation_writer.write(
+            result_index,
+            result.key,
+            result.dict(exclude={"key"}),
+            durability=Durability.BUFFERED,
+        )
+    validation_writer.write(
+        get_validation_index(validation.meta.run_id.run_time),
+        validation_id,
+        validation.dict(),
+        durability=Durability(settings.VALIDATION_WRITE_DURABILITY),
+    )
+    try:
+        DatasetRollupRepository(client).add(validation)
+    except TransportError as ex:
+        # The validation is stored, its rollup is repaired by app.scripts.backfill_rollups.
+        print(f"Failed to add validation of dataset {dataset_id} to its rollup: {ex}")
+
+
+@celery_app.task(name="validation.maintain_partitions")
+def maintain_validation_partitions():
+    for partitions in (validation_partitions, expectation_result_partitions):
+        partitions.rollover(client)
+        expired = partitions.delete_expired(client)
+        if expired:
+            print(f"Deleted expired partitions {expired}")
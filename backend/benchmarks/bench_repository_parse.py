@@ -0,0 +1,85 @@
+"""
+Benchmark of reading 1,000 expectations from search hits.
+
+Compares the validating read path (ExpectationInput.parse_obj, resolving the discriminated union
+of expectations and validating every field) with the trusted read path of repositories
+(app.models.trusted), and with a projection of the hits on the fields a list view shows.
+Times include decoding the JSON search response, which projection shrinks. Run from the
+backend directory:
+
+    python -m benchmarks.bench_repository_parse
+"""
+import json
+import timeit
+
+from app.repositories.expectation import ExpectationRepository
+
+EXPECTATION_COUNT = 1000
+NUMBER = 5
+REPEAT = 5
+PROJECTION = ["dataset_id", "datasource_id", "expectation_type", "enabled"]
+
+KWARGS = [
+    ("expect_column_to_exist", {"column": "product_name"}),
+    ("expect_column_values_to_not_be_null", {"column": "product_name", "objective": 0.9}),
+    ("expect_column_values_to_be_between", {"column": "price", "min_value": 0, "max_value": 100}),
+    ("expect_column_values_to_be_in_set", {"column": "status", "value_set": ["new", "paid", "shipped"]}),
+    ("expect_table_columns_to_match_ordered_list", {"column_list": ["id", "product_name", "price"]}),
+]
+
+
+def hits() -> list[dict]:
+    hits = []
+    for i in range(EXPECTATION_COUNT):
+        expectation_type, kwargs = KWARGS[i % len(KWARGS)]
+        hits.append({
+            "_id": f"expectation-{i}",
+            "_source": {
+                "create_date": "2022-10-04 13:37:00.000000+00:00",
+                "modified_date": "2022-10-04 13:37:00.000000+00:00",
+                "dataset_id": "5b65eae9-600e-4933-9bad-78477e0ab98e",
+                "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
+                "expectation_type": expectation_type,
+                "kwargs": json.dumps(kwargs),
+                "enabled": True,
+                "suggested": False,
+                "meta": None,
+                "validations": [],
+            },
+        })
+    return hits
+
+
+def read(repository: ExpectationRepository, response: str, **kwargs) -> list:
+    hits = json.loads(response)["hits"]["hits"]
+    return [repository._get_object_from_source(hit["_source"], id=hit["_id"], **kwargs) for hit in hits]
+
+
+def main():
+    validating = ExpectationRepository(None)
+    validating.trusted = False
+    trusted = ExpectationRepository(None)
+    all_hits = hits()
+    response = json.dumps({"hits": {"hits": all_hits}})
+    projected_response = json.dumps({"hits": {"hits": [
+        {**hit, "_source": {key: hit["_source"][key] for key in PROJECTION}} for hit in all_hits
+    ]}})
+
+    results = [
+        ("validated", _best(lambda: read(validating, response))),
+        ("trusted", _best(lambda: read(trusted, response))),
+        ("projected", _best(lambda: read(trusted, projected_response, projected=True))),
+    ]
+    baseline = results[0][1]
+    print(f"{EXPECTATION_COUNT} expectations")
+    print(f"{'read path':>10} {'time (ms)':>10} {'speedup':>8}")
+    for name, seconds in results:
+        print(f"{name:>10} {seconds * 1000:>10.2f} {baseline / seconds:>7.1f}x")
+
+
+def _best(function) -> float:
+    return min(timeit.repeat(function, number=NUMBER, repeat=REPEAT)) / NUMBER
+
+
+if __name__ == "__main__":
+    main()
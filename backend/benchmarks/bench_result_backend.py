@@ -0,0 +1,151 @@
+"""
+Benchmark of the OpenSearch result backend of Celery with many concurrent task state changes.
+
+1,000 tasks go through STARTED, PROGRESS and SUCCESS from 32 threads, then the states of all of
+them are read, as when polling a group result. The backend is compared with its previous
+implementation, which read the stored state before every write, created documents with op_type
+create and updated them after a get, and read states one get at a time. OpenSearch is simulated
+in memory, each request taking LATENCY seconds as a round trip would. Run from the backend directory:
+
+    python -m benchmarks.bench_result_backend
+"""
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from celery import states
+from celery.backends.base import KeyValueStoreBackend
+from kombu.utils.encoding import bytes_to_str
+from opensearchpy.exceptions import ConflictError, NotFoundError
+
+from app.worker.app import celery_app
+from app.worker.backends.opensearch import OpenSearchBackend
+
+TASK_COUNT = 1000
+THREADS = 32
+LATENCY = 0.001  # seconds
+STATES = [states.STARTED, "PROGRESS", states.SUCCESS]
+
+
+class SimulatedOpenSearch:
+    """The requests of the backend to a single index, each taking LATENCY seconds. Read documents are copies."""
+
+    def __init__(self):
+        self.documents = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _request(self):
+        time.sleep(LATENCY)
+        with self._lock:
+            self.requests += 1
+
+    def get(self, index, id):
+        id = bytes_to_str(id)
+        self._request()
+        with self._lock:
+            if id not in self.documents:
+                raise NotFoundError(404, "not_found", {})
+            seq_no, source = self.documents[id]
+            return {"found": True, "_id": id, "_source": copy.deepcopy(source), "_seq_no": seq_no, "_primary_term": 1}
+
+    def mget(self, index, body):
+        self._request()
+        with self._lock:
+            return {"docs": [
+                {"_id": id, "found": True, "_source": copy.deepcopy(self.documents[id][1])} if id in self.documents
+                else {"_id": id, "found": False}
+                for id in body["ids"]
+            ]}
+
+    def index(self, id, index, body, params):
+        id = bytes_to_str(id)
+        self._request()
+        with self._lock:
+            if id in self.documents:
+                raise ConflictError(409, "version_conflict_engine_exception", {})
+            self.documents[id] = (0, body)
+            return {"result": "created"}
+
+    def update(self, id, index, body, params):
+        id = bytes_to_str(id)
+        self._request()
+        with self._lock:
+            if "doc" in body:
+                seq_no, _ = self.documents[id]
+                if params.get("if_seq_no") != seq_no:
+                    raise ConflictError(409, "version_conflict_engine_exception", {})
+                self.documents[id] = (seq_no + 1, body["doc"])
+                return {"result": "updated"}
+            if id not in self.documents:
+                self.documents[id] = (0, body["upsert"])
+                return {"result": "created"}
+            # As UPDATE_SCRIPT
+            seq_no, source = self.documents[id]
+            script = body["script"]["params"]
+            stored = source["result"]["status"]
+            if stored == states.SUCCESS or (
+                stored in script["ready_states"] and script["state"] in script["unready_states"]
+            ):
+                return {"result": "noop"}
+            self.documents[id] = (seq_no + 1, {**source, **script["doc"]})
+            return {"result": "updated"}
+
+
+class PreviousOpenSearchBackend(OpenSearchBackend):
+    """The state writes and reads of the backend before single request writes and _mget."""
+
+    def _store_result(self, *args, **kwargs):
+        return KeyValueStoreBackend._store_result(self, *args, **kwargs)
+
+    def _set_with_state(self, key, value, state):
+        body = {"result": value, "timestamp": "{}Z".format(datetime.utcnow().isoformat()[:-3])}
+        try:
+            self._index(id=key, body=body)
+        except ConflictError:
+            self._update(key, body, state)
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+
+def run(backend_class) -> tuple[int, float, int, float]:
+    server = SimulatedOpenSearch()
+    backend = backend_class(app=celery_app)
+    backend._server = server
+    task_ids = [f"task-{i}" for i in range(TASK_COUNT)]
+
+    def change_states(task_id):
+        for state in STATES:
+            backend.store_result(task_id, {"state": state}, state)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as executor:
+        list(executor.map(change_states, task_ids))
+    write_seconds = time.perf_counter() - start
+    write_requests = server.requests
+
+    server.requests = 0
+    start = time.perf_counter()
+    results = backend.mget([backend.get_key_for_task(task_id) for task_id in task_ids])
+    read_seconds = time.perf_counter() - start
+    assert all(backend.decode_result(result)["status"] == states.SUCCESS for result in results)
+    return write_requests, write_seconds, server.requests, read_seconds
+
+
+def main():
+    changes = TASK_COUNT * len(STATES)
+    print(f"{TASK_COUNT} tasks, {changes} state changes from {THREADS} threads, {LATENCY * 1000:.0f}ms per request")
+    print(f"{'backend':>9} {'requests':>9} {'changes/s':>10} {'read requests':>14} {'read (ms)':>10}")
+    for name, backend_class in (("previous", PreviousOpenSearchBackend), ("current", OpenSearchBackend)):
+        write_requests, write_seconds, read_requests, read_seconds = run(backend_class)
+        print(
+            f"{name:>9} {write_requests:>9} {changes / write_seconds:>10.0f}"
+            f" {read_requests:>14} {read_seconds * 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,16 @@ import pytest
 import pytest_asyncio
 from opensearchpy import OpenSearch
 
+from app.core.introspection import metadata_cache
+from app.core.sample import sample_cache
 from app.core.users import current_active_user
-from app.db.client import get_client
+from app.db.client import get_async_client, get_client
 from app.main import app
 from app.models.users import User
+from app.repositories.cache import document_cache
 from app.scripts.setup_opensearch import create_indicies
 from tests.data import create_test_data
-from tests.fake_opensearch import FakeOpenSearch
+from tests.fake_opensearch import AsyncFakeOpenSearch, FakeOpenSearch
 
 
 @pytest.fixture(scope="session")
@@ -27,6 +30,7 @@ def event_loop():
 @pytest.fixture
 def opensearch_client() -> Generator[OpenSearch, None, None]:
     mock_client = FakeOpenSearch()
+    document_cache.clear()
     create_indicies(mock_client)
     create_test_data(mock_client)
     yield mock_client
@@ -47,8 +51,11 @@ async def test_client(
     opensearch_client: OpenSearch,
     user: Optional[User],
 ) -> AsyncGenerator[httpx.AsyncClient, None]:
+    sample_cache.clear()
+    metadata_cache.clear()
     async with asgi_lifespan.LifespanManager(app):
         app.dependency_overrides[get_client] = lambda: opensearch_client
+        app.dependency_overrides[get_async_client] = lambda: AsyncFakeOpenSearch(opensearch_client)
         if user is not None:
             app.dependency_overrides[current_active_user] = lambda: user
         async with httpx.AsyncClient(
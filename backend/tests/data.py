@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta, timezone
 from typing import Type
 import uuid
 from opensearchpy import OpenSearch
@@ -15,6 +16,7 @@ from app.repositories.base import M, R
 from app.repositories.dataset import DatasetRepository
 from app.repositories.datasource import DatasourceRepository
 from app.repositories.expectation import ExpectationRepository
+from app.repositories.rollup import DatasetRollupRepository
 from app.repositories.task import TaskRepository
 from app.repositories.validation import ValidationRepository
 
@@ -126,12 +128,16 @@ EXPECTATIONS: dict[str, Expectation] = {
 }
 
 
+# Validations ran an hour ago, within the last day of the statistics and top issues.
+RUN_TIME = str((datetime.now(timezone.utc) - timedelta(hours=1)).replace(microsecond=330614))
+
+
 def create_validation_object(datasource_id: str, dataset_id: str) -> Validation:
     return Validation(
         meta={
             "great_expectations_version": "1.0.0",
             "expectation_suite_name": "expectation_suite_name",
-            "run_id": {"run_time": "run_time", "run_name": "run_name"},
+            "run_id": {"run_time": RUN_TIME, "run_name": "run_name"},
             "batch_spec": {},
             "batch_markers": {},
             "active_batch_definition": {
@@ -169,6 +175,12 @@ VALIDATIONS: dict[str, Validation] = {
     ),
 }
 
+
+def stored_ago(hours: float) -> str:
+    """A timestamp of a task result, stored `hours` ago so that it has not expired."""
+    return f"{(datetime.utcnow() - timedelta(hours=hours)).isoformat(timespec='milliseconds')}Z"
+
+
 CELERY_TASKS: dict[str, Task] = {
     "postgres_table_products": Task(
         **{
@@ -188,7 +200,7 @@ CELERY_TASKS: dict[str, Task] = {
                 "queue": "swiple-job-queue",
                 "task_id": "c4690c54-ac50-4eaf-8a3f-104f0aef7ce7"
             },
-            "timestamp": "2023-03-26T17:30:56.263Z"
+            "timestamp": stored_ago(1)
         }
     ),
     "postgres_view_orders": Task(
@@ -209,17 +221,19 @@ CELERY_TASKS: dict[str, Task] = {
                 "queue": "swiple-job-queue",
                 "task_id": "a9cadbea-3676-44b0-be2b-26ea60267f50"
             },
-            "timestamp": "2023-03-26T15:42:16.136Z"
+            "timestamp": stored_ago(3)
         }
     )
 
 }
+DATASET_ROLLUPS = {rollup.key: rollup for rollup in DatasetRollupRepository.rollups(VALIDATIONS.values())}
 
 TEST_DATA: dict[Type[R], dict[str, M]] = {
     DatasourceRepository: DATASOURCES,
     DatasetRepository: DATASETS,
     ExpectationRepository: EXPECTATIONS,
     ValidationRepository: VALIDATIONS,
+    DatasetRollupRepository: DATASET_ROLLUPS,
     TaskRepository: CELERY_TASKS,
 }
 
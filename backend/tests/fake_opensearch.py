@@ -1,14 +1,289 @@
+import fnmatch
 import json
+import re
+import uuid
+from datetime import datetime, timedelta
 
 import openmock
 from openmock.utilities import extract_ignore_as_iterable
 from opensearchpy.client.utils import query_params
-from opensearchpy.exceptions import NotFoundError
+from opensearchpy.exceptions import NotFoundError, TransportError
+
+
+def _sort_value(hit, field):
+    if field == "_id":
+        return hit["_id"]
+    value = hit["_source"]
+    for part in field.removesuffix(".keyword").split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def _sort_fields(sort):
+    fields = []
+    for item in sort if isinstance(sort, list) else [sort]:
+        if isinstance(item, str):
+            fields.append((item, "asc"))
+        else:
+            for field, order in item.items():
+                fields.append((field, order if isinstance(order, str) else order.get("order", "asc")))
+    return fields
+
+
+def _compare(values, other, fields):
+    """-1, 0 or 1 as `values` sort before, with or after `other`. Missing values sort last."""
+    for value, other_value, (_, order) in zip(values, other, fields):
+        if value == other_value:
+            continue
+        if value is None:
+            return 1
+        if other_value is None:
+            return -1
+        before = value < other_value if order == "asc" else value > other_value
+        return -1 if before else 1
+    return 0
+
+
+def _project_source(hit, params):
+    """Top level _source_includes and _source_excludes."""
+    includes, excludes = (_split((params or {}).get(key)) for key in ("_source_includes", "_source_excludes"))
+    if not (includes or excludes) or "_source" not in hit:
+        return hit
+    return {
+        **hit,
+        "_source": {
+            key: value for key, value in hit["_source"].items()
+            if (not includes or key in includes) and key not in excludes
+        },
+    }
+
+
+def _split(value):
+    if isinstance(value, bytes):
+        value = value.decode()
+    if isinstance(value, str):
+        return value.split(",")
+    return value or []
+
+
+def _resolve_date_math(query):
+    """Range bounds of the form now-<seconds>s, as timestamps of the Celery results (see OpenSearchBackend)."""
+    if isinstance(query, list):
+        return [_resolve_date_math(item) for item in query]
+    if not isinstance(query, dict):
+        return query
+    resolved = {}
+    for key, value in query.items():
+        if key == "range":
+            value = {
+                field: {
+                    sign: _date_math_timestamp(bound) if isinstance(bound, str) else bound
+                    for sign, bound in bounds.items()
+                }
+                for field, bounds in value.items()
+            }
+        resolved[key] = _resolve_date_math(value)
+    return resolved
+
+
+def _date_math_timestamp(value):
+    match = re.fullmatch(r"now-(\d+)s", value)
+    if match is None:
+        return value
+    return f"{(datetime.utcnow() - timedelta(seconds=int(match[1]))).isoformat(timespec='milliseconds')}Z"
 
 
 class FakeOpenSearch(openmock.FakeOpenSearch):
     """openmock.FakeOpenSearch completed with some missing methods we use."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.points_in_time = {}
+
+    @query_params(
+        "_source",
+        "_source_excludes",
+        "_source_includes",
+        "allow_no_indices",
+        "allow_partial_search_results",
+        "analyze_wildcard",
+        "analyzer",
+        "batched_reduce_size",
+        "ccs_minimize_roundtrips",
+        "default_operator",
+        "df",
+        "docvalue_fields",
+        "expand_wildcards",
+        "explain",
+        "from_",
+        "ignore_throttled",
+        "ignore_unavailable",
+        "lenient",
+        "max_concurrent_shard_requests",
+        "pre_filter_shard_size",
+        "preference",
+        "q",
+        "request_cache",
+        "rest_total_hits_as_int",
+        "routing",
+        "scroll",
+        "search_type",
+        "seq_no_primary_term",
+        "size",
+        "sort",
+        "stats",
+        "stored_fields",
+        "suggest_field",
+        "suggest_mode",
+        "suggest_size",
+        "suggest_text",
+        "terminate_after",
+        "timeout",
+        "track_scores",
+        "track_total_hits",
+        "typed_keys",
+        "version",
+    )
+    def search(self, index=None, doc_type=None, body=None, params=None, headers=None):
+        """Adds sort, search_after, point in time, ids query and date math support to openmock's search."""
+        body = dict(body or {})
+        if "query" in body:
+            body["query"] = _resolve_date_math(body["query"])
+        ids = self._query_ids(body.get("query"))
+        if ids is not None:
+            size = int(body.pop("size", (params or {}).pop("size", 10)))
+            body.update(query={"match_all": {}}, size=10000)
+            result = self.search(index=index, doc_type=doc_type, body=body, params=params, headers=headers)
+            hits = [hit for hit in result["hits"]["hits"] if hit["_id"] in ids]
+            result["hits"]["total"] = {"value": len(hits), "relation": "eq"}
+            result["hits"]["hits"] = hits[:size]
+            return result
+        pit = body.pop("pit", None)
+        if pit is not None:
+            index = self.points_in_time[pit["id"]]
+        index = self._resolve_index(index, params)
+        if "sort" not in body:
+            result = super().search(index=index, doc_type=doc_type, body=body, params=params, headers=headers)
+            result["hits"]["hits"] = [_project_source(hit, params) for hit in result["hits"]["hits"]]
+            return result
+
+        fields = _sort_fields(body.pop("sort"))
+        search_after = body.pop("search_after", None)
+        size = int(body.pop("size", (params or {}).pop("size", 10)))
+        result = super().search(index=index, doc_type=doc_type, body=body, params=params, headers=headers)
+
+        hits = result["hits"]["hits"]
+        for field, order in reversed(fields):
+            present = [hit for hit in hits if _sort_value(hit, field) is not None]
+            missing = [hit for hit in hits if _sort_value(hit, field) is None]
+            present.sort(key=lambda hit: _sort_value(hit, field), reverse=order == "desc")
+            hits = present + missing
+        hits = [
+            {**_project_source(hit, params), "sort": [_sort_value(hit, field) for field, _ in fields]} for hit in hits
+        ]
+        if search_after is not None:
+            hits = [hit for hit in hits if _compare(hit["sort"], search_after, fields) > 0]
+
+        result["hits"]["hits"] = hits[:size]
+        if pit is not None:
+            result["pit_id"] = pit["id"]
+        return result
+
+    @query_params(
+        "_source",
+        "_source_excludes",
+        "_source_includes",
+        "preference",
+        "realtime",
+        "refresh",
+        "routing",
+        "stored_fields",
+        "version",
+        "version_type",
+    )
+    def get(self, index, id, doc_type="_all", params=None, headers=None):
+        """Adds _source_includes and _source_excludes support to openmock's get."""
+        return _project_source(super().get(index, id, doc_type=doc_type, params=params, headers=headers), params)
+
+    @query_params("_source_excludes", "_source_includes", "realtime", "refresh")
+    def mget(self, body, index=None, doc_type=None, params=None, headers=None):
+        """openmock's mget, with ids bodies and documents not found returned as such rather than left out."""
+        docs = body.get("docs") or [{"_id": id} for id in body.get("ids", [])]
+        results = []
+        for doc in docs:
+            doc_index = doc.get("_index", index)
+            try:
+                results.append(self.get(doc_index, doc["_id"], params=params, headers=headers))
+            except NotFoundError:
+                results.append({"_index": doc_index, "_id": doc["_id"], "found": False})
+        return {"docs": results}
+
+    @query_params("max_concurrent_searches", "rest_total_hits_as_int", "search_type", "typed_keys")
+    def msearch(self, body, index=None, doc_type=None, params=None, headers=None):
+        """Adds the options of the headers, _source filtering and failed searches to openmock's msearch."""
+        responses = []
+        for header, search in zip(body[::2], body[1::2]):
+            header, search = dict(header), dict(search)
+            search_index = header.pop("index", index)
+            source = search.pop("_source", None)
+            if isinstance(source, dict):
+                for key in ("includes", "excludes"):
+                    if source.get(key):
+                        header[f"_source_{key}"] = source[key]
+            try:
+                responses.append(self.search(index=search_index, body=search, **header))
+            except TransportError as e:
+                responses.append({"error": {"type": e.error, "reason": str(e.info)}, "status": e.status_code})
+        return {"took": len(responses), "responses": responses}
+
+    def _query_ids(self, query):
+        """Ids of an ids query, or of a terms query on _id, resolving terms lookups."""
+        if not isinstance(query, dict):
+            return None
+        if "ids" in query:
+            return set(query["ids"]["values"])
+        terms = query.get("terms", {}).get("_id")
+        if terms is None:
+            return None
+        if isinstance(terms, dict):
+            try:
+                value = self.get(terms["index"], terms["id"])["_source"]
+            except NotFoundError:
+                return set()
+            for part in terms["path"].split("."):
+                value = value.get(part) if isinstance(value, dict) else None
+            terms = value if isinstance(value, list) else [] if value is None else [value]
+        return set(terms)
+
+    def _resolve_index(self, index, params):
+        """Comma separated and wildcard expressions, missing indices being skipped with ignore_unavailable."""
+        if index is None:
+            return None
+        names = index.split(",") if isinstance(index, str) else list(index)
+        ignore_unavailable = str((params or {}).get("ignore_unavailable", "")).lower() == "true"
+        resolved = []
+        for name in names:
+            if "*" in name:
+                resolved += sorted(fnmatch.filter(self.__documents_dict, name))
+            elif name in self.__documents_dict or not ignore_unavailable:
+                resolved.append(name)
+        return resolved
+
+    @query_params("expand_wildcards", "ignore_unavailable", "keep_alive", "preference", "routing")
+    def create_point_in_time(self, index=None, params=None, headers=None):
+        pit_id = str(uuid.uuid4())
+        self.points_in_time[pit_id] = self._resolve_index(index, params)
+        return {"pit_id": pit_id}
+
+    @query_params()
+    def delete_point_in_time(self, body=None, all=False, params=None, headers=None):
+        pit_ids = list(self.points_in_time) if all else body["pit_id"]
+        for pit_id in pit_ids:
+            self.points_in_time.pop(pit_id, None)
+        return {"pits": [{"pit_id": pit_id, "successful": True} for pit_id in pit_ids]}
+
     @query_params(
         "allow_no_indices",
         "analyze_wildcard",
@@ -158,3 +433,21 @@ class FakeOpenSearch(openmock.FakeOpenSearch):
             "throttled_until_millis": 0,
             "failures": [],
         }
+
+
+class AsyncFakeOpenSearch:
+    """AsyncOpenSearch facade over a FakeOpenSearch, sharing its documents (and mocks)."""
+
+    def __init__(self, client: FakeOpenSearch):
+        self.client = client
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+        if not callable(method):
+            # Namespaced clients, e.g. indices
+            return AsyncFakeOpenSearch(method)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
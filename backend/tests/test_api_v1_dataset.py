@@ -5,14 +5,19 @@ import pytest
 from fastapi import status
 from opensearchpy import OpenSearch, RequestError
 from pydantic.errors import Decimal
+from openmock.fake_indices import FakeIndicesClient
 from pytest_mock import MockerFixture
 import requests
 
 from app.core.runner import Runner
 from app.core.sample import GetSampleException
 from app.models.dataset import Sample
-from app.repositories.dataset import DatasetRepository
-from tests.data import DATASETS, DATASOURCES
+from app.models.task import Task
+from app.repositories.base import ConsistencySession
+from app.repositories.dataset import AsyncDatasetRepository, DatasetRepository, DatasetSampleRepository
+from app.repositories.task import TaskRepository
+from app.settings import settings
+from tests.data import CELERY_TASKS, DATASETS, DATASOURCES, stored_ago
 
 
 @pytest.fixture
@@ -63,6 +68,13 @@ def celery_delay_mock(mocker: MockerFixture) -> MagicMock:
     return mock
 
 
+@pytest.fixture
+def celery_apply_async_mock(mocker: MockerFixture) -> MagicMock:
+    mock = mocker.patch("celery.app.task.Task.apply_async")
+    mock.return_value.id = "a9cadbea-3676-44b0-be2b-26ea60267f50"
+    return mock
+
+
 @pytest.mark.asyncio
 class TestGetJSONSchema:
     async def test_unauthorized(self, test_client: httpx.AsyncClient):
@@ -114,21 +126,6 @@ class TestListDatasets:
 
         json = response.json()
         assert json == [
-            {
-                "create_date": "2022-10-04 13:37:00.000000+00:00",
-                "modified_date": "2022-10-04 13:37:00.000000+00:00",
-                "key": "5b65eae9-600e-4933-9bad-78477e0ab98e",
-                "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
-                "datasource_name": "postgres",
-                "database": "postgres",
-                "connector_type": "RuntimeDataConnector",
-                "dataset_name": "schema.postgres_table_products",
-                "description": None,
-                "runtime_parameters": None,
-                "engine": "PostgreSQL",
-                "sample": None,
-                "created_by": "admin@email.com",
-            },
             {
                 "create_date": "2022-10-04 13:37:00.000000+00:00",
                 "modified_date": "2022-10-04 13:37:00.000000+00:00",
@@ -138,6 +135,10 @@ class TestListDatasets:
                 "database": "postgres",
                 "connector_type": "RuntimeDataConnector",
                 "dataset_name": "postgres_view_orders",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "description": None,
                 "runtime_parameters": {"schema": "schema", "query": " select * from schema.orders limit 100 ; "},
                 "engine": "PostgreSQL",
@@ -153,12 +154,35 @@ class TestListDatasets:
                 "database": "mysql",
                 "connector_type": "RuntimeDataConnector",
                 "dataset_name": "schema.mysql_table_products",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "description": None,
                 "runtime_parameters": None,
                 "engine": "MySQL",
                 "sample": None,
                 "created_by": "admin@email.com",
             },
+            {
+                "create_date": "2022-10-04 13:37:00.000000+00:00",
+                "modified_date": "2022-10-04 13:37:00.000000+00:00",
+                "key": "5b65eae9-600e-4933-9bad-78477e0ab98e",
+                "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
+                "datasource_name": "postgres",
+                "database": "postgres",
+                "connector_type": "RuntimeDataConnector",
+                "dataset_name": "schema.postgres_table_products",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
+                "description": None,
+                "runtime_parameters": None,
+                "engine": "PostgreSQL",
+                "sample": None,
+                "created_by": "admin@email.com",
+            },
         ]
 
     @pytest.mark.user
@@ -176,6 +200,30 @@ class TestListDatasets:
             assert dataset["datasource_id"] == datasource_id
 
 
+    @pytest.mark.user
+    async def test_pagination(self, test_client: httpx.AsyncClient):
+        response = await test_client.get("/api/v1/datasets/", params={"limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        first_page = [dataset["key"] for dataset in response.json()]
+        assert len(first_page) == 2
+
+        response = await test_client.get(
+            "/api/v1/datasets/", params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]}
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" not in response.headers
+        second_page = [dataset["key"] for dataset in response.json()]
+        assert sorted(first_page + second_page) == sorted(dataset.key for dataset in DATASETS.values())
+
+    @pytest.mark.user
+    async def test_invalid_cursor(self, test_client: httpx.AsyncClient):
+        response = await test_client.get("/api/v1/datasets/", params={"limit": 2, "cursor": "invalid"})
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 @pytest.mark.asyncio
 class TestGetDataset:
     async def test_unauthorized(self, test_client: httpx.AsyncClient):
@@ -211,6 +259,10 @@ class TestGetDataset:
             "database": "postgres",
             "connector_type": "RuntimeDataConnector",
             "dataset_name": "schema.postgres_table_products",
+            "validation_mode": "full",
+            "watermark_column": None,
+            "full_validation_interval": 24,
+            "sample_fraction": None,
             "description": None,
             "runtime_parameters": None,
             "engine": "PostgreSQL",
@@ -219,6 +271,20 @@ class TestGetDataset:
         }
 
 
+    @pytest.mark.user
+    async def test_legacy_sample_not_read(self, test_client: httpx.AsyncClient, opensearch_client: OpenSearch):
+        dataset = DATASETS["postgres_table_products"]
+        opensearch_client.index(
+            index=settings.DATASET_INDEX,
+            id=dataset.key,
+            body={**dataset.dict(by_alias=True, exclude={"key"}), "sample": {"columns": ["id"], "rows": "[]"}},
+        )
+
+        response = await test_client.get(f"/api/v1/datasets/{dataset.key}")
+
+        assert response.json()["sample"] is None
+
+
 @pytest.mark.asyncio
 class TestCreateDataset:
     async def test_unauthorized(self, test_client: httpx.AsyncClient):
@@ -235,6 +301,10 @@ class TestCreateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "schema.postgres_table_products",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
             },
         )
 
@@ -258,6 +328,10 @@ class TestCreateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "postgres_table_users",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "users"},
             },
         )
@@ -280,6 +354,10 @@ class TestCreateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "postgres_table_users",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "users"},
             },
         )
@@ -293,6 +371,61 @@ class TestCreateDataset:
         assert json["modified_date"] is not None
         assert json["sample"] == {"columns": [], "rows": []}
 
+    @pytest.mark.user
+    async def test_create_failure_does_not_save_sample(
+        self,
+        get_dataset_sample_mock: MagicMock,
+        test_client: httpx.AsyncClient,
+        opensearch_client: OpenSearch,
+        mocker: MockerFixture,
+    ):
+        get_dataset_sample_mock.return_value = Sample(columns=[], rows=[])
+        mocker.patch.object(AsyncDatasetRepository, "create", side_effect=ConnectionError("create failed"))
+
+        with pytest.raises(ConnectionError):
+            await test_client.post(
+                "/api/v1/datasets/",
+                json={
+                    "datasource_id": DATASOURCES["postgres"].key,
+                    "datasource_name": DATASOURCES["postgres"].datasource_name,
+                    "database": DATASOURCES["postgres"].database,
+                    "dataset_name": "postgres_table_users",
+                    "runtime_parameters": {"schema": "users"},
+                },
+            )
+
+        assert opensearch_client.count(index=settings.DATASET_SAMPLE_INDEX)["count"] == 0
+
+    @pytest.mark.user
+    async def test_read_your_writes(
+        self,
+        get_dataset_sample_mock: MagicMock,
+        test_client: httpx.AsyncClient,
+        opensearch_client: OpenSearch,
+        mocker: MockerFixture,
+    ):
+        get_dataset_sample_mock.return_value = Sample(columns=[], rows=[])
+        refresh = mocker.patch.object(FakeIndicesClient, "refresh")
+
+        response = await test_client.post(
+            "/api/v1/datasets/",
+            json={
+                "datasource_id": DATASOURCES["postgres"].key,
+                "datasource_name": DATASOURCES["postgres"].datasource_name,
+                "database": DATASOURCES["postgres"].database,
+                "dataset_name": "postgres_table_users",
+                "runtime_parameters": {"schema": "users"},
+            },
+        )
+        token = response.headers["X-Consistency-Token"]
+
+        await test_client.get("/api/v1/datasets/")
+        refresh.assert_not_called()
+
+        response = await test_client.get("/api/v1/datasets/", headers={"X-Consistency-Token": token})
+        refresh.assert_called_once_with(index=settings.DATASET_INDEX)
+        assert "postgres_table_users" in [dataset["dataset_name"] for dataset in response.json()]
+
 
 @pytest.mark.asyncio
 class TestUpdateDataset:
@@ -312,6 +445,10 @@ class TestUpdateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "schema.postgres_table_products",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "products"},
             },
         )
@@ -327,6 +464,10 @@ class TestUpdateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "schema.postgres_table_products",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "products"},
             },
         )
@@ -357,8 +498,8 @@ class TestUpdateDataset:
 
     @pytest.mark.user
     async def test_allowed(
-        self, test_client: httpx.AsyncClient, dataset_repository: DatasetRepository, mock_sa_connection,
-        sample_columns_and_rows
+        self, test_client: httpx.AsyncClient, dataset_repository: DatasetRepository, opensearch_client: OpenSearch,
+        mock_sa_connection, sample_columns_and_rows
     ):
         response = await test_client.put(
             f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}",
@@ -367,6 +508,10 @@ class TestUpdateDataset:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "schema.updated_name",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
             },
         )
 
@@ -375,8 +520,12 @@ class TestUpdateDataset:
         updated_dataset = dataset_repository.get(
             DATASETS["postgres_table_products"].key
         )
+        sample = DatasetSampleRepository(opensearch_client).get(DATASETS["postgres_table_products"].key)
 
         assert updated_dataset.dataset_name == "schema.updated_name"
+        assert updated_dataset.sample is None
+        # The sample of the renamed table is stored apart from the dataset.
+        assert sample.columns[0] == "o_orderkey"
         assert (
             updated_dataset.create_date == DATASETS["postgres_table_products"].create_date
         )
@@ -431,6 +580,10 @@ class TestCreateSample:
                 "datasource_name": "not_existing_datasource",
                 "database": "postgres",
                 "dataset_name": "postgres_table",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "products"},
             },
         )
@@ -450,6 +603,10 @@ class TestCreateSample:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "schema.postgres_table_users",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
             },
         )
 
@@ -471,6 +628,10 @@ class TestCreateSample:
                 "datasource_name": DATASOURCES["postgres"].datasource_name,
                 "database": DATASOURCES["postgres"].database,
                 "dataset_name": "postgres_table_users",
+                "validation_mode": "full",
+                "watermark_column": None,
+                "full_validation_interval": 24,
+                "sample_fraction": None,
                 "runtime_parameters": {"schema": "users"},
             },
         )
@@ -534,6 +695,7 @@ class TestUpdateSample:
         self,
         test_client: httpx.AsyncClient,
         dataset_repository: DatasetRepository,
+        opensearch_client: OpenSearch,
         mock_sa_connection,
         sample_columns_and_rows
     ):
@@ -549,8 +711,9 @@ class TestUpdateSample:
         updated_dataset = dataset_repository.get(
             DATASETS["postgres_table_products"].key
         )
+        sample = DatasetSampleRepository(opensearch_client).get(DATASETS["postgres_table_products"].key)
 
-        assert updated_dataset.sample == Sample(
+        assert Sample(columns=sample.columns, rows=sample.rows) == Sample(
             columns=['o_orderkey', 'o_custkey', 'o_orderstatus', 'o_totalprice', 'o_orderdate', 'o_orderpriority',
                      'o_clerk', 'o_shippriority', 'o_comment'],
             rows=[
@@ -593,6 +756,7 @@ class TestUpdateSample:
         self,
         test_client: httpx.AsyncClient,
         dataset_repository: DatasetRepository,
+        opensearch_client: OpenSearch,
         mock_sa_connection,
         sample_columns_and_rows
     ):
@@ -608,7 +772,8 @@ class TestUpdateSample:
         updated_dataset = dataset_repository.get(
             DATASETS["postgres_view_orders"].key
         )
-        assert updated_dataset.sample == Sample(
+        sample = DatasetSampleRepository(opensearch_client).get(DATASETS["postgres_view_orders"].key)
+        assert Sample(columns=sample.columns, rows=sample.rows) == Sample(
             columns=['o_orderkey', 'o_custkey', 'o_orderstatus', 'o_totalprice', 'o_orderdate', 'o_orderpriority',
                      'o_clerk', 'o_shippriority', 'o_comment'],
             rows=[
@@ -646,6 +811,71 @@ class TestUpdateSample:
             != DATASETS["postgres_view_orders"].modified_date
         )
 
+    @pytest.mark.user
+    async def test_sample_cache(
+        self,
+        test_client: httpx.AsyncClient,
+        mock_sa_connection,
+        sample_columns_and_rows
+    ):
+        url = f"/api/v1/datasets/{DATASETS['postgres_view_orders'].key}/sample"
+
+        response = await test_client.put(url, json={})
+        assert response.headers["X-Sample-Cache"] == "miss"
+
+        response = await test_client.put(url, json={})
+        assert response.headers["X-Sample-Cache"] == "hit"
+        assert int(response.headers["Age"]) >= 0
+        assert sample_columns_and_rows.call_count == 1
+
+        response = await test_client.put(url, params={"use_cache": False}, json={})
+        assert response.headers["X-Sample-Cache"] == "miss"
+        assert sample_columns_and_rows.call_count == 2
+
+
+@pytest.mark.asyncio
+class TestGetSample:
+    async def test_unauthorized(self, test_client: httpx.AsyncClient):
+        response = await test_client.get(f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/sample")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.user
+    async def test_not_existing(self, test_client: httpx.AsyncClient):
+        response = await test_client.get(f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/sample")
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.mark.user
+    async def test_allowed(self, test_client: httpx.AsyncClient, opensearch_client: OpenSearch):
+        dataset = DATASETS["postgres_table_products"]
+        DatasetSampleRepository(opensearch_client).save(dataset, Sample(columns=["id"], rows=[{"id": 1}]))
+
+        response = await test_client.get(f"/api/v1/datasets/{dataset.key}/sample")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"columns": ["id"], "rows": [{"id": 1}]}
+
+
+@pytest.mark.asyncio
+class TestListDatasetColumns:
+    @pytest.mark.user
+    async def test_physical_table(self, test_client: httpx.AsyncClient, mocker: MockerFixture):
+        get_columns_mock = mocker.patch(
+            "app.core.introspection.get_columns", return_value=[{"name": "o_orderkey", "type": "NUMERIC"}],
+        )
+
+        response = await test_client.get(
+            f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/columns",
+            params={"refresh": True},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [{"name": "o_orderkey", "type": "NUMERIC"}]
+        schema, table, _ = DATASETS["postgres_table_products"].get_resource_names()
+        assert get_columns_mock.call_args.args[1:] == (schema, table)
+        assert get_columns_mock.call_args.kwargs == {"refresh": True}
+
 
 @pytest.mark.asyncio
 class TestValidateDataset:
@@ -666,16 +896,24 @@ class TestValidateDataset:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     @pytest.mark.user
-    async def test_allowed(self, celery_delay_mock, runner_mock: MagicMock, test_client: httpx.AsyncClient):
-        mock_task_id = celery_delay_mock.return_value.id
+    async def test_allowed(self, celery_apply_async_mock, runner_mock: MagicMock, test_client: httpx.AsyncClient):
+        mock_task_id = celery_apply_async_mock.return_value.id
+        session = ConsistencySession()
+        session.written(settings.EXPECTATION_INDEX)
         response = await test_client.post(
             f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/validate",
             json={},
+            headers={ConsistencySession.header: session.token()},
         )
 
         assert response.status_code == status.HTTP_200_OK
         json = response.json()
         assert json == {'task_id': mock_task_id}
+        # Ahead of scheduled validations, reading the expectations the client wrote.
+        celery_apply_async_mock.assert_called_once_with(
+            kwargs={"dataset_id": DATASETS['postgres_table_products'].key, "consistency_token": session.token()},
+            queue=settings.TASK_QUEUE_INTERACTIVE,
+        )
 
 
 @pytest.mark.asyncio
@@ -710,6 +948,22 @@ class TestCreateSuggestions:
         json = response.json()
         assert json == {'task_id': mock_task_id}
 
+    @pytest.mark.user
+    async def test_column_filters(
+        self, celery_delay_mock, runner_mock: MagicMock, test_client: httpx.AsyncClient
+    ):
+        response = await test_client.post(
+            f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/suggest",
+            json={"include_columns": ["id", "name"], "exclude_columns": ["name"]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        celery_delay_mock.assert_called_once_with(
+            dataset_id=DATASETS['postgres_table_products'].key,
+            include_columns=["id", "name"],
+            exclude_columns=["name"],
+        )
+
 
 def _get_columns_and_rows_return_values():
     return (
@@ -809,3 +1063,27 @@ class TestGetTasksByDatasetId:
                 'task_id': 'a9cadbea-3676-44b0-be2b-26ea60267f50',
             }
         ]
+
+    @pytest.mark.user
+    async def test_paginated(self, test_client: httpx.AsyncClient, opensearch_client: OpenSearch):
+        stored = CELERY_TASKS["postgres_table_products"]
+        repository = TaskRepository(opensearch_client)
+        for task_id, hours in (("recent", 0.5), ("older", 2), ("expired", 24 * 8)):
+            result = stored.result.copy(update={"task_id": task_id})
+            repository.create(f"celery-task-meta-{task_id}", Task(result=result, timestamp=stored_ago(hours)))
+        url = f"/api/v1/datasets/{DATASETS['postgres_table_products'].key}/tasks"
+
+        response = await test_client.get(url, params={"limit": 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [task["task_id"] for task in response.json()] == ["recent", stored.result.task_id]
+
+        response = await test_client.get(url, params={"limit": 2, "cursor": response.headers["X-Next-Cursor"]})
+
+        assert [task["task_id"] for task in response.json()] == ["older"]
+        assert "X-Next-Cursor" not in response.headers
+
+        since = datetime.datetime.utcnow() - datetime.timedelta(minutes=90)
+        response = await test_client.get(url, params={"since": since.isoformat()})
+
+        assert [task["task_id"] for task in response.json()] == ["recent", stored.result.task_id]
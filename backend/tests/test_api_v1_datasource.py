@@ -6,6 +6,8 @@ from pytest_mock import MockerFixture
 import requests
 
 from app import constants as c
+from app.core.engines import EngineRegistry
+from app.repositories.dataset import DatasetRepository
 from app.repositories.datasource import DatasourceRepository
 from tests.data import DATASOURCES
 
@@ -67,20 +69,6 @@ class TestListDatasources:
         json = response.json()
         print(json)
         assert json == [
-            {
-                "create_date": "2022-10-04 13:37:00.000000+00:00",
-                "modified_date": "2022-10-04 13:37:00.000000+00:00",
-                "key": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
-                "engine": "PostgreSQL",
-                "datasource_name": "postgres",
-                "description": None,
-                "created_by": "admin@email.com",
-                "username": "postgres",
-                "password": "*****",
-                "database": "postgres",
-                "host": "postgres",
-                "port": 5432,
-            },
             {
                 "create_date": "2022-10-04 13:37:00.000000+00:00",
                 "modified_date": "2022-10-04 13:37:00.000000+00:00",
@@ -95,6 +83,20 @@ class TestListDatasources:
                 "host": "mysql",
                 "port": 3306,
             },
+            {
+                "create_date": "2022-10-04 13:37:00.000000+00:00",
+                "modified_date": "2022-10-04 13:37:00.000000+00:00",
+                "key": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
+                "engine": "PostgreSQL",
+                "datasource_name": "postgres",
+                "description": None,
+                "created_by": "admin@email.com",
+                "username": "postgres",
+                "password": "*****",
+                "database": "postgres",
+                "host": "postgres",
+                "port": 5432,
+            },
         ]
 
 
@@ -166,6 +168,30 @@ class TestCreateDatasource:
         json = response.json()
         assert json["detail"] == "datasource 'postgres' already exists"
 
+    @pytest.mark.user
+    async def test_tested_connection_not_pooled(self, mocker: MockerFixture, test_client: httpx.AsyncClient):
+        registry = EngineRegistry(pool_size=1, max_overflow=0, pool_timeout=5, pool_recycle=60, pool_pre_ping=False)
+        mocker.patch("app.api.api_v1.endpoints.datasource.engine_registry", registry)
+        create_engine = mocker.patch("app.core.engines.sa.create_engine")
+
+        response = await test_client.post(
+            "/api/v1/datasources?test=true",
+            json={
+                "engine": "PostgreSQL",
+                "datasource_name": "postgres",
+                "username": "postgres",
+                "password": "postgres",
+                "database": "postgres",
+                "host": "postgres",
+                "port": 5432,
+            },
+        )
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        create_engine.return_value.dispose.assert_called_once()
+        # No pool is left registered for the datasource that was not created.
+        assert registry.stats() == []
+
     @pytest.mark.user
     async def test_allowed(self, test_client: httpx.AsyncClient):
         response = await test_client.post(
@@ -311,13 +337,18 @@ class TestDeleteDatasource:
         assert response.status_code == status.HTTP_404_NOT_FOUND
 
     @pytest.mark.user
-    async def test_allowed(self, mocker: MockerFixture, test_client: httpx.AsyncClient):
+    async def test_allowed(self, mocker: MockerFixture, test_client: httpx.AsyncClient, opensearch_client: OpenSearch):
         # Mock requests.delete request
         # This shall be removed when we delete the schedules without an HTTP request to our own API
         mocker.patch.object(requests, "delete", return_value=None)
+        delay = mocker.patch("celery.app.task.Task.delay")
+        delay.return_value.id = "a9cadbea-3676-44b0-be2b-26ea60267f50"
 
         response = await test_client.delete(
             f"/api/v1/datasources/{DATASOURCES['postgres'].key}"
         )
 
-        assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.json() == {"task_id": "a9cadbea-3676-44b0-be2b-26ea60267f50"}
+        delay.assert_called_once_with(datasource_id=DATASOURCES["postgres"].key)
+        assert DatasetRepository(opensearch_client).query({"query": {"match": {"datasource_id": DATASOURCES["postgres"].key}}}) == []
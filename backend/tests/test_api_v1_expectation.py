@@ -3,10 +3,18 @@ import httpx
 import pytest
 from fastapi import status
 from opensearchpy import OpenSearch
+from pytest_mock import MockerFixture
+from app.main import app
+from app.models.validation import ExpectationResult
 from app.repositories.base import NotFoundError
 
 from app.repositories.expectation import ExpectationRepository
+from app.repositories.expectation_result import (
+    AsyncExpectationResultRepository,
+    get_async_expectation_result_repository,
+)
 from tests.data import DATASETS, DATASOURCES, EXPECTATIONS
+from tests.fake_opensearch import AsyncFakeOpenSearch
 
 
 @pytest.fixture
@@ -67,13 +75,13 @@ class TestListExpectations:
             {
                 "create_date": "2022-10-04 13:37:00.000000+00:00",
                 "modified_date": "2022-10-04 13:37:00.000000+00:00",
-                "key": "0815f53c-a3da-42e5-b010-560d9486830e",
-                "dataset_id": "5b65eae9-600e-4933-9bad-78477e0ab98e",
+                "key": "2292afa9-01bf-4f5a-9398-e5ed5a9f7995",
+                "dataset_id": "4b252091-6d0d-4beb-9552-3764cfe8cbae",
                 "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
                 "expectation_type": "expect_column_to_exist",
                 "result_type": "expectation",
                 "kwargs": {
-                    "column": "product_name",
+                    "column": "order_name",
                     "column_index": None,
                     "result_format": "SUMMARY",
                     "include_config": True,
@@ -83,18 +91,18 @@ class TestListExpectations:
                 "suggested": False,
                 "meta": None,
                 "validations": [],
-                "documentation": 'Expect column "product_name" to exist.',
+                "documentation": 'Expect column "order_name" to exist.',
             },
             {
                 "create_date": "2022-10-04 13:37:00.000000+00:00",
                 "modified_date": "2022-10-04 13:37:00.000000+00:00",
-                "key": "2292afa9-01bf-4f5a-9398-e5ed5a9f7995",
-                "dataset_id": "4b252091-6d0d-4beb-9552-3764cfe8cbae",
+                "key": "0815f53c-a3da-42e5-b010-560d9486830e",
+                "dataset_id": "5b65eae9-600e-4933-9bad-78477e0ab98e",
                 "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
                 "expectation_type": "expect_column_to_exist",
                 "result_type": "expectation",
                 "kwargs": {
-                    "column": "order_name",
+                    "column": "product_name",
                     "column_index": None,
                     "result_format": "SUMMARY",
                     "include_config": True,
@@ -104,7 +112,7 @@ class TestListExpectations:
                 "suggested": False,
                 "meta": None,
                 "validations": [],
-                "documentation": 'Expect column "order_name" to exist.',
+                "documentation": 'Expect column "product_name" to exist.',
             },
             {
                 "create_date": "2022-10-04 13:37:00.000000+00:00",
@@ -167,6 +175,36 @@ class TestListExpectations:
         assert len(json) == nb_results
 
 
+    @pytest.mark.user
+    async def test_include_history(
+        self, mocker: MockerFixture, opensearch_client: OpenSearch, test_client: httpx.AsyncClient
+    ):
+        expectation = EXPECTATIONS["postgres_table_products_expect_column_to_exist"]
+        result = ExpectationResult(
+            key="validation",
+            expectation_id=expectation.key,
+            dataset_id=expectation.dataset_id,
+            datasource_id=expectation.datasource_id,
+            run_time="2022-10-11 09:10:44.330614+00:00",
+            success=True,
+            observed_value=12,
+        )
+        repository = AsyncExpectationResultRepository(AsyncFakeOpenSearch(opensearch_client))
+        # FakeOpenSearch is not able to handle aggregations, so we fake them
+        history = mocker.patch.object(repository, "history", return_value={expectation.key: [result]})
+        app.dependency_overrides[get_async_expectation_result_repository] = lambda: repository
+
+        response = await test_client.get(
+            "/api/v1/expectations/",
+            params={"dataset_id": expectation.dataset_id, "include_history": True, "history_limit": 5},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert history.call_args.kwargs == {"size": 5}
+        assert set(history.call_args.args[0]) == {expectation.key}
+        assert [item["validations"] for item in response.json()] == [[result.history()]]
+
+
 @pytest.mark.asyncio
 class TestGetExpectation:
     async def test_unauthorized(self, test_client: httpx.AsyncClient):
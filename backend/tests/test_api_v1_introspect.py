@@ -0,0 +1,42 @@
+import json
+
+import httpx
+import pytest
+from fastapi import status
+from pytest_mock import MockerFixture
+
+from tests.data import DATASOURCES
+
+
+@pytest.mark.asyncio
+class TestListSchemaColumns:
+    async def test_unauthorized(self, test_client: httpx.AsyncClient):
+        response = await test_client.get(
+            "/api/v1/introspect/schema/columns",
+            params={"datasource_id": DATASOURCES["postgres"].key, "schema": "public"},
+        )
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.user
+    async def test_ndjson(self, test_client: httpx.AsyncClient, mocker: MockerFixture):
+        stream_mock = mocker.patch(
+            "app.core.introspection.stream_schema_columns",
+            return_value=iter([
+                ("customers", [{"name": "name", "type": "text"}]),
+                ("orders", [{"name": "id", "type": "integer"}]),
+            ]),
+        )
+
+        response = await test_client.get(
+            "/api/v1/introspect/schema/columns",
+            params={"datasource_id": DATASOURCES["postgres"].key, "schema": "public"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert [json.loads(line) for line in response.text.splitlines()] == [
+            {"table": "customers", "columns": [{"name": "name", "type": "text"}]},
+            {"table": "orders", "columns": [{"name": "id", "type": "integer"}]},
+        ]
+        assert stream_mock.call_args.args[1] == "public"
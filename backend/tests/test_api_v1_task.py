@@ -1,9 +1,14 @@
+import json
 from unittest.mock import patch
 
 import httpx
 import pytest
 from fastapi import status
+from kombu import Connection
+from pytest_mock import MockerFixture
 
+from app.settings import settings
+from app.worker.app import celery_app
 from tests.data import CELERY_TASKS
 from tests.fake_opensearch import FakeOpenSearch
 import app.db.client
@@ -83,3 +88,57 @@ class TestGetTask:
             'status': 'FAILURE',
             'task_id': 'a9cadbea-3676-44b0-be2b-26ea60267f50',
         }
+
+    @pytest.mark.user
+    async def test_progress_task(self, test_client: httpx.AsyncClient, opensearch_client: FakeOpenSearch):
+        progress = {
+            "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
+            "total": 100,
+            "deleted": 40,
+            "indices": {"validations": {"total": 100, "deleted": 40, "completed": False}},
+        }
+        opensearch_client.index(
+            index="celery",
+            id="celery-task-meta-progress-task-id",
+            body={"result": {
+                "task_id": "progress-task-id",
+                "status": "PROGRESS",
+                "result": json.dumps(progress),
+                "name": "datasource.delete_documents",
+            }},
+        )
+
+        response = await test_client.get("/api/v1/tasks/progress-task-id")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["status"] == "PROGRESS"
+        assert response.json()["result"] == progress
+
+
+@pytest.mark.asyncio
+class TestGetQueues:
+    async def test_unauthorized(self, test_client: httpx.AsyncClient):
+        response = await test_client.get("/api/v1/tasks/queues")
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    @pytest.mark.user
+    async def test_queues(self, test_client: httpx.AsyncClient, mocker: MockerFixture):
+        mocker.patch.object(celery_app, "connection_for_read", lambda: Connection("memory://"))
+        with Connection("memory://") as connection:
+            producer = connection.Producer()
+            for _ in range(2):
+                producer.publish({}, routing_key=settings.TASK_QUEUE_INTERACTIVE, declare=[
+                    celery_app.amqp.queues[settings.TASK_QUEUE_INTERACTIVE]
+                ])
+
+            response = await test_client.get("/api/v1/tasks/queues")
+
+            assert response.status_code == status.HTTP_200_OK
+            assert response.json() == [
+                {"name": settings.TASK_QUEUE_INTERACTIVE, "messages": 2},
+                {"name": settings.TASK_QUEUE_SCHEDULED, "messages": 0},
+                {"name": celery_app.conf.task_default_queue, "messages": 0},
+                {"name": settings.TASK_QUEUE_SUGGESTIONS, "messages": 0},
+            ]
+            connection.default_channel.queue_purge(settings.TASK_QUEUE_INTERACTIVE)
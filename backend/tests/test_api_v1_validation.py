@@ -5,52 +5,21 @@ from opensearchpy import OpenSearch
 from pytest_mock import MockerFixture
 
 from app.main import app
-from app.repositories.validation import ValidationRepository, get_validation_repository
-from tests.data import DATASETS, DATASOURCES, VALIDATIONS
+from app.repositories.base import Page
+from app.repositories.validation import AsyncValidationRepository, get_async_validation_repository
+from tests.data import DATASETS, DATASOURCES, RUN_TIME, VALIDATIONS
+from tests.fake_opensearch import AsyncFakeOpenSearch
 
 
 @pytest.fixture(autouse=True)
 def validation_repository(mocker: MockerFixture, opensearch_client: OpenSearch):
-    repository = ValidationRepository(opensearch_client)
+    repository = AsyncValidationRepository(AsyncFakeOpenSearch(opensearch_client))
 
     # FakeOpenSearch is not able to handle complex queries, so we fake them
     mocker.patch.object(
-        repository, "query_by_filter", return_value=list(VALIDATIONS.values())
-    )
-    mocker.patch.object(
-        repository,
-        "statistics",
-        return_value={
-            "aggregations": {
-                "31_day": {
-                    "success_counts": {"value": 90},
-                    "doc_count_error_upper_bound": 0,
-                    "sum_other_doc_count": 0,
-                    "buckets": [],
-                },
-                "7_day": {
-                    "success_counts": {"value": 90},
-                    "doc_count_error_upper_bound": 0,
-                    "sum_other_doc_count": 0,
-                    "buckets": [],
-                },
-                "1_day": {
-                    "success_counts": {"value": 90},
-                    "doc_count_error_upper_bound": 0,
-                    "sum_other_doc_count": 0,
-                    "buckets": [],
-                },
-                "validation_counts": {
-                    "success_counts": {"value": 90},
-                    "doc_count_error_upper_bound": 0,
-                    "sum_other_doc_count": 0,
-                    "buckets": [],
-                },
-            }
-        },
+        repository, "query_by_filter", return_value=Page(VALIDATIONS.values())
     )
-
-    app.dependency_overrides[get_validation_repository] = lambda: repository
+    app.dependency_overrides[get_async_validation_repository] = lambda: repository
 
     return repository
 
@@ -88,7 +57,7 @@ class TestListValidations:
                     "great_expectations_version": "1.0.0",
                     "expectation_suite_name": "expectation_suite_name",
                     "run_id": {
-                        "run_time": "run_time",
+                        "run_time": RUN_TIME,
                         "run_name": "run_name",
                     },
                     "batch_spec": {},
@@ -103,6 +72,8 @@ class TestListValidations:
                     "checkpoint_name": None,
                     "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
                     "dataset_id": "5b65eae9-600e-4933-9bad-78477e0ab98e",
+                    "watermark": None,
+                    "sampling": None,
                 },
                 "statistics": {
                     "evaluated_expectations": 100,
@@ -119,7 +90,7 @@ class TestListValidations:
                     "great_expectations_version": "1.0.0",
                     "expectation_suite_name": "expectation_suite_name",
                     "run_id": {
-                        "run_time": "run_time",
+                        "run_time": RUN_TIME,
                         "run_name": "run_name",
                     },
                     "batch_spec": {},
@@ -134,6 +105,8 @@ class TestListValidations:
                     "checkpoint_name": None,
                     "datasource_id": "50a58a0b-89e8-4d6f-8b65-6ea328b2cad2",
                     "dataset_id": "4b252091-6d0d-4beb-9552-3764cfe8cbae",
+                    "watermark": None,
+                    "sampling": None,
                 },
                 "statistics": {
                     "evaluated_expectations": 100,
@@ -150,7 +123,7 @@ class TestListValidations:
                     "great_expectations_version": "1.0.0",
                     "expectation_suite_name": "expectation_suite_name",
                     "run_id": {
-                        "run_time": "run_time",
+                        "run_time": RUN_TIME,
                         "run_name": "run_name",
                     },
                     "batch_spec": {},
@@ -165,6 +138,8 @@ class TestListValidations:
                     "checkpoint_name": None,
                     "datasource_id": "dd19ce80-e020-4a63-9f52-9d0950558df6",
                     "dataset_id": "5b6adc59-d92d-4b75-9d7e-7e1e6f4392a7",
+                    "watermark": None,
+                    "sampling": None,
                 },
                 "statistics": {
                     "evaluated_expectations": 100,
@@ -200,3 +175,6 @@ class TestListStatistics:
         )
 
         assert response.status_code == status.HTTP_200_OK
+        json = response.json()
+        assert json["1_day_avg"] == json["7_day_avg"] == json["31_day_avg"] == 0.1
+        assert len(json["validations"]) == 1
@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.core.cascade import CascadeDeleteError, cascade_delete, datasource_deletes
+from tests.data import DATASOURCES
+
+DATASOURCE_ID = DATASOURCES["postgres"].key
+
+
+def _task(total: int, deleted: int, completed: bool, **kwargs) -> dict:
+    return {"completed": completed, "task": {"status": {"total": total, "deleted": deleted}}, **kwargs}
+
+
+@pytest.fixture
+def client() -> MagicMock:
+    client = MagicMock()
+    client.delete_by_query.side_effect = lambda index, **kwargs: {"task": f"node:{index}"}
+    return client
+
+
+class TestCascadeDelete:
+    def test_deletes_in_background(self, client: MagicMock):
+        tasks = {
+            "node:validations": iter([_task(100, 40, False), _task(100, 100, True, response={"failures": []})]),
+        }
+        client.tasks.get.side_effect = lambda task_id: next(tasks[task_id], None) if task_id in tasks else _task(
+            1, 1, True, response={"failures": []}
+        )
+        progress = []
+        sleep = MagicMock()
+
+        result = cascade_delete(
+            client,
+            datasource_deletes(client, DATASOURCE_ID),
+            requests_per_second=500,
+            poll_interval=1,
+            on_progress=progress.append,
+            sleep=sleep,
+        )
+
+        indices = [call.kwargs["index"] for call in client.delete_by_query.call_args_list]
+        assert indices == ["validations", "expectation_results", "dataset_rollups", "expectations", "dataset_samples"]
+        for call in client.delete_by_query.call_args_list:
+            assert call.kwargs["wait_for_completion"] is False
+            assert call.kwargs["slices"] == "auto"
+            assert call.kwargs["requests_per_second"] == 500
+        assert progress[0]["indices"]["validations"] == {"total": 100, "deleted": 40, "completed": False}
+        assert progress[0]["deleted"] == 44
+        assert result["total"] == result["deleted"] == 104
+        # Completed deletes are not polled again.
+        assert client.tasks.get.call_count == 6
+        sleep.assert_called_once_with(1)
+
+    def test_failures(self, client: MagicMock):
+        client.tasks.get.side_effect = lambda task_id: _task(
+            1, 0, True, response={"failures": [{"cause": "version conflict"}] if task_id == "node:expectations" else []}
+        )
+
+        with pytest.raises(CascadeDeleteError) as e:
+            cascade_delete(client, datasource_deletes(client, DATASOURCE_ID), sleep=MagicMock())
+
+        assert list(e.value.failures) == ["expectations"]
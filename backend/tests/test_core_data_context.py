@@ -0,0 +1,69 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.core.data_context import DataContextCache
+
+
+@pytest.fixture
+def base_data_context(mocker: MockerFixture) -> MagicMock:
+    return mocker.patch("app.core.data_context.BaseDataContext", side_effect=lambda **_: MagicMock())
+
+
+def _checkout(cache: DataContextCache, key: str, connection_string: str = "postgresql://", **kwargs):
+    fingerprint = cache.fingerprint("datasource", connection_string)
+    with cache.checkout(key, fingerprint, MagicMock(), **kwargs) as entry:
+        return entry
+
+
+class TestDataContextCache:
+    def test_reuses_context(self, base_data_context: MagicMock):
+        cache = DataContextCache(maxsize=2)
+
+        first = _checkout(cache, "a")
+        second = _checkout(cache, "a")
+
+        assert first is second
+        assert base_data_context.call_count == 1
+
+    def test_rebuilds_stale_context(self, base_data_context: MagicMock):
+        cache = DataContextCache(maxsize=2)
+
+        first = _checkout(cache, "a", "postgresql://old")
+        second = _checkout(cache, "a", "postgresql://new")
+
+        assert first is not second
+        assert len(cache) == 1
+        first.context.datasources.values.assert_called()
+
+    def test_lru_eviction(self, base_data_context: MagicMock):
+        cache = DataContextCache(maxsize=2)
+
+        a = _checkout(cache, "a")
+        _checkout(cache, "b")
+        _checkout(cache, "a")
+        _checkout(cache, "c")
+
+        assert len(cache) == 2
+        assert _checkout(cache, "a") is a
+        assert base_data_context.call_count == 3
+
+    def test_invalidate(self, base_data_context: MagicMock):
+        cache = DataContextCache(maxsize=4)
+
+        _checkout(cache, "a")
+        _checkout(cache, "a", scope="schema")
+        _checkout(cache, "b")
+        cache.invalidate("a")
+
+        assert len(cache) == 1
+
+    def test_disabled(self, base_data_context: MagicMock):
+        cache = DataContextCache(maxsize=0)
+
+        first = _checkout(cache, "a")
+        second = _checkout(cache, "a")
+
+        assert first is not second
+        assert len(cache) == 0
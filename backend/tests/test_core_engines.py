@@ -0,0 +1,62 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.engines import EngineRegistry
+
+
+@pytest.fixture
+def registry() -> EngineRegistry:
+    registry = EngineRegistry(pool_size=2, max_overflow=1, pool_timeout=5, pool_recycle=60, pool_pre_ping=True)
+    yield registry
+    registry.dispose_all()
+
+
+def _datasource(tmp_path, key="datasource", name="warehouse.db"):
+    url = f"sqlite:///{tmp_path / name}"
+    return SimpleNamespace(key=key, connection_string=lambda: url)
+
+
+class TestEngineRegistry:
+    def test_reuses_engine(self, tmp_path, registry: EngineRegistry):
+        datasource = _datasource(tmp_path)
+
+        assert registry.get_engine(datasource) is registry.get_engine(datasource)
+
+    def test_replaces_engine_when_connection_string_changes(self, tmp_path, registry: EngineRegistry):
+        engine = registry.get_engine(_datasource(tmp_path))
+        new_engine = registry.get_engine(_datasource(tmp_path, name="other.db"))
+
+        assert engine is not new_engine
+        assert len(registry.stats()) == 1
+
+    def test_connect_records_stats(self, tmp_path, registry: EngineRegistry):
+        datasource = _datasource(tmp_path)
+
+        for _ in range(3):
+            with registry.connect(datasource) as connection:
+                assert connection.execute("select 1").scalar() == 1
+
+        [stats] = registry.stats(datasource_key="datasource")
+        assert stats["pool_size"] == 2
+        assert stats["checked_out"] == 0
+        assert stats["checked_in"] == 1
+        assert stats["connects"] == 1
+        assert stats["checkouts"] == 3
+
+    def test_invalidate(self, tmp_path, registry: EngineRegistry):
+        registry.get_engine(_datasource(tmp_path))
+        registry.invalidate("datasource")
+
+        assert registry.stats() == []
+
+    def test_connect_without_registering(self, tmp_path, registry: EngineRegistry):
+        engine = registry.get_engine(_datasource(tmp_path))
+
+        with registry.connect(_datasource(tmp_path, name="other.db"), register=False) as connection:
+            assert connection.execute("select 1").scalar() == 1
+
+        # The pool in use is kept, no pool is registered for the tested settings.
+        assert registry.get_engine(_datasource(tmp_path)) is engine
+        assert len(registry.stats()) == 1
+        assert registry.stats()[0]["connects"] == 0
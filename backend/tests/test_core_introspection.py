@@ -0,0 +1,135 @@
+import sqlite3
+import threading
+from types import SimpleNamespace
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy.dialects import postgresql
+
+from app.core.introspection import (
+    MetadataCache,
+    iter_schema_columns,
+    list_columns,
+    list_tables,
+    schema_columns_query,
+)
+from app.models.datasource import Engine
+
+
+@pytest.fixture
+def connection(tmp_path):
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as con:
+        con.execute("CREATE TABLE events (id INTEGER, loaded_at TEXT)")
+        con.execute("CREATE VIEW recent_events AS SELECT * FROM events")
+
+    engine = sa.create_engine(f"sqlite:///{database}")
+    with engine.connect() as connection:
+        yield connection
+    engine.dispose()
+
+
+def _datasource(connection_string: str = "sqlite://") -> SimpleNamespace:
+    return SimpleNamespace(key="datasource", connection_string=lambda: connection_string)
+
+
+class TestIntrospection:
+    def test_list_tables(self, connection):
+        assert list_tables(connection, Engine.POSTGRESQL, "main") == [("events", "table"), ("recent_events", "view")]
+
+    def test_list_columns(self, connection):
+        assert list_columns(connection, "main", "events") == [
+            {"name": "id", "type": "INTEGER"},
+            {"name": "loaded_at", "type": "TEXT"},
+        ]
+
+    def test_schema_columns_with_inspector(self, connection):
+        assert list(iter_schema_columns(connection, "main")) == [
+            ("events", [{"name": "id", "type": "INTEGER"}, {"name": "loaded_at", "type": "TEXT"}]),
+            ("recent_events", [{"name": "id", "type": "INTEGER"}, {"name": "loaded_at", "type": "TEXT"}]),
+        ]
+
+    def test_schema_columns_in_one_statement(self, connection, mocker):
+        connection.execute("ATTACH ':memory:' AS information_schema")
+        connection.execute(
+            "CREATE TABLE information_schema.columns "
+            "(table_schema TEXT, table_name TEXT, column_name TEXT, data_type TEXT, ordinal_position INTEGER)"
+        )
+        connection.execute(
+            "INSERT INTO information_schema.columns VALUES "
+            "('main', 'orders', 'total', 'numeric', 2), ('main', 'orders', 'id', 'integer', 1), "
+            "('main', 'customers', 'name', 'text', 1), ('other', 'orders', 'id', 'integer', 1)"
+        )
+        mocker.patch("app.core.introspection.INFORMATION_SCHEMA_DIALECTS", ("sqlite",))
+        statements = []
+        sa.event.listen(connection, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+        assert list(iter_schema_columns(connection, "main")) == [
+            ("customers", [{"name": "name", "type": "text"}]),
+            ("orders", [{"name": "id", "type": "integer"}, {"name": "total", "type": "numeric"}]),
+        ]
+        assert len(statements) == 1
+
+    def test_schema_columns_query(self):
+        query = schema_columns_query(postgresql.dialect(), "public")
+        assert "from information_schema.columns where table_schema = :schema" in str(query)
+
+        snowflake = SimpleNamespace(name="snowflake")
+        assert "upper(table_schema) = upper(:schema)" in str(schema_columns_query(snowflake, "public"))
+
+        bigquery = SimpleNamespace(name="bigquery")
+        assert "from `sales.INFORMATION_SCHEMA.COLUMNS`" in str(schema_columns_query(bigquery, "sales"))
+        with pytest.raises(ValueError):
+            schema_columns_query(bigquery, "sales`; drop table x; --")
+
+
+class TestMetadataCache:
+    def test_cached_until_refresh(self):
+        cache = MetadataCache(ttl=60, max_stale=600)
+        loads = iter([["public"], ["public", "sales"]])
+
+        assert cache.get(_datasource(), ("schemas",), lambda: next(loads)) == ["public"]
+        assert cache.get(_datasource(), ("schemas",), lambda: next(loads)) == ["public"]
+        assert cache.get(_datasource(), ("schemas",), lambda: next(loads), refresh=True) == ["public", "sales"]
+
+    def test_stale_entry_is_refreshed_in_background(self):
+        now = 0.0
+        cache = MetadataCache(ttl=60, max_stale=600, clock=lambda: now)
+        refreshed = threading.Event()
+
+        def load_new():
+            refreshed.set()
+            return ["public", "sales"]
+
+        cache.get(_datasource(), ("schemas",), lambda: ["public"])
+        now = 120.0
+
+        assert cache.get(_datasource(), ("schemas",), load_new) == ["public"]
+        assert refreshed.wait(5)
+        cache._executor.shutdown(wait=True)
+        assert cache.get(_datasource(), ("schemas",), lambda: ["other"]) == ["public", "sales"]
+
+    def test_expired_entry_is_reloaded(self):
+        now = 0.0
+        cache = MetadataCache(ttl=60, max_stale=600, clock=lambda: now)
+
+        cache.get(_datasource(), ("schemas",), lambda: ["public"])
+        now = 601.0
+
+        assert cache.get(_datasource(), ("schemas",), lambda: ["sales"]) == ["sales"]
+
+    def test_credentials_changed(self):
+        cache = MetadataCache(ttl=60, max_stale=600)
+
+        cache.get(_datasource("postgresql://a"), ("schemas",), lambda: ["public"])
+
+        assert cache.get(_datasource("postgresql://b"), ("schemas",), lambda: ["sales"]) == ["sales"]
+
+    def test_invalidate(self):
+        cache = MetadataCache(ttl=60, max_stale=600)
+        cache.get(_datasource(), ("schemas",), lambda: ["public"])
+
+        cache.invalidate("datasource")
+
+        assert len(cache) == 0
@@ -0,0 +1,73 @@
+import threading
+import time
+
+from app.core.profiling import (
+    TABLE_EXPECTATIONS,
+    DatasourceSlots,
+    chunk_columns,
+    profile_in_chunks,
+    select_columns,
+)
+
+COLUMNS = ["a", "b", "c", "d", "e"]
+
+
+class TestProfiling:
+    def test_select_columns(self):
+        assert select_columns(COLUMNS) == COLUMNS
+        assert select_columns(COLUMNS, include_columns=["d", "a"]) == ["a", "d"]
+        assert select_columns(COLUMNS, exclude_columns=["b"]) == ["a", "c", "d", "e"]
+        assert select_columns(COLUMNS, include_columns=["a", "b"], exclude_columns=["b"]) == ["a"]
+
+    def test_chunk_columns(self):
+        assert chunk_columns(COLUMNS, 2) == [["a", "b"], ["c", "d"], ["e"]]
+        assert chunk_columns([], 2) == [[]]
+
+    def test_profile_in_chunks_merges_in_order(self):
+        calls = []
+
+        def profile_chunk(ignored_columns, excluded_expectations, slot):
+            profiled = [column for column in COLUMNS if column not in ignored_columns]
+            calls.append((profiled, excluded_expectations))
+            table = [] if excluded_expectations else [{"expectation_type": "expect_table_row_count_to_be_between"}]
+            # Finish out of order to check results are merged in chunk order.
+            time.sleep(0.01 * (len(COLUMNS) - len(calls)))
+            return table + [{"expectation_type": "expect_column_to_exist", "column": c} for c in profiled]
+
+        expectations = profile_in_chunks(
+            "datasource", COLUMNS, ["a", "b", "d"], profile_chunk, chunk_size=2, slots=DatasourceSlots(2),
+        )
+
+        assert [e.get("column") for e in expectations] == [None, "a", "b", "d"]
+        assert sorted(calls) == [(["a", "b"], []), (["d"], TABLE_EXPECTATIONS)]
+
+    def test_concurrency_is_bounded_per_datasource(self):
+        running = 0
+        max_running = 0
+        lock = threading.Lock()
+
+        def profile_chunk(ignored_columns, excluded_expectations, slot):
+            nonlocal running, max_running
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return []
+
+        slots = DatasourceSlots(2)
+        threads = [
+            threading.Thread(
+                target=profile_in_chunks,
+                args=("datasource", COLUMNS, COLUMNS, profile_chunk),
+                kwargs={"chunk_size": 1, "slots": slots},
+            )
+            for _ in range(2)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert max_running == 2
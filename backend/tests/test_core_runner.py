@@ -0,0 +1,147 @@
+import sqlite3
+from types import SimpleNamespace
+from typing import Optional
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from app.core.engines import EngineRegistry
+from app.core.runner import Runner, create_dataset_suggestions, get_next_watermark
+from app.models.dataset import Dataset, RuntimeParameters, ValidationMode
+from app.models.datasource import Engine
+from app.models.validation import Watermark
+
+
+@pytest.fixture
+def datasource(tmp_path, mocker: MockerFixture) -> SimpleNamespace:
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as con:
+        con.execute("CREATE TABLE events (id INTEGER, loaded_at TEXT)")
+        con.executemany(
+            "INSERT INTO events VALUES (?, ?)",
+            [(i, f"2022-10-{i:02d} 00:00:00") for i in range(1, 11)],
+        )
+
+    registry = EngineRegistry(pool_size=1, max_overflow=0, pool_timeout=5, pool_recycle=60, pool_pre_ping=False)
+    mocker.patch("app.core.runner.engine_registry", registry)
+    yield SimpleNamespace(
+        key="datasource",
+        datasource_name="warehouse",
+        engine=Engine.POSTGRESQL,
+        connection_string=lambda *_: f"sqlite:///{database}",
+    )
+    registry.dispose_all()
+
+
+def _dataset(watermark_column: str = "id", **kwargs) -> Dataset:
+    return Dataset(
+        key="dataset",
+        datasource_id="datasource",
+        datasource_name="warehouse",
+        database="warehouse",
+        dataset_name="main.events",
+        engine=Engine.POSTGRESQL,
+        created_by="admin@email.com",
+        validation_mode=ValidationMode.INCREMENTAL,
+        watermark_column=watermark_column,
+        **kwargs,
+    )
+
+
+def _repository(previous: Optional[Watermark], recent_full_validation: bool = True) -> MagicMock:
+    repository = MagicMock()
+    repository.get_last_watermark.return_value = previous
+    repository.has_full_validation_since.return_value = recent_full_validation
+    return repository
+
+
+class TestWatermark:
+    def test_incremental_requires_watermark_column(self):
+        with pytest.raises(ValueError):
+            _dataset(watermark_column=None)
+
+    def test_first_run_is_full(self, datasource):
+        watermark = get_next_watermark(_dataset(), datasource, _repository(None))
+
+        assert watermark.mode == ValidationMode.FULL
+        assert watermark.low is None
+        assert watermark.high == "10"
+        assert watermark.numeric
+
+    def test_incremental_run_starts_at_previous_high(self, datasource):
+        previous = Watermark(column="id", mode=ValidationMode.FULL, high="7", numeric=True)
+
+        watermark = get_next_watermark(_dataset(), datasource, _repository(previous))
+
+        assert watermark.mode == ValidationMode.INCREMENTAL
+        assert watermark.low == "7"
+        assert watermark.high == "10"
+
+    def test_full_run_fallback(self, datasource):
+        previous = Watermark(column="id", mode=ValidationMode.INCREMENTAL, low="5", high="7", numeric=True)
+
+        watermark = get_next_watermark(_dataset(), datasource, _repository(previous, recent_full_validation=False))
+
+        assert watermark.mode == ValidationMode.FULL
+
+    def test_watermark_column_changed(self, datasource):
+        previous = Watermark(column="id", mode=ValidationMode.FULL, high="7", numeric=True)
+
+        watermark = get_next_watermark(_dataset("loaded_at"), datasource, _repository(previous))
+
+        assert watermark.mode == ValidationMode.FULL
+        assert watermark.high == "2022-10-10 00:00:00"
+        assert not watermark.numeric
+
+    @pytest.mark.parametrize("watermark, expected", [
+        (Watermark(column="id", mode=ValidationMode.INCREMENTAL, low="7", high="10", numeric=True), [8, 9, 10]),
+        (
+            Watermark(
+                column="loaded_at",
+                mode=ValidationMode.INCREMENTAL,
+                low="2022-10-08 00:00:00",
+                high="2022-10-09 00:00:00",
+            ),
+            [9],
+        ),
+    ])
+    def test_incremental_query(self, datasource, watermark: Watermark, expected: list[int]):
+        runner = Runner(datasource=datasource, batch=_dataset(watermark.column), meta={}, watermark=watermark)
+
+        runtime_parameters = runner._get_runtime_parameters()
+
+        assert runtime_parameters.schema_name == "main"
+        with sqlite3.connect(datasource.connection_string()[len("sqlite:///"):]) as con:
+            rows = con.execute(f"SELECT id FROM ({runtime_parameters.query}) ORDER BY id").fetchall()
+        assert [row[0] for row in rows] == expected
+
+    def test_full_run_validates_dataset(self, datasource):
+        watermark = Watermark(column="id", mode=ValidationMode.FULL, high="10", numeric=True)
+        runner = Runner(datasource=datasource, batch=_dataset(), meta={}, watermark=watermark)
+
+        assert runner._get_runtime_parameters() is None
+
+
+class TestSuggestions:
+    @pytest.fixture
+    def profile_in_chunks(self, mocker: MockerFixture) -> MagicMock:
+        mocker.patch("app.core.runner.DatasourceRepository").return_value.get.return_value = MagicMock(key="datasource")
+        mocker.patch("app.core.runner.get_dataset_columns", return_value=[f"column_{i}" for i in range(30)])
+        mocker.patch("app.core.runner.settings.PROFILING_COLUMNS_PER_CHUNK", 10)
+        return mocker.patch("app.core.runner.profile_in_chunks", return_value=[])
+
+    def _suggest(self, mocker: MockerFixture, dataset: Dataset):
+        mocker.patch("app.core.runner.DatasetRepository").return_value.get.return_value = dataset
+        create_dataset_suggestions(dataset.key, client=MagicMock())
+
+    def test_table_profiled_in_chunks(self, profile_in_chunks: MagicMock, mocker: MockerFixture):
+        self._suggest(mocker, _dataset())
+
+        assert profile_in_chunks.call_args.kwargs["chunk_size"] == 10
+
+    def test_query_profiled_in_single_chunk(self, profile_in_chunks: MagicMock, mocker: MockerFixture):
+        runtime_parameters = RuntimeParameters(schema="main", query="SELECT * FROM events")
+        self._suggest(mocker, _dataset(runtime_parameters=runtime_parameters))
+
+        assert profile_in_chunks.call_args.kwargs["chunk_size"] == 30
@@ -0,0 +1,95 @@
+import datetime
+import math
+import uuid
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+
+from app.core.sample import SampleCache, rows_to_records, to_json_safe
+from app.models.dataset import Sample
+
+
+class TestRowsToRecords:
+    def test_converts_by_column_type(self):
+        columns = ["id", "created_at", "day", "price", "ratio", "payload", "ref"]
+        ref = uuid.UUID("12345678-1234-5678-1234-567812345678")
+        rows = [
+            (1, datetime.datetime(2022, 10, 1, 12, 30), datetime.date(2022, 10, 1), Decimal("9.95"), 0.5, b"abc", ref),
+            (2, None, None, Decimal("10"), math.nan, b"\xff\x00", None),
+        ]
+
+        assert rows_to_records(columns, rows, key=True) == [
+            {
+                "key": 0, "id": 1, "created_at": "2022-10-01 12:30:00", "day": "2022-10-01", "price": 9.95,
+                "ratio": 0.5, "payload": "abc", "ref": str(ref),
+            },
+            {
+                "key": 1, "id": 2, "created_at": None, "day": None, "price": 10, "ratio": None,
+                "payload": "0xff00", "ref": None,
+            },
+        ]
+
+    def test_mixed_types_in_a_column(self):
+        rows = [("a",), (datetime.datetime(2022, 10, 1),), (Decimal("1.5"),), (None,)]
+
+        assert rows_to_records(["value"], rows) == [
+            {"value": "a"}, {"value": "2022-10-01 00:00:00"}, {"value": 1.5}, {"value": None},
+        ]
+
+    def test_short_rows(self):
+        assert rows_to_records(["a", "b"], [(1, 2), (3,)]) == [{"a": 1, "b": 2}, {"a": 3}]
+
+    def test_pandas_values(self):
+        head = pd.DataFrame({
+            "created_at": [pd.Timestamp("2022-10-01"), pd.NaT],
+            "amount": [1.5, np.nan],
+        })
+
+        rows = rows_to_records(list(head.columns), list(head.itertuples(index=False, name=None)))
+
+        assert rows == [
+            {"created_at": "2022-10-01 00:00:00", "amount": 1.5},
+            {"created_at": None, "amount": None},
+        ]
+        assert to_json_safe(np.int64(3)) == 3
+        assert type(to_json_safe(np.int64(3))) is int
+
+
+class TestSampleCache:
+    def test_normalized_query(self):
+        assert SampleCache.fingerprint("select *\n  from  orders;", "postgresql://") == (
+            SampleCache.fingerprint("select * from orders", "postgresql://")
+        )
+        assert SampleCache.fingerprint("select * from orders", "postgresql://") != (
+            SampleCache.fingerprint("select * from orders", "snowflake://")
+        )
+
+    def test_ttl_and_size(self):
+        now = 0.0
+        cache = SampleCache(maxsize=2, ttl=60, clock=lambda: now)
+        sample = Sample(columns=["a"], rows=[{"key": 0, "a": 1}])
+
+        cache.set("datasource", "q1", sample)
+        now = 30.0
+        assert cache.get("datasource", "q1").sample == sample
+        assert cache.age(cache.get("datasource", "q1")) == 30.0
+
+        cache.set("datasource", "q2", sample)
+        cache.set("datasource", "q3", sample)
+        assert cache.get("datasource", "q1") is None
+        assert len(cache) == 2
+
+        now = 91.0
+        assert cache.get("datasource", "q2") is None
+
+    def test_invalidate(self):
+        cache = SampleCache(maxsize=10, ttl=60)
+        sample = Sample(columns=[], rows=[])
+        cache.set("datasource", "q1", sample)
+        cache.set("other", "q1", sample)
+
+        cache.invalidate("datasource")
+
+        assert cache.get("datasource", "q1") is None
+        assert cache.get("other", "q1") is not None
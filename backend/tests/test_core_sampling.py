@@ -0,0 +1,88 @@
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql, postgresql
+
+from app.core.runner import get_dataset_selectable
+from app.core.sampling import (
+    SampleMethod,
+    get_sample_method,
+    sample_selectable,
+    success_percent_interval,
+    wilson_interval,
+)
+from app.models.dataset import Dataset
+from app.models.datasource import Engine
+
+
+def _dataset(**kwargs) -> Dataset:
+    return Dataset(**{
+        "key": "dataset",
+        "datasource_id": "datasource",
+        "datasource_name": "warehouse",
+        "database": "warehouse",
+        "dataset_name": "public.events",
+        "engine": Engine.POSTGRESQL,
+        "created_by": "admin@email.com",
+        **kwargs,
+    })
+
+
+def _compile(dataset: Dataset, engine: Engine, dialect) -> str:
+    source = sample_selectable(get_dataset_selectable(dataset), dataset, engine, dialect, 0.1)
+    query = sa.select([sa.text("*")]).select_from(source)
+    return " ".join(str(query.compile(dialect=dialect, compile_kwargs={"literal_binds": True})).split())
+
+
+def _result(success: bool, unexpected_count: int = None, element_count: int = 1000, mostly: float = None) -> dict:
+    result = {}
+    if unexpected_count is not None:
+        result = {"element_count": element_count, "missing_count": 0, "unexpected_count": unexpected_count}
+    return {
+        "success": success,
+        "result": result,
+        "exception_info": {"raised_exception": False},
+        "expectation_config": {"kwargs": {"mostly": mostly} if mostly else {}},
+    }
+
+
+class TestSampling:
+    def test_tablesample_for_physical_tables(self):
+        assert get_sample_method(_dataset(), Engine.POSTGRESQL) == SampleMethod.TABLESAMPLE
+        assert _compile(_dataset(), Engine.POSTGRESQL, postgresql.dialect()) == (
+            "SELECT * FROM (SELECT * FROM public.events TABLESAMPLE SYSTEM (10.0)) AS swiple_sample"
+        )
+
+    def test_random_predicate_without_tablesample(self):
+        assert get_sample_method(_dataset(), Engine.MYSQL) == SampleMethod.RANDOM
+        assert "WHERE rand() < 0.1" in _compile(_dataset(), Engine.MYSQL, mysql.dialect())
+
+    def test_random_predicate_for_virtual_datasets(self):
+        dataset = _dataset(
+            dataset_name="recent_events",
+            runtime_parameters={"schema": "public", "query": "select * from public.events"},
+        )
+
+        assert get_sample_method(dataset, Engine.POSTGRESQL) == SampleMethod.RANDOM
+        assert "WHERE random() < 0.1" in _compile(dataset, Engine.POSTGRESQL, postgresql.dialect())
+
+    def test_wilson_interval(self):
+        low, high = wilson_interval(50, 1000, 1.96)
+
+        assert low == pytest.approx(0.0381, abs=1e-4)
+        assert high == pytest.approx(0.0653, abs=1e-4)
+        assert wilson_interval(0, 0, 1.96) == (0.0, 1.0)
+
+    def test_success_percent_interval(self):
+        results = [
+            # Aggregate expectation, counted as observed.
+            _result(True),
+            # Clearly passes: at most 10% unexpected allowed, ~1% observed.
+            _result(True, unexpected_count=10, mostly=0.9),
+            # Borderline: 10% observed, the interval straddles the threshold.
+            _result(True, unexpected_count=100, mostly=0.9),
+            # Clearly fails.
+            _result(False, unexpected_count=500, mostly=0.9),
+        ]
+
+        assert success_percent_interval(results, 0.95) == (50.0, 75.0)
+        assert success_percent_interval([], 0.95) is None
@@ -0,0 +1,129 @@
+import sqlite3
+
+import pytest
+from great_expectations.core import ExpectationConfiguration, ExpectationSuite
+from great_expectations.core.batch import BatchRequest
+from great_expectations.data_context import BaseDataContext
+from great_expectations.data_context.types.base import (
+    AnonymizedUsageStatisticsConfig,
+    DataContextConfig,
+    InMemoryStoreBackendDefaults,
+)
+from pytest_mock import MockerFixture
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.validator import AggregatePushdownValidator, get_validator
+
+
+@pytest.fixture
+def context(tmp_path) -> BaseDataContext:
+    database = tmp_path / "warehouse.db"
+    with sqlite3.connect(database) as con:
+        con.execute("CREATE TABLE t (a INTEGER, b REAL)")
+        con.executemany(
+            "INSERT INTO t VALUES (?, ?)",
+            [(i, None if i % 7 == 0 else i * 1.5) for i in range(100)],
+        )
+
+    return BaseDataContext(project_config=DataContextConfig(
+        datasources={
+            "warehouse": {
+                "class_name": "Datasource",
+                "execution_engine": {
+                    "class_name": "SqlAlchemyExecutionEngine",
+                    "connection_string": f"sqlite:///{database}",
+                },
+                "data_connectors": {
+                    "default_inferred_data_connector_name": {
+                        "class_name": "InferredAssetSqlDataConnector",
+                        "include_schema_name": True,
+                    },
+                },
+            }
+        },
+        store_backend_defaults=InMemoryStoreBackendDefaults(),
+        anonymous_usage_statistics=AnonymizedUsageStatisticsConfig(enabled=False),
+    ))
+
+
+def _suite() -> ExpectationSuite:
+    suite = ExpectationSuite(expectation_suite_name="default")
+    for column in ["a", "b"]:
+        for expectation_type, kwargs in [
+            ("expect_column_mean_to_be_between", {"min_value": 0, "max_value": 50}),
+            ("expect_column_min_to_be_between", {"min_value": 0}),
+            ("expect_column_max_to_be_between", {"max_value": 100}),
+            ("expect_column_sum_to_be_between", {"min_value": 1}),
+            ("expect_column_values_to_not_be_null", {}),
+        ]:
+            suite.add_expectation(ExpectationConfiguration(
+                expectation_type=expectation_type,
+                kwargs={"column": column, "result_format": "SUMMARY", **kwargs},
+            ))
+    return suite
+
+
+def _validate(context: BaseDataContext, pushdown: bool, mocker: MockerFixture) -> tuple[list, list[str]]:
+    mocker.patch("app.core.validator.settings.AGGREGATE_PUSHDOWN_ENABLED", pushdown)
+    batch_request = BatchRequest(
+        datasource_name="warehouse",
+        data_connector_name="default_inferred_data_connector_name",
+        data_asset_name="main.t",
+    )
+    validator = get_validator(context, batch_request, _suite())
+
+    statements = []
+
+    def log_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", log_statement)
+    try:
+        results = validator.validate(catch_exceptions=False).to_json_dict()["results"]
+    finally:
+        event.remove(Engine, "before_cursor_execute", log_statement)
+
+    results = sorted(
+        [(r["expectation_config"]["expectation_type"], r["expectation_config"]["kwargs"]["column"], r["result"])
+         for r in results],
+        key=str,
+    )
+    return results, [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+
+class TestAggregatePushdownValidator:
+    def test_results_match_default_validator(self, context: BaseDataContext, mocker: MockerFixture):
+        expected, default_statements = _validate(context, False, mocker)
+        results, pushdown_statements = _validate(context, True, mocker)
+
+        assert results == expected
+        assert len(pushdown_statements) < len(default_statements)
+
+    def test_single_aggregate_select(self, context: BaseDataContext, mocker: MockerFixture):
+        _, statements = _validate(context, True, mocker)
+
+        aggregate_statements = [s for s in statements if '"column.mean"' in s]
+        assert len(aggregate_statements) == 1
+        for metric in ["column.min", "column.max", "column.sum", "column_values.nonnull.unexpected_count"]:
+            assert f'"{metric}"' in aggregate_statements[0]
+
+    def test_skips_unexpected_values_when_none_expected(self, context: BaseDataContext, mocker: MockerFixture):
+        _, statements = _validate(context, True, mocker)
+
+        unexpected_values_statements = [s for s in statements if "unexpected_values" in s]
+        # "a" has no nulls, only "b" needs its unexpected values fetched.
+        assert len(unexpected_values_statements) == 1
+        assert "b IS NULL" in unexpected_values_statements[0]
+
+    def test_get_validator_disabled(self, context: BaseDataContext, mocker: MockerFixture):
+        mocker.patch("app.core.validator.settings.AGGREGATE_PUSHDOWN_ENABLED", False)
+        batch_request = BatchRequest(
+            datasource_name="warehouse",
+            data_connector_name="default_inferred_data_connector_name",
+            data_asset_name="main.t",
+        )
+
+        validator = get_validator(context, batch_request, _suite())
+
+        assert not isinstance(validator, AggregatePushdownValidator)
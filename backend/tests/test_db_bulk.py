@@ -0,0 +1,137 @@
+from unittest.mock import MagicMock
+
+import pytest
+from opensearchpy import ConnectionError, SerializationError
+
+from app.db.bulk import BulkWriteError, BulkWriter, Durability
+
+
+def _response(*statuses):
+    return {"items": [{"index": {"status": status, "error": None if status < 300 else "error"}} for status in statuses]}
+
+
+def _writer(client, **kwargs) -> BulkWriter:
+    return BulkWriter(client, **{"max_age": 60, "sleep": lambda seconds: None, **kwargs})
+
+
+class TestBulkWriter:
+    def test_buffered_writes_are_flushed_together(self):
+        client = MagicMock()
+        client.bulk.return_value = _response(201, 201)
+        writer = _writer(client)
+
+        first = writer.write("validations", "1", {"a": 1}, durability=Durability.BUFFERED)
+        second = writer.write("validations", "2", {"a": 2}, durability=Durability.BUFFERED)
+
+        client.bulk.assert_not_called()
+        assert len(writer) == 2
+
+        writer.close()
+
+        client.bulk.assert_called_once_with(
+            body=[
+                {"index": {"_index": "validations", "_id": "1"}}, {"a": 1},
+                {"index": {"_index": "validations", "_id": "2"}}, {"a": 2},
+            ],
+            refresh="false",
+            request_timeout=writer.request_timeout,
+        )
+        assert first.result()["status"] == second.result()["status"] == 201
+
+    def test_flushes_when_full(self):
+        client = MagicMock()
+        client.bulk.return_value = _response(201, 201)
+        writer = _writer(client, max_actions=2)
+
+        writer.write("validations", "1", {}, durability=Durability.BUFFERED)
+        writer.write("validations", "2", {}, durability=Durability.BUFFERED)
+
+        client.bulk.assert_called_once()
+        assert len(writer) == 0
+
+    def test_flushes_when_old(self):
+        client = MagicMock()
+        client.bulk.return_value = _response(201)
+        writer = _writer(client, max_age=0.01)
+
+        future = writer.write("validations", "1", {}, durability=Durability.BUFFERED)
+
+        assert future.result(timeout=5)["status"] == 201
+        writer.close()
+
+    def test_durability(self):
+        client = MagicMock()
+        client.bulk.return_value = _response(201)
+        writer = _writer(client)
+
+        writer.write("validations", "1", {}, durability=Durability.ACKNOWLEDGED)
+        assert client.bulk.call_args.kwargs["refresh"] == "false"
+
+        writer.write("validations", "2", {}, durability=Durability.REFRESHED)
+        assert client.bulk.call_args.kwargs["refresh"] == "wait_for"
+
+    def test_retries_failed_items(self):
+        client = MagicMock()
+        client.bulk.side_effect = [
+            ConnectionError("N/A", "connection refused", None),
+            _response(201, 429),
+            _response(201),
+        ]
+        sleeps = []
+        writer = _writer(client, sleep=sleeps.append, initial_backoff=1)
+
+        writer.write("validations", "1", {}, durability=Durability.BUFFERED)
+        writer.write("validations", "2", {}, durability=Durability.ACKNOWLEDGED)
+
+        assert client.bulk.call_count == 3
+        # Only the item that failed is written again.
+        assert client.bulk.call_args.kwargs["body"][0] == {"index": {"_index": "validations", "_id": "2"}}
+        assert sleeps == [1, 2]
+
+    def test_gives_up(self):
+        client = MagicMock()
+        client.bulk.side_effect = [_response(429), _response(429), _response(400)]
+        writer = _writer(client, max_retries=1)
+
+        with pytest.raises(BulkWriteError):
+            writer.write("validations", "1", {}, durability=Durability.ACKNOWLEDGED)
+        assert client.bulk.call_count == 2
+
+        with pytest.raises(BulkWriteError):
+            writer.write("validations", "2", {}, durability=Durability.ACKNOWLEDGED)
+        assert client.bulk.call_count == 3
+
+    def test_unexpected_error(self):
+        client = MagicMock()
+        client.bulk.side_effect = [SerializationError("not serializable"), _response(201)]
+        writer = _writer(client, max_actions=1)
+
+        first = writer.write("validations", "1", {}, durability=Durability.BUFFERED)
+        second = writer.write("validations", "2", {}, durability=Durability.BUFFERED)
+
+        # The unresolved documents of the batch are failed, later batches are still written.
+        with pytest.raises(BulkWriteError):
+            first.result(timeout=0)
+        assert second.result(timeout=0)["status"] == 201
+
+    def test_flush_failure_fails_remaining_chunks(self):
+        writer = _writer(MagicMock())
+        futures = [writer.write("validations", str(i), {}, durability=Durability.BUFFERED) for i in range(3)]
+        writer.max_actions = 1
+        # The first chunk is written, then writing the second raises.
+        writer._write = MagicMock(side_effect=[None, RuntimeError("bug")])
+        futures[0].set_result({"status": 201})
+
+        with pytest.raises(RuntimeError):
+            writer.flush()
+
+        for future in futures[1:]:
+            with pytest.raises(BulkWriteError):
+                future.result(timeout=0)
+
+    def test_closed(self):
+        writer = _writer(MagicMock())
+        writer.close()
+
+        with pytest.raises(RuntimeError):
+            writer.write("validations", "1", {})
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from openmock.fake_indices import FakeIndicesClient
+from opensearchpy import OpenSearch
+from pytest_mock import MockerFixture
+
+from app.db.partitions import TimePartitions
+from app.repositories.base import ConsistencySession
+from app.repositories.validation import ValidationRepository, get_validation_index, validation_partitions
+from tests.data import VALIDATIONS
+
+NOW = datetime(2022, 10, 15, 12, tzinfo=timezone.utc)
+
+
+class TestTimePartitions:
+    def test_partition(self):
+        assert TimePartitions("validations", "monthly").partition(NOW) == "validations-2022.10"
+        assert TimePartitions("validations", "daily").partition(NOW) == "validations-2022.10.15"
+        # Partitions are UTC
+        local = datetime(2022, 11, 1, 1, tzinfo=timezone(timedelta(hours=2)))
+        assert TimePartitions("validations", "monthly").partition(local) == "validations-2022.10"
+
+    def test_indices(self):
+        monthly = TimePartitions("validations", "monthly")
+        assert monthly.indices(NOW - timedelta(days=20), NOW) == ["validations-2022.09*", "validations-2022.10*"]
+        assert monthly.indices(NOW - timedelta(days=1), NOW) == ["validations-2022.10*"]
+
+        daily = TimePartitions("validations", "daily")
+        assert daily.indices(NOW - timedelta(days=1), NOW) == [
+            "validations-2022.10.14", "validations-2022.10.15", "validations-2022.10",
+        ]
+
+    def test_expired(self):
+        partitions = TimePartitions("validations", "monthly", retention_days=30)
+        names = ["validations-2022.08", "validations-2022.09", "validations-2022.09.14", "validations-2022.10", "other"]
+
+        assert partitions.expired(names, NOW) == ["validations-2022.08", "validations-2022.09.14"]
+        assert TimePartitions("validations", "monthly").expired(names, NOW) == []
+
+    def test_rollover(self):
+        client = MagicMock()
+        client.indices.get_alias.return_value = {
+            "validations-2022.09": {"aliases": {"validations": {"is_write_index": True}}},
+            "validations-2022.08": {"aliases": {"validations": {}}},
+            "validations-2022.07": {"aliases": {}},
+        }
+
+        TimePartitions("validations", "monthly").rollover(client, NOW)
+
+        created = [call.kwargs["index"] for call in client.indices.create.call_args_list]
+        assert created == ["validations-2022.10", "validations-2022.11"]
+        assert client.indices.update_aliases.call_args.kwargs["body"]["actions"] == [
+            {"add": {"index": "validations-2022.10", "alias": "validations", "is_write_index": True}},
+            {"add": {"index": "validations-2022.09", "alias": "validations", "is_write_index": False}},
+            {"add": {"index": "validations-2022.07", "alias": "validations", "is_write_index": False}},
+        ]
+
+    def test_delete_expired(self):
+        client = MagicMock()
+        client.indices.get_alias.return_value = {"validations-2022.08": {}, "validations-2022.10": {}}
+
+        deleted = TimePartitions("validations", "monthly", retention_days=1).delete_expired(client, NOW)
+
+        assert deleted == ["validations-2022.08"]
+        client.indices.delete.assert_called_once_with(index="validations-2022.08", ignore=404)
+
+
+class TestPartitionedValidations:
+    def test_validation_index(self):
+        assert get_validation_index("2022-10-11 09:10:44.330614+00:00") == validation_partitions.partition(
+            datetime(2022, 10, 11, tzinfo=timezone.utc)
+        )
+
+    def test_unparsable_run_time(self):
+        with pytest.raises(ValueError):
+            get_validation_index("run_time")
+
+    def test_since_reads_recent_partitions(self, opensearch_client: OpenSearch):
+        validation = VALIDATIONS["postgres_table_products"]
+        now = datetime.now(timezone.utc)
+        opensearch_client.index(index=validation_partitions.partition(now), id="recent", body=validation.dict())
+        opensearch_client.index(index=validation_partitions.partition(now - timedelta(days=400)), id="old", body={})
+
+        repository = ValidationRepository(opensearch_client).since(timedelta(days=1))
+
+        assert repository.query({"query": {"match_all": {}}}) == [validation]
+        assert repository.search_options == {"ignore_unavailable": True}
+        # The repository itself still reads every partition through the alias.
+        assert ValidationRepository(opensearch_client).index == "validations"
+
+    def test_since_reads_your_writes(self, opensearch_client: OpenSearch, mocker: MockerFixture):
+        refresh = mocker.patch.object(FakeIndicesClient, "refresh")
+        validation = VALIDATIONS["postgres_table_products"]
+
+        writer = ConsistencySession()
+        ValidationRepository(opensearch_client, session=writer).create("recent", validation)
+
+        repository = ValidationRepository(opensearch_client, session=ConsistencySession(writer.token()))
+        recent = repository.since(timedelta(days=1))
+        recent.query({"query": {"match_all": {}}})
+        refresh.assert_called_once_with(index=recent.index, ignore_unavailable=True)
@@ -0,0 +1,63 @@
+import json
+from datetime import datetime
+
+import pytest
+from opensearchpy.serializer import JSONSerializer
+from pydantic import ValidationError
+
+from app.models.dataset import Dataset, ValidationMode
+from app.models.datasource import DatasourceInput
+from app.models.expectation import ExpectationInput
+from app.models.schedule import IntervalTrigger
+from app.models.trusted import trusted_parser
+from app.models.types import EncryptedStr
+from app.repositories.datasource import DatasourceRepository
+from app.repositories.expectation import ExpectationRepository
+from tests.data import DATASETS, DATASOURCES, EXPECTATIONS
+
+
+def _stored(document: dict) -> dict:
+    """The document as read back from OpenSearch."""
+    return json.loads(JSONSerializer().dumps(document))
+
+
+class TestTrustedParser:
+    @pytest.mark.parametrize("expectation", EXPECTATIONS.values(), ids=EXPECTATIONS.keys())
+    def test_expectations(self, expectation):
+        document = _stored(ExpectationRepository(None)._get_dict_from_object(expectation))
+        # kwargs are stored as JSON, and parsed by a pre validator.
+        assert isinstance(document["kwargs"], str)
+
+        parsed = trusted_parser(ExpectationInput)(dict(document))
+
+        assert type(parsed) is type(expectation)
+        assert type(parsed.kwargs) is type(expectation.kwargs)
+        assert parsed == ExpectationInput.parse_obj(dict(document)).__root__
+
+    @pytest.mark.parametrize("datasource", DATASOURCES.values(), ids=DATASOURCES.keys())
+    def test_datasources_are_not_decrypted(self, datasource, mocker):
+        document = _stored(DatasourceRepository(None)._get_dict_from_object(datasource))
+        decrypt = mocker.patch("app.core.security.decrypt_password")
+
+        parsed = trusted_parser(DatasourceInput)(document)
+
+        decrypt.assert_not_called()
+        assert type(parsed) is type(datasource)
+        assert isinstance(parsed.password, EncryptedStr)
+        assert str.__str__(parsed.password) == str.__str__(datasource.password)
+
+    def test_defaults_and_enums(self):
+        document = _stored(DATASETS["postgres_view_orders"].dict(by_alias=True, exclude={"validation_mode", "sample"}))
+
+        parsed = trusted_parser(Dataset)(document)
+
+        assert parsed.validation_mode is ValidationMode.FULL
+        assert parsed.runtime_parameters.schema_name == DATASETS["postgres_view_orders"].runtime_parameters.schema_name
+        assert parsed == DATASETS["postgres_view_orders"]
+
+    def test_other_types_are_validated(self):
+        parsed = trusted_parser(IntervalTrigger)({"trigger": "interval", "minutes": 5, "start_date": "2022-10-11T09:10:44"})
+
+        assert parsed.start_date == datetime(2022, 10, 11, 9, 10, 44)
+        with pytest.raises(ValidationError):
+            trusted_parser(IntervalTrigger)({"trigger": "interval", "minutes": 5, "start_date": "not a date"})
@@ -0,0 +1,200 @@
+import pytest
+from openmock.fake_indices import FakeIndicesClient
+from opensearchpy import OpenSearch
+
+from app.repositories.base import Consistency, ConsistencySession, InvalidCursorError, NotFoundError
+from app.repositories.dataset import AsyncDatasetRepository, DatasetRepository
+from app.repositories.expectation import ExpectationRepository
+from tests.data import DATASETS, EXPECTATIONS
+from tests.fake_opensearch import AsyncFakeOpenSearch
+
+QUERY = {"query": {"match_all": {}}, "sort": [{"dataset_name": "asc"}]}
+
+
+@pytest.fixture
+def repository(opensearch_client: OpenSearch):
+    return DatasetRepository(opensearch_client)
+
+
+@pytest.fixture
+def async_repository(opensearch_client: OpenSearch):
+    return AsyncDatasetRepository(AsyncFakeOpenSearch(opensearch_client))
+
+
+class TestPagination:
+    def test_query_page(self, repository: DatasetRepository, opensearch_client):
+        first = repository.query_page(QUERY, limit=2)
+        second = repository.query_page(QUERY, limit=2, cursor=first.next_cursor)
+
+        expected = sorted(dataset.dataset_name for dataset in DATASETS.values())
+        assert [dataset.dataset_name for dataset in first] == expected[:2]
+        assert [dataset.dataset_name for dataset in second] == expected[2:]
+        assert first.next_cursor is not None
+        assert second.next_cursor is None
+        # The point in time opened for the second page is closed with the last page.
+        assert opensearch_client.points_in_time == {}
+
+    def test_single_page_does_not_open_point_in_time(self, repository: DatasetRepository, mocker):
+        create_point_in_time = mocker.spy(repository.client, "create_point_in_time")
+
+        page = repository.query_page(QUERY, limit=len(DATASETS))
+
+        assert len(page) == len(DATASETS)
+        assert page.next_cursor is None
+        create_point_in_time.assert_not_called()
+
+    def test_tiebreaker(self, repository: DatasetRepository, mocker):
+        search = mocker.patch.object(repository.client, "search", wraps=repository.client.search)
+
+        repository.query_page(QUERY, limit=1)
+
+        # Doc values fields rather than _id, whose fielddata is loaded on the heap.
+        assert search.call_args.kwargs["body"]["sort"] == [
+            {"dataset_name": "asc"}, "datasource_id", "dataset_name.keyword"
+        ]
+
+    def test_tiebreaker_source_key(self, opensearch_client: OpenSearch):
+        repository = ExpectationRepository(opensearch_client)
+        # Suggestions of a run are created in the same millisecond, for the same dataset and type.
+        expectation = next(iter(EXPECTATIONS.values()))
+        repository.bulk_create([expectation.copy(update={"key": f"suggestion-{i}"}) for i in range(5)])
+
+        expectations = list(repository.scan({"query": {"match_all": {}}}, batch_size=2))
+
+        assert sorted(expectation.key for expectation in expectations) == sorted(
+            [*(expectation.key for expectation in EXPECTATIONS.values()), *(f"suggestion-{i}" for i in range(5))]
+        )
+        assert opensearch_client.get(index=repository.index, id="suggestion-0")["_source"]["key"] == "suggestion-0"
+
+    def test_scan(self, repository: DatasetRepository):
+        datasets = list(repository.scan(QUERY, batch_size=1))
+
+        assert sorted(dataset.key for dataset in datasets) == sorted(dataset.key for dataset in DATASETS.values())
+
+    def test_invalid_cursor(self, repository: DatasetRepository):
+        cursor = repository.query_page(QUERY, limit=1).next_cursor
+
+        with pytest.raises(InvalidCursorError):
+            repository.query_page(QUERY, limit=1, cursor="not a cursor")
+        with pytest.raises(InvalidCursorError):
+            repository.query_page({"query": {"match_all": {}}}, limit=1, cursor=cursor)
+
+
+class TestProjection:
+    def test_query(self, repository: DatasetRepository):
+        datasets = repository.query(QUERY, source_includes=["dataset_name"])
+
+        assert [dataset.dataset_name for dataset in datasets] == sorted(d.dataset_name for d in DATASETS.values())
+        assert all(dataset.__fields_set__ == {"key", "dataset_name"} for dataset in datasets)
+
+    def test_get_bypasses_cache(self, repository: DatasetRepository):
+        dataset = next(iter(DATASETS.values()))
+        full = repository.get(dataset.key)
+
+        projected = repository.get(dataset.key, source_excludes=["runtime_parameters", "description"])
+
+        assert projected.dataset_name == dataset.dataset_name
+        assert "description" not in projected.__fields_set__
+        assert repository.get(dataset.key) == full
+
+
+@pytest.mark.asyncio
+class TestAsyncRepository:
+    async def test_get_create_update_delete(self, async_repository: AsyncDatasetRepository):
+        dataset = next(iter(DATASETS.values()))
+        created = await async_repository.create("copy", dataset.copy(update={"key": "copy"}))
+
+        assert created.key == "copy"
+        assert (await async_repository.get("copy")).dataset_name == dataset.dataset_name
+
+        updated = await async_repository.update("copy", created, {"description": "renamed"})
+
+        assert updated.description == "renamed"
+        assert updated.modified_date is not None
+
+        projected = await async_repository.get("copy", source_includes=["description"])
+        assert projected.description == "renamed"
+
+        await async_repository.delete("copy")
+        with pytest.raises(NotFoundError):
+            await async_repository.get("copy")
+
+    async def test_paginate(self, async_repository: AsyncDatasetRepository, opensearch_client):
+        first = await async_repository.paginate(QUERY, limit=2)
+        second = await async_repository.paginate(QUERY, limit=2, cursor=first.next_cursor)
+        everything = await async_repository.paginate(QUERY)
+
+        expected = sorted(dataset.dataset_name for dataset in DATASETS.values())
+        assert [dataset.dataset_name for dataset in first] == expected[:2]
+        assert [dataset.dataset_name for dataset in second] == expected[2:]
+        assert [dataset.dataset_name for dataset in everything] == expected
+        assert opensearch_client.points_in_time == {}
+
+    async def test_shares_queries_with_sync_repository(
+        self,
+        async_repository: AsyncDatasetRepository,
+        repository: DatasetRepository,
+    ):
+        dataset = next(iter(DATASETS.values()))
+        schema, name, _ = dataset.get_resource_names()
+        kwargs = dict(
+            datasource_name=dataset.datasource_name,
+            schema=schema,
+            name=name,
+            virtual_name=dataset.dataset_name,
+        )
+
+        assert await async_repository.query_by_resource_name(**kwargs) == repository.query_by_resource_name(**kwargs)
+        assert await async_repository.count(QUERY) == repository.count(QUERY) == len(DATASETS)
+
+
+class TestConsistency:
+    def test_refresh_per_repository_and_call(self, opensearch_client, mocker):
+        index = mocker.patch.object(opensearch_client, "index", wraps=opensearch_client.index)
+        dataset = next(iter(DATASETS.values()))
+
+        DatasetRepository(opensearch_client).create(dataset.key, dataset)
+        assert index.call_args.kwargs["refresh"] == "false"
+
+        repository = DatasetRepository(opensearch_client, consistency=Consistency.WAIT_FOR)
+        repository.create(dataset.key, dataset)
+        assert index.call_args.kwargs["refresh"] == "wait_for"
+
+        repository.create(dataset.key, dataset, consistency=Consistency.IMMEDIATE)
+        assert index.call_args.kwargs["refresh"] == "true"
+
+    def test_read_your_writes(self, opensearch_client, mocker):
+        refresh = mocker.patch.object(FakeIndicesClient, "refresh")
+        dataset = next(iter(DATASETS.values()))
+
+        writer = ConsistencySession()
+        DatasetRepository(opensearch_client, session=writer).create(dataset.key, dataset)
+
+        # Another client does not wait for the write.
+        DatasetRepository(opensearch_client, session=ConsistencySession()).query(QUERY)
+        refresh.assert_not_called()
+
+        # The writer refreshes the index once before searching it.
+        repository = DatasetRepository(opensearch_client, session=ConsistencySession(writer.token()))
+        repository.count(QUERY)
+        repository.query(QUERY)
+        refresh.assert_called_once_with(index=repository.index)
+
+    def test_token_expires_after_refresh_interval(self):
+        now = 1000.0
+        session = ConsistencySession(refresh_interval=1, clock=lambda: now)
+        session.written("datasets")
+
+        assert ConsistencySession(session.token(), clock=lambda: now + 0.5).needs_refresh("datasets")
+        assert not ConsistencySession(session.token(), clock=lambda: now + 1).needs_refresh("datasets")
+        assert not ConsistencySession("not a token").needs_refresh("datasets")
+
+    def test_token_from_the_future(self):
+        now = 1000.0
+        token = ConsistencySession(clock=lambda: now + 3600)
+        token.written("datasets")
+
+        session = ConsistencySession(token.token(), refresh_interval=1, clock=lambda: now)
+
+        assert not session.needs_refresh("datasets")
+        assert session.writes == {}
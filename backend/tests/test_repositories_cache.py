@@ -0,0 +1,106 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+from opensearchpy import OpenSearch
+from pytest_mock import MockerFixture
+
+from app.repositories.cache import DocumentCache, document_cache
+from app.repositories.datasource import AsyncDatasourceRepository, DatasourceRepository
+from tests.data import DATASOURCES
+from tests.fake_opensearch import AsyncFakeOpenSearch
+
+DATASOURCE = DATASOURCES["postgres"]
+
+
+class TestDocumentCache:
+    def test_lru(self):
+        cache = DocumentCache(maxsize=2, ttl=60)
+        cache.set("index", "a", DATASOURCE)
+        cache.set("index", "b", DATASOURCE)
+        cache.get("index", "a")
+        cache.set("index", "c", DATASOURCE)
+
+        assert cache.get("index", "b") is None
+        assert cache.get("index", "a") == DATASOURCE
+        assert cache.stats() == {
+            "size": 2, "maxsize": 2, "hits": 2, "misses": 1, "evictions": 1, "invalidations": 0,
+        }
+
+    def test_ttl(self):
+        now = 0
+        cache = DocumentCache(maxsize=2, ttl=60, clock=lambda: now)
+        cache.set("index", "a", DATASOURCE)
+
+        now = 61
+        assert cache.get("index", "a") is None
+        assert len(cache) == 0
+
+    def test_returns_copies(self):
+        cache = DocumentCache(maxsize=2, ttl=60)
+        cache.set("index", "a", DATASOURCE)
+
+        cache.get("index", "a").datasource_name = "changed"
+
+        assert cache.get("index", "a").datasource_name == DATASOURCE.datasource_name
+
+    def test_invalidate(self):
+        cache = DocumentCache(maxsize=4, ttl=60)
+        cache.set("index", "a", DATASOURCE)
+        cache.set("index", "b", DATASOURCE)
+        cache.set("other", "a", DATASOURCE)
+
+        cache.invalidate("index", "a")
+        assert len(cache) == 2
+        cache.invalidate("index")
+        assert len(cache) == 1
+
+    def test_read_before_invalidation_is_not_cached(self):
+        cache = DocumentCache(maxsize=4, ttl=60)
+        generation = cache.generation
+        cache.invalidate("index", "a")
+
+        cache.set("index", "a", DATASOURCE, generation=generation)
+
+        assert len(cache) == 0
+
+    def test_redis_invalidations(self, mocker: MockerFixture):
+        redis = MagicMock()
+        mocker.patch("redis.Redis.from_url", return_value=redis)
+        cache = DocumentCache(maxsize=4, ttl=60, redis_url="redis://redis:6379/2")
+        # Subscribes on first use.
+        cache.get("index", "a")
+        redis.pubsub.return_value.run_in_thread.assert_called_once()
+        cache.set("index", "a", DATASOURCE)
+        cache.set("index", "b", DATASOURCE)
+
+        cache.invalidate("index", "a")
+        channel, message = redis.publish.call_args.args
+        assert channel == cache.channel
+        assert json.loads(message)["id"] == "a"
+
+        # Messages of other processes invalidate, our own are ignored.
+        cache._on_message({"data": message})
+        assert len(cache) == 1
+        cache._on_message({"data": json.dumps({"sender": "other", "index": "index", "id": "b"})})
+        assert len(cache) == 0
+
+
+class TestCachedRepositories:
+    def test_get_is_cached(self, opensearch_client: OpenSearch, mocker: MockerFixture):
+        get = mocker.patch.object(opensearch_client, "get", wraps=opensearch_client.get)
+        repository = DatasourceRepository(opensearch_client)
+
+        assert repository.get(DATASOURCE.key) == repository.get(DATASOURCE.key) == DATASOURCE
+        assert get.call_count == 1
+        assert document_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_writes_invalidate(self, opensearch_client: OpenSearch, mocker: MockerFixture):
+        repository = AsyncDatasourceRepository(AsyncFakeOpenSearch(opensearch_client))
+        datasource = await repository.get(DATASOURCE.key)
+
+        await repository.update(datasource.key, datasource, {"database": "updated"})
+
+        assert (await repository.get(DATASOURCE.key)).database == "updated"
+        assert DatasourceRepository(opensearch_client).get(DATASOURCE.key).database == "updated"
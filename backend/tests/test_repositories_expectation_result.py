@@ -0,0 +1,79 @@
+from unittest.mock import MagicMock
+
+from app.models.validation import ExpectationResult, Result
+from app.repositories.expectation_result import ExpectationResultRepository
+from tests.data import EXPECTATIONS, VALIDATIONS
+
+EXPECTATION = EXPECTATIONS["postgres_table_products_expect_column_to_exist"]
+
+
+def _validation(run_time: str, success: bool = True):
+    validation = VALIDATIONS["postgres_table_products"].copy(deep=True)
+    validation.meta.run_id.run_time = run_time
+    validation.results = [
+        Result(
+            exception_info={"raised_exception": False},
+            success=success,
+            expectation_config={
+                "kwargs": {"result_format": "SUMMARY", "include_config": True, "catch_exceptions": True,
+                           "column": "product_name", "objective": 0.9},
+                "expectation_type": "expect_column_to_exist",
+                "meta": {},
+            },
+            result={"observed_value": 12, "unexpected_percent": 1.5, "partial_unexpected_list": [1, 2]},
+            meta={},
+            expectation_id=EXPECTATION.key,
+        )
+    ]
+    return validation
+
+
+def _hit(result: ExpectationResult):
+    return {"_id": result.key, "_source": result.dict(exclude={"key"})}
+
+
+class TestExpectationResults:
+    def test_from_validation(self):
+        (result,) = ExpectationResult.from_validation("validation", _validation("2022-10-11 09:10:44.330614+00:00"))
+
+        assert result.key == f"validation__{EXPECTATION.key}"
+        assert (result.expectation_id, result.dataset_id, result.observed_value) == (
+            EXPECTATION.key, EXPECTATION.dataset_id, 12
+        )
+        assert result.history() == {
+            "expectation_id": EXPECTATION.key,
+            "run_time": "2022-10-11T09:10:44.330614Z",
+            "success": True,
+            "result": {"observed_value": 12, "unexpected_percent": 1.5},
+            "expectation_config": {"kwargs": {"objective": 0.9}},
+            "exception_info": {"raised_exception": False, "exception_message": None},
+        }
+
+    def test_history(self):
+        (older,) = ExpectationResult.from_validation("older", _validation("2022-10-11 09:10:44.330614+00:00"))
+        (newer,) = ExpectationResult.from_validation("newer", _validation("2022-10-12 09:10:44.330614+00:00", False))
+        client = MagicMock()
+        client.search.return_value = {
+            "aggregations": {
+                "expectations": {
+                    "buckets": [
+                        {"key": EXPECTATION.key, "latest": {"hits": {"hits": [_hit(newer), _hit(older)]}}},
+                    ]
+                }
+            }
+        }
+
+        history = ExpectationResultRepository(client).history([EXPECTATION.key, "other"], size=2, period=7)
+
+        assert history == {EXPECTATION.key: [older, newer]}
+        kwargs = client.search.call_args.kwargs
+        assert kwargs["ignore_unavailable"] is True
+        assert kwargs["body"]["query"]["bool"]["filter"][0] == {"terms": {"expectation_id": [EXPECTATION.key, "other"]}}
+        assert kwargs["body"]["aggs"]["expectations"]["terms"]["size"] == 2
+        assert kwargs["body"]["aggs"]["expectations"]["aggs"]["latest"]["top_hits"]["size"] == 2
+
+    def test_history_without_expectations(self):
+        client = MagicMock()
+
+        assert ExpectationResultRepository(client).history([], size=10) == {}
+        client.search.assert_not_called()
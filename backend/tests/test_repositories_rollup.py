@@ -0,0 +1,127 @@
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from opensearchpy import OpenSearch
+
+from app.repositories.rollup import DatasetRollupRepository
+from app.scripts.backfill_rollups import backfill_rollups
+from tests.data import DATASET_ROLLUPS, DATASETS, VALIDATIONS
+
+VALIDATION = VALIDATIONS["postgres_table_products"]
+
+
+def _validation(run_time: str, success: bool = True):
+    validation = VALIDATION.copy(deep=True)
+    validation.meta.run_id.run_time = run_time
+    validation.success = success
+    return validation
+
+
+class TestDatasetRollups:
+    def test_rollups(self):
+        rollups = DatasetRollupRepository.rollups([
+            _validation("2022-10-11 09:10:44.330614+00:00"),
+            _validation("2022-10-11 23:10:44.330614-02:00", success=False),
+            _validation("2022-10-11 22:10:44.330614-02:00"),
+        ])
+
+        assert [(rollup.key, rollup.validations, rollup.failed_validations) for rollup in rollups] == [
+            (f"{VALIDATION.meta.dataset_id}__2022-10-11", 1, 0),
+            (f"{VALIDATION.meta.dataset_id}__2022-10-12", 2, 1),
+        ]
+        assert rollups[1].evaluated_expectations == 200
+        assert rollups[1].success_percent_sum == 0.2
+
+    def test_average_of_validations_with_success_percent(self):
+        # No expectation evaluated
+        empty = _validation(f"{datetime.now(timezone.utc).date()} 09:10:44.330614+00:00")
+        empty.statistics.evaluated_expectations = 0
+        empty.statistics.success_percent = None
+        rollups = DatasetRollupRepository.rollups([
+            _validation(f"{datetime.now(timezone.utc).date()} 08:10:44.330614+00:00"),
+            empty,
+        ])
+
+        statistics = DatasetRollupRepository._statistics(rollups)
+
+        assert rollups[0].validations == 2
+        assert statistics.one_day_avg == 0.1
+        assert statistics.validations[0][1] == 0.1
+
+    def test_unparsable_run_time_skipped(self):
+        rollups = DatasetRollupRepository.rollups([
+            _validation("2022-10-11 09:10:44.330614+00:00"),
+            _validation("run_time"),
+        ])
+
+        assert [(rollup.day, rollup.validations) for rollup in rollups] == [("2022-10-11", 1)]
+
+    def test_add_upserts(self):
+        client = MagicMock()
+
+        DatasetRollupRepository(client).add(_validation("2022-10-11 09:10:44.330614+00:00", success=False))
+
+        kwargs = client.update.call_args.kwargs
+        assert kwargs["id"] == f"{VALIDATION.meta.dataset_id}__2022-10-11"
+        assert kwargs["body"]["script"]["params"]["sums"] == {
+            "validations": 1,
+            "failed_validations": 1,
+            "evaluated_expectations": 100,
+            "successful_expectations": 90,
+            "unsuccessful_expectations": 10,
+            "success_percent_sum": 0.1,
+            "success_percent_count": 1,
+            "failing_validations": 1,
+        }
+        assert kwargs["body"]["script"]["params"]["failing_hours"] == {
+            "09": {
+                "validations": 1,
+                "evaluated_expectations": 100,
+                "successful_expectations": 90,
+                "unsuccessful_expectations": 10,
+                "success_percent_sum": 0.1,
+                "success_percent_count": 1,
+            },
+        }
+        assert kwargs["body"]["upsert"]["day"] == "2022-10-11"
+        assert "key" not in kwargs["body"]["upsert"]
+
+    def test_top_issues(self, opensearch_client: OpenSearch):
+        issues = DatasetRollupRepository(opensearch_client).top_issues()
+
+        assert sorted(issue["dataset_id"] for issue in issues) == sorted(
+            rollup.dataset_id for rollup in DATASET_ROLLUPS.values()
+        )
+        assert issues[0]["#_failures"] == "10 of 100"
+
+    def test_top_issues_of_failing_validations_in_the_last_24_hours(self):
+        passing = _validation("2022-10-12 10:30:00+00:00")
+        passing.statistics.unsuccessful_expectations = 0
+        passing.statistics.success_percent = 100
+        rollups = DatasetRollupRepository.rollups([
+            # Before the last 24 hours
+            _validation("2022-10-11 09:59:00+00:00", success=False),
+            _validation("2022-10-11 10:10:00+00:00", success=False),
+            passing,
+            _validation("2022-10-12 10:20:00+00:00", success=False),
+        ])
+
+        issues = DatasetRollupRepository._top_issues(
+            rollups, 10, now=datetime(2022, 10, 12, 10, 45, tzinfo=timezone.utc)
+        )
+
+        # As the average of the failing validations only
+        assert issues == [{
+            "rate": f"{0.1} %",
+            "#_failures": "20 of 200",
+            "pass_count": 180,
+            "fail_count": 20,
+            "dataset_id": VALIDATION.meta.dataset_id,
+        }]
+
+    def test_backfill(self, opensearch_client: OpenSearch):
+        repository = DatasetRollupRepository(opensearch_client)
+        repository.delete_by_filter(dataset_id=DATASETS["postgres_table_products"].key)
+
+        assert backfill_rollups(opensearch_client) == len(DATASET_ROLLUPS)
+        assert repository.statistics(DATASETS["postgres_table_products"].key).one_day_avg == 0.1
@@ -0,0 +1,100 @@
+import pytest
+from openmock.fake_indices import FakeIndicesClient
+from opensearchpy import OpenSearch
+
+from app.models.action import Action
+from app.repositories import validation_bundle
+from app.repositories.action import ActionRepository
+from app.repositories.base import ConsistencySession, NotFoundError
+from app.repositories.validation_bundle import ValidationBundleRepository
+from app.settings import settings
+from tests.data import DATASETS, DATASOURCES, EXPECTATIONS
+
+DATASET = DATASETS["postgres_table_products"]
+
+
+@pytest.fixture
+def repository(opensearch_client: OpenSearch):
+    return ValidationBundleRepository(opensearch_client)
+
+
+def _action(resource_key: str) -> Action:
+    return Action(
+        key="5d3b2c7e-4f0a-4d6b-9b1e-3c2f1a0e9d8c",
+        create_date="2022-10-04 13:37:00.000000+00:00",
+        modified_date="2022-10-04 13:37:00.000000+00:00",
+        resource_key=resource_key,
+        resource_type="dataset",
+        action_type="validation",
+        destination={
+            "key": "a0f3c1d2-7b6e-4e3a-8d9c-1b2a3c4d5e6f",
+            "destination_name": "slack",
+            "kwargs": {"destination_type": "Slack", "notify_on": "all", "webhook": "https://hooks.slack.com/x"},
+        },
+    )
+
+
+class TestValidationBundle:
+    def test_get(self, repository: ValidationBundleRepository, opensearch_client, mocker):
+        ActionRepository(opensearch_client).create("action", _action(DATASET.key))
+        mget = mocker.patch.object(opensearch_client, "mget", wraps=opensearch_client.mget)
+        msearch = mocker.spy(opensearch_client, "msearch")
+
+        bundle = repository.get(DATASET.key)
+
+        assert bundle.dataset.key == DATASET.key
+        assert bundle.datasource.key == DATASOURCES["postgres"].key
+        # Disabled expectations are not validated.
+        assert [expectation.key for expectation in bundle.expectations] == [
+            EXPECTATIONS["postgres_table_products_expect_column_to_exist"].key
+        ]
+        assert [action.resource_key for action in bundle.actions] == [DATASET.key]
+        assert mget.call_count == 2
+        msearch.assert_called_once()
+
+    def test_get_many(self, repository: ValidationBundleRepository, opensearch_client, mocker):
+        mget = mocker.patch.object(opensearch_client, "mget", wraps=opensearch_client.mget)
+        msearch = mocker.spy(opensearch_client, "msearch")
+
+        bundles = repository.get_many([*(dataset.key for dataset in DATASETS.values()), "missing"])
+
+        assert set(bundles) == {dataset.key for dataset in DATASETS.values()}
+        for dataset_id, bundle in bundles.items():
+            assert bundle.datasource.key == bundle.dataset.datasource_id
+            assert [expectation.dataset_id for expectation in bundle.expectations] == [dataset_id]
+            assert bundle.actions == []
+        assert mget.call_count == 2
+        msearch.assert_called_once()
+
+    def test_get_missing(self, repository: ValidationBundleRepository):
+        with pytest.raises(NotFoundError):
+            repository.get("missing")
+
+    def test_paginates_many_expectations(self, repository: ValidationBundleRepository, monkeypatch):
+        monkeypatch.setattr(validation_bundle, "MAX_EXPECTATIONS", 0)
+
+        bundle = repository.get(DATASET.key)
+
+        assert [expectation.key for expectation in bundle.expectations] == [
+            EXPECTATIONS["postgres_table_products_expect_column_to_exist"].key
+        ]
+
+    def test_dataset_not_searchable(self, repository: ValidationBundleRepository, opensearch_client, mocker):
+        # Datasets and datasources written since the last refresh are read.
+        mocker.patch.object(opensearch_client, "search", return_value={"hits": {"total": {"value": 0}, "hits": []}})
+
+        bundle = repository.get(DATASET.key)
+
+        assert bundle.dataset.key == DATASET.key
+        assert bundle.datasource.key == DATASOURCES["postgres"].key
+
+    def test_reads_your_writes(self, opensearch_client, mocker):
+        refresh = mocker.patch.object(FakeIndicesClient, "refresh")
+        writer = ConsistencySession()
+        ActionRepository(opensearch_client, session=writer).create("action", _action(DATASET.key))
+
+        ValidationBundleRepository(opensearch_client).get(DATASET.key)
+        refresh.assert_not_called()
+
+        ValidationBundleRepository(opensearch_client, session=ConsistencySession(writer.token())).get(DATASET.key)
+        refresh.assert_called_once_with(index=settings.ACTION_INDEX)
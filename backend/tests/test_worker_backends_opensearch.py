@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from celery import states
+from opensearchpy import NotFoundError
+
+from app.worker.app import celery_app
+from app.worker.backends.opensearch import OpenSearchBackend
+
+
+@pytest.fixture
+def server() -> MagicMock:
+    server = MagicMock()
+    server.update.return_value = {"result": "updated"}
+    return server
+
+
+@pytest.fixture
+def backend(server: MagicMock) -> OpenSearchBackend:
+    backend = OpenSearchBackend(app=celery_app)
+    backend._server = server
+    return backend
+
+
+class TestOpenSearchBackend:
+    def test_mget(self, backend: OpenSearchBackend, server: MagicMock):
+        server.mget.return_value = {"docs": [
+            {"_id": "celery-task-meta-2", "found": True, "_source": {"result": {"status": "SUCCESS"}}},
+            {"_id": "celery-task-meta-1", "found": False},
+        ]}
+
+        results = backend.mget([b"celery-task-meta-1", b"celery-task-meta-2"])
+
+        assert results == [None, {"status": "SUCCESS"}]
+        server.mget.assert_called_once_with(
+            index="celery", body={"ids": ["celery-task-meta-1", "celery-task-meta-2"]}
+        )
+        server.get.assert_not_called()
+
+    def test_store_result_upserts(self, backend: OpenSearchBackend, server: MagicMock):
+        backend.store_result("task-id", {"deleted": 1}, states.STARTED)
+
+        server.get.assert_not_called()
+        server.index.assert_not_called()
+        kwargs = server.update.call_args.kwargs
+        assert kwargs["id"] == "celery-task-meta-task-id"
+        assert kwargs["body"]["upsert"]["result"]["status"] == states.STARTED
+        assert kwargs["body"]["script"]["params"]["doc"] == kwargs["body"]["upsert"]
+        assert kwargs["body"]["script"]["params"]["state"] == states.STARTED
+        assert kwargs["params"] == {"retry_on_conflict": backend.os_max_retries}
+
+    def test_store_result_as_text(self, backend: OpenSearchBackend, server: MagicMock):
+        # The script cannot read meta saved as text, the stored state is read first.
+        backend.os_save_meta_as_text = True
+        server.get.return_value = {"found": False}
+
+        backend.store_result("task-id", None, states.STARTED)
+
+        server.get.assert_called_with(index="celery", id=b"celery-task-meta-task-id")
+        server.index.assert_called_once()
+        server.update.assert_not_called()
+
+    def test_store_result_compact(self, backend: OpenSearchBackend, server: MagicMock):
+        backend.store_result("task-id", None, states.STARTED)
+
+        stored = server.update.call_args.kwargs["body"]["upsert"]["result"]
+        for field in ("result", "traceback", "date_done", "children"):
+            assert field not in stored
+        assert stored["status"] == states.STARTED
+
+        meta = backend.decode_result(stored)
+
+        assert meta["result"] is None
+        assert meta["traceback"] is None
+        assert meta["children"] == []
+
+    def test_cleanup(self, backend: OpenSearchBackend, server: MagicMock):
+        server.delete_by_query.return_value = {"deleted": 3}
+
+        backend.cleanup()
+
+        kwargs = server.delete_by_query.call_args.kwargs
+        assert kwargs["index"] == "celery"
+        expired = kwargs["body"]["query"]["range"]["timestamp"]["lt"]
+        assert expired.endswith("Z")
+        assert expired < backend._timestamp(datetime.utcnow() - timedelta(seconds=backend.expires - 60))
+
+    def test_cleanup_without_results(self, backend: OpenSearchBackend, server: MagicMock):
+        server.delete_by_query.side_effect = NotFoundError(404, "index_not_found_exception", {})
+
+        backend.cleanup()
+
+    def test_cleanup_never_expires(self, backend: OpenSearchBackend, server: MagicMock):
+        backend.expires = None
+
+        backend.cleanup()
+
+        server.delete_by_query.assert_not_called()
@@ -0,0 +1,29 @@
+from opensearchpy import OpenSearch
+from pytest_mock import MockerFixture
+
+from app.repositories.expectation import ExpectationRepository
+from app.worker.tasks.suggestions import run_suggestions
+from tests.data import EXPECTATIONS
+
+SUGGESTED_TABLE = EXPECTATIONS["postgres_table_products_suggested_disabled"]
+
+
+def _suggested_column(column: str):
+    expectation = EXPECTATIONS["postgres_table_products_expect_column_to_exist"]
+    return expectation.copy(
+        update={"key": f"suggested-{column}", "kwargs": {"column": column}, "suggested": True, "enabled": False}
+    )
+
+
+class TestPartialSuggestions:
+    def test_replace_profiled_columns(self, opensearch_client: OpenSearch, mocker: MockerFixture):
+        repository = ExpectationRepository(opensearch_client)
+        repository.bulk_create([_suggested_column("product_name"), _suggested_column("product_price")])
+        mocker.patch("app.worker.tasks.suggestions.client", opensearch_client)
+        # The profiled column and the table get no suggestions this time.
+        mocker.patch("app.worker.tasks.suggestions.create_dataset_suggestions", return_value=(["product_name"], []))
+
+        run_suggestions(SUGGESTED_TABLE.dataset_id, include_columns=["product_name"])
+
+        keys = {e.key for e in repository.query_by_filter(dataset_id=SUGGESTED_TABLE.dataset_id, suggested=True)}
+        assert keys == {"suggested-product_price"}
@@ -8,6 +8,26 @@ const axios = axiosDefault.create({
 });
 const BASE_URL = process.env.REACT_APP_API_DOMAIN;
 
+// Writes return before they are searchable. Sending back the consistency token of the last write
+// makes the API refresh the indices written to before searching them, so lists include our writes.
+let consistencyToken = null;
+
+axios.interceptors.request.use((config) => {
+  if (consistencyToken) {
+    // eslint-disable-next-line no-param-reassign
+    config.headers['X-Consistency-Token'] = consistencyToken;
+  }
+  return config;
+});
+
+axios.interceptors.response.use((response) => {
+  const token = response.headers['x-consistency-token'];
+  if (token) {
+    consistencyToken = token;
+  }
+  return response;
+});
+
 function errorHandler(error) {
   if (error.response) {
     // The request was made and the server responded with a status code
@@ -111,6 +131,13 @@ export const getDataset = (key) => axios.get(`${BASE_URL}/datasets/${key}`)
   .then((response) => response)
   .catch((error) => errorHandler(error));
 
+export const getDatasetColumns = (key, refresh = false) => axios.get(
+  `${BASE_URL}/datasets/${key}/columns`,
+  { params: { refresh } },
+)
+  .then((response) => response)
+  .catch((error) => errorHandler(error));
+
 export const getQuerySample = (data) => axios.post(
   `${BASE_URL}/datasets/sample`,
   data,
@@ -118,6 +145,10 @@ export const getQuerySample = (data) => axios.post(
   .then((response) => response)
   .catch((error) => errorHandler(error));
 
+export const getDatasetSample = (key) => axios.get(`${BASE_URL}/datasets/${key}/sample`)
+  .then((response) => response)
+  .catch((error) => errorHandler(error));
+
 export const putSample = (key) => axios.put(
   `${BASE_URL}/datasets/${key}/sample`,
 )
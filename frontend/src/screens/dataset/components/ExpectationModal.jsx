@@ -7,6 +7,7 @@ import { CheckCircleTwoTone, CloseCircleTwoTone, InfoCircleOutlined } from '@ant
 import AsyncButton from '../../../components/AsyncButton';
 import Modal from '../../../components/Modal';
 import {
+  getDatasetColumns,
   getExpectationsJsonSchema,
   postExpectation, putExpectation,
 } from '../../../Api';
@@ -27,6 +28,7 @@ function ExpectationModal({
   const [refreshExpectationsJsonSchema, setRefreshExpectationsJsonSchema] = useState(true);
   const [selectedExpectation, setSelectedExpectation] = useState(null);
   const [responseStatus, setResponseStatus] = useState(null);
+  const [datasetColumns, setDatasetColumns] = useState(dataset.sample?.columns);
   const [form] = Form.useForm();
 
   useEffect(() => {
@@ -58,6 +60,17 @@ function ExpectationModal({
     }
   }, [refreshExpectationsJsonSchema, setRefreshExpectationsJsonSchema, visible]);
 
+  useEffect(() => {
+    if (visible && dataset.key) {
+      getDatasetColumns(dataset.key)
+        .then((response) => {
+          if (response?.status === 200) {
+            setDatasetColumns(response.data.map((column) => column.name));
+          }
+        });
+    }
+  }, [dataset.key, visible]);
+
   if (!visible || type === null) return null;
 
   const expectationOptions = expectationsJsonSchema.map((item) => (
@@ -79,18 +92,18 @@ function ExpectationModal({
   const getFormItem = (item, prop, requiredKwargs) => {
     let itemType;
 
-    if (item?.form_type === 'column_select' && dataset.sample?.columns) {
-      const datasetSampleColumns = dataset.sample.columns.map((column) => (
+    if (item?.form_type === 'column_select' && datasetColumns) {
+      const columnOptions = datasetColumns.map((column) => (
         { label: column, value: column }));
 
-      itemType = <Select options={datasetSampleColumns} />;
+      itemType = <Select options={columnOptions} />;
     } else if (item?.form_type === 'column_select') {
       itemType = <Input placeholder={item.title} />;
-    } else if (item?.form_type === 'multi_column_select' && dataset.sample?.columns) {
-      const datasetSampleColumns = dataset.sample.columns.map((column) => (
+    } else if (item?.form_type === 'multi_column_select' && datasetColumns) {
+      const columnOptions = datasetColumns.map((column) => (
         { label: column, value: column }));
 
-      itemType = <Select mode="multiple" allowClear options={datasetSampleColumns} />;
+      itemType = <Select mode="multiple" allowClear options={columnOptions} />;
     } else if (item.type === 'boolean') {
       itemType = <Checkbox />;
     } else if (item.type === 'string') {
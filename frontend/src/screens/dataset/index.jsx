@@ -32,7 +32,7 @@ import { v4 as uuidv4 } from 'uuid';
 import Paragraph from 'antd/es/typography/Paragraph';
 import {
   deleteExpectation,
-  getDataset, getDataSource,
+  getDataset, getDatasetSample, getDataSource,
   getExpectations,
   getValidationStats,
   postRunnerValidateDataset,
@@ -151,6 +151,13 @@ const Dataset = withRouter(() => {
         .then((response) => {
           if (response.status === 200) {
             setDataset(response.data);
+            // Samples are not part of datasets, they are loaded apart.
+            getDatasetSample(datasetId)
+              .then((sampleResponse) => {
+                if (sampleResponse.status === 200) {
+                  setDataset((current) => ({ ...current, sample: sampleResponse.data }));
+                }
+              });
           } else if (response.status === 404) {
             message.error('Dataset does not exist.', 2)
               .then(() => history.push('/datasets/home'));